@@ -1,40 +1,174 @@
-from bullmq import Worker
+from bullmq import Queue, Worker
+from concurrent.futures import ThreadPoolExecutor
+import argparse
 import asyncio
 import signal
 from src.config.settings import get_settings
+from src.services.api_client import close_async_api_client
+from src.services.resume_extraction import shutdown_extraction_pool
+from src.storage.minio_client import close_minio_http_client
+from src.utils.metrics import JOB_SECONDS, observe, record_queue_wait, start_metrics_server
 from src.workers.extraction_worker import extraction_worker
 from src.workers.scoring_worker import scoring_worker
-from src.utils.ollama import preload_models
+from src.workers.batch_scoring_worker import batch_scoring_worker
+from src.services.model_residency import (
+    ModelResidencyManager,
+    get_role_models,
+    get_queue_backlog,
+    run_model_residency,
+)
+
+# Job handlers grouped by worker role
+ROLE_JOB_HANDLERS = {
+    "extraction": {
+        "process-resume": extraction_worker,
+    },
+    "scoring": {
+        "score-applicant": scoring_worker,
+        "score-applicants-batch": batch_scoring_worker,
+    },
+}
+
+# Handlers and per job name concurrency limits for the roles this process runs, set up in main()
+job_handlers = {}
+job_limits = {}
 
 async def process(job, job_token):
     """Route jobs to appropriate handlers based on job name"""
     print(f"Processing job: {job.name} (ID: {job.id})")
-    
-    if job.name == "process-resume":
-        await asyncio.to_thread(extraction_worker, job)
-        return "ok"
-    
-    if job.name == "score-applicant":
-        await asyncio.to_thread(scoring_worker, job)
-        return "ok"
-    
-    print(f"Unknown job type: {job.name}")
-    return None
-
-async def main():
-    
+
+    handler = job_handlers.get(job.name)
+    if handler is None:
+        print(f"Unknown job type: {job.name}")
+        return None
+
+    async with job_limits[job.name]:
+        # Waiting for a free slot counts as queue wait too
+        record_queue_wait(job)
+        with observe(JOB_SECONDS, job=job.name):
+            await handler(job)
+    return "ok"
+
+
+def get_role_configs(settings):
+    """Queue, concurrency, rate limit and metrics port for each worker role."""
+    return {
+        "extraction": {
+            "queue": settings.redis_queue_name,
+            "concurrency": settings.extraction_concurrency,
+            "rate_limit_max": settings.extraction_rate_limit_max,
+            "rate_limit_duration_ms": settings.extraction_rate_limit_duration_ms,
+            "metrics_port": settings.extraction_metrics_port,
+        },
+        "scoring": {
+            "queue": settings.redis_scoring_queue_name,
+            "concurrency": settings.scoring_concurrency,
+            "rate_limit_max": settings.scoring_rate_limit_max,
+            "rate_limit_duration_ms": settings.scoring_rate_limit_duration_ms,
+            "metrics_port": settings.scoring_metrics_port,
+        },
+    }
+
+
+def get_queue_options(roles, role_configs):
+    """
+    Group the given roles by queue and build the bullmq Worker options for each queue.
+
+    Raises:
+        ValueError: If a role is unknown, or a queue would also deliver jobs of a
+            role this process does not run
+    """
+    for role in roles:
+        if role not in role_configs:
+            raise ValueError(f"Unknown worker role '{role}', expected one of {list(role_configs)}")
+
+    queues = {}
+    for role in roles:
+        queues.setdefault(role_configs[role]["queue"], []).append(role)
+
+    for queue, queue_roles in queues.items():
+        missing = [
+            role for role, config in role_configs.items()
+            if config["queue"] == queue and role not in queue_roles
+        ]
+        if missing:
+            raise ValueError(
+                f"Queue '{queue}' also carries {missing} jobs, give each role its own queue "
+                "(REDIS_SCORING_QUEUE_NAME) to run only some roles"
+            )
+
+    queue_options = {}
+    for queue, queue_roles in queues.items():
+        configs = [role_configs[role] for role in queue_roles]
+        options = {"concurrency": sum(config["concurrency"] for config in configs)}
+
+        # A shared queue gets the strictest of its roles' rate limits
+        limited = [config for config in configs if config["rate_limit_max"] > 0]
+        if limited:
+            strictest = min(limited, key=lambda config: config["rate_limit_max"] / config["rate_limit_duration_ms"])
+            options["limiter"] = {
+                "max": strictest["rate_limit_max"],
+                "duration": strictest["rate_limit_duration_ms"],
+            }
+
+        queue_options[queue] = (queue_roles, options)
+    return queue_options
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="CVRankify AI worker")
+    parser.add_argument(
+        "--role",
+        action="append",
+        choices=list(ROLE_JOB_HANDLERS),
+        help="Run only this role, can be repeated (defaults to WORKER_ROLES)",
+    )
+    return parser.parse_args()
+
+
+async def main(roles=None):
+
     print("Starting worker...")
-    
+
     # Load settings
     settings = get_settings()
     redis_url = f"redis://{settings.redis_host}:{settings.redis_port}"
-    
-    # Preload Ollama models to avoid reload delays
-    await asyncio.to_thread(preload_models)
-    
+
+    roles = roles or settings.worker_roles
+    role_configs = get_role_configs(settings)
+    queue_options = get_queue_options(roles, role_configs)
+
+    # Separate limits so a burst of one job kind cannot take every slot
+    for role in roles:
+        limit = asyncio.Semaphore(role_configs[role]["concurrency"])
+        for job_name, handler in ROLE_JOB_HANDLERS[role].items():
+            job_handlers[job_name] = handler
+            job_limits[job_name] = limit
+    # Handlers are async and await their I/O, threads are only needed for pdfium
+    # (thread backend) and model residency checks, so the pool stays small
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.pdf_process_pool_size + 1, thread_name_prefix="job")
+    )
+
+    metrics_port = role_configs[roles[0]]["metrics_port"] if len(roles) == 1 else settings.metrics_port
+    start_metrics_server(metrics_port, addr=settings.metrics_addr)
+
     # Create an event that will be triggered for shutdown
     shutdown_event = asyncio.Event()
 
+    # Keep this process's Ollama models loaded, warming runs alongside the workers
+    residency_manager = ModelResidencyManager(
+        get_role_models(roles), max_workers=settings.model_warm_concurrency
+    )
+    backlog_queues = [Queue(queue, {"connection": redis_url}) for queue in queue_options]
+    job_roles = {job_name: role for role in roles for job_name in ROLE_JOB_HANDLERS[role]}
+    residency_task = asyncio.create_task(run_model_residency(
+        residency_manager,
+        lambda: get_queue_backlog(backlog_queues, job_roles),
+        shutdown_event,
+        settings.model_residency_interval_seconds,
+    ))
+
     def signal_handler(signal, frame):
         print("Signal received, shutting down.")
         shutdown_event.set()
@@ -43,24 +177,34 @@ async def main():
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
-    worker = Worker(
-        settings.redis_queue_name,
-        process,
-        {"connection": redis_url},
-    )
+    workers = []
+    for queue, (queue_roles, options) in queue_options.items():
+        workers.append(Worker(
+            queue,
+            process,
+            {"connection": redis_url, **options},
+        ))
+        print(f"Listening for {', '.join(queue_roles)} jobs on queue: {queue} ({options})")
 
     print("Worker started successfully.")
-    print(f"Listening for jobs on queue: {settings.redis_queue_name}")
     print(f"Connected to Redis at: {redis_url}")
-    
+    print(f"PDF extraction backend: {settings.pdf_extraction_backend}")
+
     # Wait until the shutdown event is set
     await shutdown_event.wait()
 
-    # close the worker
+    # close the workers
     print("Cleaning up worker...")
-    await worker.close()
+    await asyncio.gather(*(worker.close() for worker in workers))
+    residency_task.cancel()
+    await asyncio.gather(residency_task, return_exceptions=True)
+    await asyncio.gather(*(queue.close() for queue in backlog_queues))
+    await close_async_api_client()
+    await close_minio_http_client()
+    shutdown_extraction_pool()
     print("Worker shut down successfully.")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    asyncio.run(main(args.role))
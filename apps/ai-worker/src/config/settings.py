@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+import tempfile
 load_dotenv()
 
 
@@ -10,13 +11,60 @@ class Settings:
         self.minio_access_key: str = self._get_required_env("MINIO_ACCESS_KEY")
         self.minio_secret_key: str = self._get_required_env("MINIO_SECRET_KEY")
         self.minio_bucket_name: str = self._get_required_env("MINIO_BUCKET_NAME")
+        # Where downloaded resumes are spooled, tmpfs keeps them off disk and out of Python memory
+        self.minio_spool_dir: str = self._get_env(
+            "MINIO_SPOOL_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        )
         
         self.redis_host: str = self._get_required_env("REDIS_HOST")
         self.redis_port: int = int(self._get_required_env("REDIS_PORT"))
         self.redis_queue_name: str = self._get_required_env("REDIS_QUEUE_NAME")
+        # Scoring jobs may live on their own queue, by default they share the main one
+        self.redis_scoring_queue_name: str = self._get_env("REDIS_SCORING_QUEUE_NAME", self.redis_queue_name)
         
         self.ai_service_api_key: str = self._get_required_env("AI_SERVICE_API_KEY")
         self.api_base_url: str = self._get_required_env("API_BASE_URL")
+
+        # Shared HTTP connection pool for API callbacks
+        self.api_pool_size: int = int(self._get_env("API_POOL_SIZE", "10"))
+        self.api_max_retries: int = int(self._get_env("API_MAX_RETRIES", "3"))
+        self.api_retry_backoff: float = float(self._get_env("API_RETRY_BACKOFF", "0.5"))
+        self.api_timeout_seconds: float = float(self._get_env("API_TIMEOUT_SECONDS", "30"))
+
+        # Number of jobs of each kind processed at once
+        self.extraction_concurrency: int = int(self._get_env("EXTRACTION_CONCURRENCY", "1"))
+        self.scoring_concurrency: int = int(self._get_env("SCORING_CONCURRENCY", "1"))
+
+        # Rate limits as at most N jobs per duration (ms), 0 disables the limit
+        self.extraction_rate_limit_max: int = int(self._get_env("EXTRACTION_RATE_LIMIT_MAX", "0"))
+        self.extraction_rate_limit_duration_ms: int = int(self._get_env("EXTRACTION_RATE_LIMIT_DURATION_MS", "1000"))
+        self.scoring_rate_limit_max: int = int(self._get_env("SCORING_RATE_LIMIT_MAX", "0"))
+        self.scoring_rate_limit_duration_ms: int = int(self._get_env("SCORING_RATE_LIMIT_DURATION_MS", "1000"))
+
+        # Which roles this process runs: "extraction", "scoring" or both
+        self.worker_roles: list[str] = [
+            role.strip() for role in self._get_env("WORKER_ROLES", "extraction,scoring").split(",") if role.strip()
+        ]
+
+        # Seconds between Ollama residency checks, and models loaded at once when warming
+        self.model_residency_interval_seconds: float = float(self._get_env("MODEL_RESIDENCY_INTERVAL_SECONDS", "60"))
+        self.model_warm_concurrency: int = int(self._get_env("MODEL_WARM_CONCURRENCY", "3"))
+
+        # "thread" runs pypdfium2 in the job's thread, "process" isolates it in a process pool
+        self.pdf_extraction_backend: str = self._get_env("PDF_EXTRACTION_BACKEND", "thread")
+        self.pdf_process_pool_size: int = int(self._get_env("PDF_PROCESS_POOL_SIZE", str(os.cpu_count() or 1)))
+        # Split PDFs with at least this many pages across the process pool, 0 disables
+        self.pdf_parallel_page_threshold: int = int(self._get_env("PDF_PARALLEL_PAGE_THRESHOLD", "8"))
+        # Bounds for oversized uploads, pages past the cap are skipped, 0 disables either limit
+        self.pdf_max_pages: int = int(self._get_env("PDF_MAX_PAGES", "50"))
+        self.pdf_max_bytes: int = int(self._get_env("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+
+        # Prometheus /metrics endpoint, off unless a port is set; a process running
+        # a single role (--role) uses that role's port, so both can run on one host
+        self.metrics_port: int = int(self._get_env("METRICS_PORT", "0"))
+        self.extraction_metrics_port: int = int(self._get_env("EXTRACTION_METRICS_PORT", str(self.metrics_port)))
+        self.scoring_metrics_port: int = int(self._get_env("SCORING_METRICS_PORT", str(self.metrics_port)))
+        self.metrics_addr: str = self._get_env("METRICS_ADDR", "127.0.0.1")
     
     def _get_required_env(self, key: str) -> str:
         value = os.getenv(key)
@@ -24,5 +72,8 @@ class Settings:
             raise ValueError(f"Required environment variable '{key}' is not set")
         return value
 
+    def _get_env(self, key: str, default: str) -> str:
+        return os.getenv(key, default)
+
 def get_settings() -> Settings:
     return Settings()
\ No newline at end of file
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class EducationTimezone(BaseModel):
+    highestEducationDegree: str
+    educationField: str
+    timezone: Optional[str] = None
+
+class ResumeSkills(BaseModel):
+    skills: list[str]
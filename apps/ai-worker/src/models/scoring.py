@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
+from src.config.constants import SkillMatchType
 
 
 class ExperiencePeriod(BaseModel):
@@ -11,4 +12,24 @@ class ExperiencePeriod(BaseModel):
     relevant: Optional[bool] = None
 
 class ExperiencePeriods(BaseModel):
-    experiencePeriods: list[ExperiencePeriod] = Field(..., alias="experiencePeriods")
\ No newline at end of file
+    experiencePeriods: list[ExperiencePeriod] = Field(..., alias="experiencePeriods")
+
+class RelevanceEvaluation(BaseModel):
+    """exp_relevance_eval output: the input periods, each with "relevant" added."""
+    model_config = ConfigDict(extra="allow")
+
+    jobTitle: str
+    relevant: bool
+
+class RelevanceEvaluations(BaseModel):
+    experiencePeriods: list[RelevanceEvaluation]
+
+class JobSkillScore(BaseModel):
+    skill: str
+    match_type: SkillMatchType
+    from_cv: Optional[str] = None
+    score: float
+    reason: str = ""
+
+class JobSkillScores(BaseModel):
+    job_skills: list[JobSkillScore]
@@ -1,31 +1,228 @@
+import asyncio
+import contextvars
+import httpx
 import requests
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Tuple, Any, Optional
 import logging
 from src.config.settings import get_settings
 from src.config.constants import ApplicantStatus
+from src.utils.metrics import API_CALL_SECONDS, observe
 
 logger = logging.getLogger(__name__)
 
+# Process-wide keep-alive sessions, {idempotent: session}, and API clients, shared by all jobs
+_sessions = {}
+_api_client = None
+_async_api_client = None
+_lock = threading.Lock()
+
+TRPC_PREFIX = "/api/trpc/"
+
+# Procedures that must not run twice, retried only if the request never reached the API
+NON_IDEMPOTENT_PROCEDURES = {"applicant.queueScoring"}
+
+# httpx errors raised before the request was sent
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def procedure_label(endpoint: str) -> str:
+    """Metrics label of a tRPC endpoint, batch for batched calls."""
+    if endpoint.endswith("?batch=1"):
+        return "batch"
+    return endpoint[len(TRPC_PREFIX):] if endpoint.startswith(TRPC_PREFIX) else endpoint
+
+
+def is_idempotent(endpoint: str) -> bool:
+    """Whether every procedure of a tRPC endpoint (or batch) can safely run twice."""
+    procedures = endpoint[len(TRPC_PREFIX):].split("?")[0].split(",")
+    return NON_IDEMPOTENT_PROCEDURES.isdisjoint(procedures)
+
+
+def get_http_session(settings=None, idempotent: bool = True) -> requests.Session:
+    """
+    Get or create a process-wide HTTP session.
+
+    Connections are pooled and kept alive across requests and jobs. Connection
+    errors are retried with exponential backoff. The idempotent session also
+    retries read errors and 502/503/504 responses, after which the API may
+    already have applied the request, so non-idempotent procedures use the
+    other one.
+    """
+    with _lock:
+        if idempotent not in _sessions:
+            settings = settings or get_settings()
+            if idempotent:
+                retry = Retry(
+                    total=settings.api_max_retries,
+                    backoff_factor=settings.api_retry_backoff,
+                    status_forcelist=[502, 503, 504],
+                    allowed_methods=frozenset({"POST"}),
+                    raise_on_status=False,
+                )
+            else:
+                retry = Retry(
+                    total=settings.api_max_retries,
+                    connect=settings.api_max_retries,
+                    read=0,
+                    status=0,
+                    other=0,
+                    backoff_factor=settings.api_retry_backoff,
+                    allowed_methods=frozenset({"POST"}),
+                    raise_on_status=False,
+                )
+            adapter = HTTPAdapter(
+                pool_connections=settings.api_pool_size,
+                pool_maxsize=settings.api_pool_size,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[idempotent] = session
+        return _sessions[idempotent]
+
+
+def get_api_client() -> "APIClient":
+    """Get or create the shared APIClient instance."""
+    global _api_client
+    if _api_client is None:
+        _api_client = APIClient()
+    return _api_client
+
+
+def get_async_api_client() -> "AsyncAPIClient":
+    """Get or create the shared AsyncAPIClient instance."""
+    global _async_api_client
+    if _async_api_client is None:
+        _async_api_client = AsyncAPIClient()
+    return _async_api_client
+
+
+async def close_async_api_client():
+    """Close the shared AsyncAPIClient's connections, if it was created."""
+    global _async_api_client
+    if _async_api_client is not None:
+        await _async_api_client.aclose()
+        _async_api_client = None
+
+
 class APIClient:
     def __init__(self):
         self.settings = get_settings()
         self.base_url = self.settings.api_base_url
+        self.timeout = self.settings.api_timeout_seconds
+        self.session = get_http_session(self.settings)
+        self.connect_retry_session = get_http_session(self.settings, idempotent=False)
         self.headers = {
             "Content-Type": "application/json",
             "x-api-key": self.settings.ai_service_api_key,
         }
-    
+        # Pending batched mutations, per thread so concurrent jobs never mix
+        self._local = threading.local()
+
+    @contextmanager
+    def batch(self, max_size: int = 25):
+        """
+        Coalesce the mutations made inside the block into tRPC batch requests.
+
+        Mutations are buffered and sent together as one `?batch=1` request when
+        the block exits or when max_size mutations are pending. tRPC runs the
+        procedures of a batch concurrently, so only group mutations that do not
+        depend on each other; a status that marks the others as done goes after
+        the block. A failure raises from whichever call flushed the batch, so
+        keep one batch per applicant. Buffered calls return (202, {}).
+
+        Example:
+            with api_client.batch():
+                api_client.update_scoring_time(applicant_id, 1200)
+                api_client.update_matched_skills(applicant_id, matched_skills)
+            api_client.set_status(applicant_id, ApplicantStatus.COMPLETED)
+
+        Raises:
+            RuntimeError: If any mutation in a flushed batch fails
+        """
+        if getattr(self._local, "batch", None) is not None:
+            # Nested batches join the outer one
+            yield self
+            return
+
+        self._local.batch = []
+        self._local.batch_max_size = max_size
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._local.batch = None
+
+    def flush(self) -> list[dict]:
+        """Send all pending batched mutations in one request and return their results."""
+        pending = getattr(self._local, "batch", None)
+        if not pending:
+            return []
+        self._local.batch = []
+        return self._post_batch(pending)
+
+    def _session_for(self, endpoint: str) -> requests.Session:
+        return self.session if is_idempotent(endpoint) else self.connect_retry_session
+
+    def _post_batch(self, calls: list[Tuple[str, dict]]) -> list[dict]:
+        """POST several tRPC procedure calls as a single batch request"""
+        procedures = ",".join(endpoint[len(TRPC_PREFIX):] for endpoint, _ in calls)
+        endpoint = f"{TRPC_PREFIX}{procedures}?batch=1"
+        body = {str(i): data for i, (_, data) in enumerate(calls)}
+
+        logger.info(f"Sending {len(calls)} batched API mutations")
+        try:
+            with observe(API_CALL_SECONDS, procedure=procedure_label(endpoint)):
+                response = self._session_for(endpoint).post(
+                    f"{self.base_url}{endpoint}",
+                    headers=self.headers,
+                    json=body,
+                    timeout=self.timeout
+                )
+            results = response.json()
+            if not isinstance(results, list):
+                response.raise_for_status()
+                raise ValueError(f"Unexpected batch response: {results}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"API batch request failed: {procedures} - {e}")
+            raise
+
+        errors = [
+            f"{calls[i][0][len(TRPC_PREFIX):]}: {result['error'].get('json', {}).get('message', result['error'])}"
+            for i, result in enumerate(results)
+            if "error" in result
+        ]
+        if errors:
+            logger.error(f"API batch request failed: {'; '.join(errors)}")
+            raise RuntimeError(f"Batched API mutations failed: {'; '.join(errors)}")
+        return results
+
     def _post(self, endpoint: str, data: dict) -> Tuple[int, dict]:
         """Generic POST request handler with error handling"""
+        pending = getattr(self._local, "batch", None)
+        if pending is not None:
+            pending.append((endpoint, data))
+            if len(pending) >= self._local.batch_max_size:
+                self.flush()
+            return 202, {}
+
         url = f"{self.base_url}{endpoint}"
         try:
-            response = requests.post(
-                url, 
-                headers=self.headers, 
-                json=data,
-                timeout=30
-            )
-            response.raise_for_status()
+            with observe(API_CALL_SECONDS, procedure=procedure_label(endpoint)):
+                response = self._session_for(endpoint).post(
+                    url, 
+                    headers=self.headers, 
+                    json=data,
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
             return response.status_code, response.json()
         except requests.RequestException as e:
             logger.error(f"API request failed: {endpoint} - {e}")
@@ -238,4 +435,144 @@ class APIClient:
             }
         }
         logger.info(f"Updating scoring time for applicant {applicant_id} to {scoring_time_ms} ms")
-        return self._post(endpoint, data)
\ No newline at end of file
+        return self._post(endpoint, data)
+
+
+# Pending batched mutations of the current asyncio task
+_async_batch = contextvars.ContextVar("async_api_batch", default=None)
+
+RETRY_STATUSES = {502, 503, 504}
+
+
+class AsyncAPIClient(APIClient):
+    """
+    APIClient on httpx.AsyncClient, for async job handlers.
+
+    Every APIClient method (set_status, update_parsed_data, ...) returns a
+    coroutine here and is awaited:
+
+        async with api_client.batch():
+            await api_client.update_scoring_time(applicant_id, 1200)
+            await api_client.set_status(applicant_id, ApplicantStatus.COMPLETED)
+
+    Pending batches are kept per asyncio task, so concurrent jobs never mix.
+    Retries follow the sync sessions: connection errors are retried with
+    exponential backoff, read errors and 502/503/504 responses only for
+    idempotent procedures.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.base_url = self.settings.api_base_url
+        self.timeout = self.settings.api_timeout_seconds
+        self.headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.settings.ai_service_api_key,
+        }
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.settings.api_pool_size,
+                max_keepalive_connections=self.settings.api_pool_size,
+            ),
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    @asynccontextmanager
+    async def batch(self, max_size: int = 25):
+        """
+        Async APIClient.batch.
+
+        Raises:
+            RuntimeError: If any mutation in a flushed batch fails
+        """
+        if _async_batch.get() is not None:
+            # Nested batches join the outer one
+            yield self
+            return
+
+        token = _async_batch.set({"calls": [], "max_size": max_size})
+        try:
+            yield self
+        finally:
+            try:
+                await self.flush()
+            finally:
+                _async_batch.reset(token)
+
+    async def flush(self) -> list[dict]:
+        """Send all pending batched mutations in one request and return their results."""
+        pending = _async_batch.get()
+        if not pending or not pending["calls"]:
+            return []
+        calls = pending["calls"]
+        pending["calls"] = []
+        return await self._post_batch(calls)
+
+    async def _send(self, endpoint: str, body: dict) -> httpx.Response:
+        """POST with retries on connection errors, and on read errors and 502/503/504 if idempotent."""
+        with observe(API_CALL_SECONDS, procedure=procedure_label(endpoint)):
+            return await self._send_with_retries(endpoint, body)
+
+    async def _send_with_retries(self, endpoint: str, body: dict) -> httpx.Response:
+        idempotent = is_idempotent(endpoint)
+        for attempt in range(self.settings.api_max_retries + 1):
+            last_attempt = attempt == self.settings.api_max_retries
+            try:
+                response = await self.client.post(f"{self.base_url}{endpoint}", headers=self.headers, json=body)
+                if response.status_code not in RETRY_STATUSES or last_attempt or not idempotent:
+                    return response
+            except UNSENT_ERRORS:
+                if last_attempt:
+                    raise
+            except httpx.TransportError:
+                # The API may have received the request already
+                if last_attempt or not idempotent:
+                    raise
+            await asyncio.sleep(self.settings.api_retry_backoff * (2 ** attempt))
+
+    async def _post_batch(self, calls: list[Tuple[str, dict]]) -> list[dict]:
+        """POST several tRPC procedure calls as a single batch request"""
+        procedures = ",".join(endpoint[len(TRPC_PREFIX):] for endpoint, _ in calls)
+        endpoint = f"{TRPC_PREFIX}{procedures}?batch=1"
+        body = {str(i): data for i, (_, data) in enumerate(calls)}
+
+        logger.info(f"Sending {len(calls)} batched API mutations")
+        try:
+            response = await self._send(endpoint, body)
+            results = response.json()
+            if not isinstance(results, list):
+                response.raise_for_status()
+                raise ValueError(f"Unexpected batch response: {results}")
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"API batch request failed: {procedures} - {e}")
+            raise
+
+        errors = [
+            f"{calls[i][0][len(TRPC_PREFIX):]}: {result['error'].get('json', {}).get('message', result['error'])}"
+            for i, result in enumerate(results)
+            if "error" in result
+        ]
+        if errors:
+            logger.error(f"API batch request failed: {'; '.join(errors)}")
+            raise RuntimeError(f"Batched API mutations failed: {'; '.join(errors)}")
+        return results
+
+    async def _post(self, endpoint: str, data: dict) -> Tuple[int, dict]:
+        """Generic POST request handler with error handling"""
+        pending = _async_batch.get()
+        if pending is not None:
+            pending["calls"].append((endpoint, data))
+            if len(pending["calls"]) >= pending["max_size"]:
+                await self.flush()
+            return 202, {}
+
+        try:
+            response = await self._send(endpoint, data)
+            response.raise_for_status()
+            return response.status_code, response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"API request failed: {endpoint} - {e}")
+            raise
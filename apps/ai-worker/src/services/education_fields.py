@@ -0,0 +1,161 @@
+import os
+import re
+from src.storage.cache import TieredCache
+from src.utils.embeddings import embed_texts
+from src.utils.ollama import get_model_digest_async, query_ollama_model_async
+
+EDU_MATCH_MODEL = "edu-match:latest"
+
+# Degree wording that does not change what field was studied
+DEGREE_PREFIX_PATTERN = re.compile(
+    r"^(bachelor|master|doctor|associate)s?('s)?( degree)?( of| in)?( (science|arts|philosophy))?( in| of)?\s+"
+)
+
+# Singleton field-pair similarity index
+_education_field_index = None
+
+
+def normalize_education_field(field: str) -> str:
+    """
+    Normalize an education field for lookups.
+
+    "BS in Computer Science", "computer  science" and "Bachelor of Science in
+    Computer Science" all normalize to "computer science".
+    """
+    normalized = (field or "").casefold().replace("&", " and ")
+    normalized = re.sub(r"[^\w\s']", " ", normalized)
+    normalized = re.sub(r"\s+", " ", normalized).strip()
+    normalized = re.sub(r"^(bs|ba|bsc|ms|ma|msc|phd)( in| of)?\s+", "", normalized)
+    normalized = DEGREE_PREFIX_PATTERN.sub("", normalized)
+    return normalized
+
+
+class EducationFieldIndex:
+    """
+    Persistent (job field, applicant field) -> similarity score table.
+
+    Pairs are normalized, so the distinct keys stay few even across many
+    applicants, and keyed together with the edu-match digest, so re-creating
+    the model from a changed modelfile starts over. An unseen pair is scored
+    once by edu-match and stored; if the embedding fallback is enabled, an
+    applicant field close enough to one already scored for the same job
+    field reuses its score instead.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        embedding_fallback: bool = False,
+        embedding_threshold: float = 0.9,
+    ):
+        self.store = TieredCache("education_field_similarity", memory_entries=4096, path=path)
+        self.embedding_fallback = embedding_fallback
+        self.embedding_threshold = embedding_threshold
+        # {job field: {applicant field: score}} of the current digest, for the fallback
+        self._known = {}
+        self._known_digest = None
+
+    @staticmethod
+    def _key(digest: str, job_field: str, applicant_field: str) -> str:
+        return f"{digest}\n{job_field}\n{applicant_field}"
+
+    async def get_similarity(self, job_field: str, applicant_field: str) -> float:
+        """
+        Return the 0-100 similarity between a job's and an applicant's field.
+
+        Raises:
+            ValueError: If the pair is unseen and edu-match fails
+        """
+        job_field = normalize_education_field(job_field)
+        applicant_field = normalize_education_field(applicant_field)
+
+        if job_field and job_field != "unknown" and job_field == applicant_field:
+            return 100.0
+
+        digest = await get_model_digest_async(EDU_MATCH_MODEL)
+        key = self._key(digest, job_field, applicant_field)
+        cached = self.store.get(key)
+        if cached is not None:
+            return float(cached)
+
+        score = None
+        if self.embedding_fallback:
+            score = await self._nearest_known_score(digest, job_field, applicant_field)
+
+        if score is None:
+            score = await self._score_with_model(job_field, applicant_field)
+
+        self.store.set(key, str(score))
+        if self.embedding_fallback and digest == self._known_digest:
+            self._known.setdefault(job_field, {})[applicant_field] = score
+        return score
+
+    async def warm(self, pairs: list[tuple[str, str]]):
+        """Precompute similarity scores for (job field, applicant field) pairs."""
+        for job_field, applicant_field in pairs:
+            await self.get_similarity(job_field, applicant_field)
+
+    async def _score_with_model(self, job_field: str, applicant_field: str) -> float:
+        try:
+            score = await query_ollama_model_async(
+                model=EDU_MATCH_MODEL,
+                content=f"{job_field}, {applicant_field}",
+                json_output=False,
+            )
+            return float(score)
+        except Exception as e:
+            raise ValueError(f"Failed to score education field match: {str(e)}") from e
+
+    def _known_pairs(self, digest: str, job_field: str) -> dict:
+        """
+        {applicant field: score} already scored for job_field by this digest.
+
+        The store is scanned once per digest and indexed by job field, later
+        scores are added as they are stored.
+        """
+        if self._known_digest != digest:
+            known = {}
+            for key, value in self.store.items():
+                parts = key.split("\n")
+                if len(parts) == 3 and parts[0] == digest:
+                    known.setdefault(parts[1], {})[parts[2]] = float(value)
+            self._known, self._known_digest = known, digest
+        return self._known.get(job_field, {})
+
+    async def _nearest_known_score(self, digest: str, job_field: str, applicant_field: str):
+        """
+        Reuse the score of the closest applicant field already scored for the
+        same job field, if it is within embedding_threshold cosine similarity.
+
+        Only pairs scored by the current edu-match digest are considered.
+        """
+        known = list(self._known_pairs(digest, job_field).items())
+        if not known:
+            return None
+
+        try:
+            vectors = await embed_texts([applicant_field] + [field for field, _ in known])
+        except RuntimeError as e:
+            print(f"Embedding fallback unavailable: {e}")
+            return None
+
+        similarity = vectors[1:] @ vectors[0]
+        best = int(similarity.argmax())
+        if similarity[best] >= self.embedding_threshold:
+            return known[best][1]
+        return None
+
+
+def get_education_field_index() -> EducationFieldIndex:
+    """
+    Get or create the singleton education field index.
+
+    Configured via EDU_FIELD_EMBEDDING_FALLBACK and EDU_FIELD_EMBEDDING_THRESHOLD.
+    """
+    global _education_field_index
+    if _education_field_index is None:
+        _education_field_index = EducationFieldIndex(
+            embedding_fallback=os.getenv("EDU_FIELD_EMBEDDING_FALLBACK", "false").lower() == "true",
+            embedding_threshold=float(os.getenv("EDU_FIELD_EMBEDDING_THRESHOLD", "0.9")),
+        )
+    return _education_field_index
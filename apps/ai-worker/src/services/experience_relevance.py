@@ -0,0 +1,74 @@
+import re
+from src.storage.cache import TieredCache
+from src.utils.ollama import get_model_digest_async
+
+RELEVANCE_MODEL = "exp_relevance_eval:latest"
+
+# A trailing employer: "Programmer at West Metro Medical Center"
+EMPLOYER_SUFFIX_PATTERN = re.compile(r"\s+(at|@)\s+\S.*$", re.IGNORECASE)
+
+# Singleton title-pair relevance store
+_experience_relevance_index = None
+
+
+def normalize_job_title(title: str) -> str:
+    """
+    Normalize a job title for relevance lookups.
+
+    Only a trailing " at <company>" is dropped, so "Software Engineer at Acme"
+    and "software engineer at Globex" share one entry. Anything after a comma
+    or dash stays, since it is as often the specialisation as the employer:
+    "Intern - Marketing" and "Intern - Software Engineering" are different roles.
+    """
+    role = EMPLOYER_SUFFIX_PATTERN.sub("", title or "")
+    normalized = role.casefold().replace("&", " and ")
+    normalized = re.sub(r"[^\w\s+#/()]", " ", normalized)
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+class ExperienceRelevanceIndex:
+    """
+    Persistent (job title, applicant role title) -> relevant table.
+
+    Titles are normalized and keyed together with the exp_relevance_eval
+    digest, so re-creating the model from a changed modelfile starts over.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.store = TieredCache("experience_relevance", memory_entries=8192, path=path)
+
+    @staticmethod
+    def _key(digest: str, job_title: str, applicant_title: str) -> str:
+        return f"{digest}\n{job_title}\n{applicant_title}"
+
+    async def get_many(self, job_title: str, applicant_titles: list[str]) -> dict:
+        """
+        Look up already evaluated titles.
+
+        Returns:
+            dict: {normalized applicant title: bool} for the titles found
+        """
+        digest = await get_model_digest_async(RELEVANCE_MODEL)
+        job_title = normalize_job_title(job_title)
+
+        found = {}
+        for title in applicant_titles:
+            value = self.store.get(self._key(digest, job_title, title))
+            if value is not None:
+                found[title] = value == "1"
+        return found
+
+    async def set_many(self, job_title: str, relevance: dict):
+        """Store {normalized applicant title: bool} results for a job title."""
+        digest = await get_model_digest_async(RELEVANCE_MODEL)
+        job_title = normalize_job_title(job_title)
+        for title, relevant in relevance.items():
+            self.store.set(self._key(digest, job_title, title), "1" if relevant else "0")
+
+
+def get_experience_relevance_index() -> ExperienceRelevanceIndex:
+    """Get or create the singleton experience relevance index."""
+    global _experience_relevance_index
+    if _experience_relevance_index is None:
+        _experience_relevance_index = ExperienceRelevanceIndex()
+    return _experience_relevance_index
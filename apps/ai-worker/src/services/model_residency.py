@@ -0,0 +1,239 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.embeddings import get_embedding_model
+from src.utils.ollama import get_json_fixer_model, get_ollama_clients, get_keep_alive
+
+# Models each worker role queries
+ROLE_MODELS = {
+    "extraction": [
+        "edu-timezone-extractor:latest",
+        "skills-extractor:latest",
+        "experience-extractor:latest",
+    ],
+    "scoring": [
+        "skills_score:latest",
+        "exp_relevance_eval:latest",
+        "edu-match:latest",
+    ],
+}
+
+
+def get_role_models(roles: list[str]) -> dict:
+    """
+    Models to keep resident for the given roles.
+
+    The embedding model joins the scoring models when an embedding-based
+    lookup is enabled (SKILLS_BACKEND=embedding or EDU_FIELD_EMBEDDING_FALLBACK).
+    Both roles repair broken structured output with JSON_FIXER_MODEL, so it
+    is kept resident too, after the role's own models.
+    """
+    role_models = {role: list(ROLE_MODELS[role]) for role in roles}
+    json_fixer_model = get_json_fixer_model()
+    if json_fixer_model:
+        for models in role_models.values():
+            models.append(json_fixer_model)
+    uses_embeddings = (
+        os.getenv("SKILLS_BACKEND", "llm").lower() == "embedding"
+        or os.getenv("EDU_FIELD_EMBEDDING_FALLBACK", "false").lower() == "true"
+    )
+    if "scoring" in role_models and uses_embeddings:
+        role_models["scoring"].append(get_embedding_model())
+    return role_models
+
+
+class ModelResidencyManager:
+    """
+    Keeps the worker's Ollama models loaded.
+
+    Models are loaded with an explicit keep_alive and warmed in parallel.
+    ensure_resident() compares them against each host's /api/ps and reloads
+    any that were evicted, only on the hosts that evicted them and the models
+    of the role with the larger backlog first.
+    """
+
+    def __init__(self, role_models: dict, max_workers: int = 3):
+        self.role_models = role_models
+        self.max_workers = max_workers
+        self.embedding_model = get_embedding_model()
+
+    @property
+    def models(self) -> list[str]:
+        return list(dict.fromkeys(model for models in self.role_models.values() for model in models))
+
+    def warm_model(self, model: str, clients: list | None = None) -> int:
+        """
+        Load a model without generating anything and return the time it took in ms.
+
+        Args:
+            model: Model to load
+            clients: Hosts to load it on, by default every host serving it, so
+                routed requests never hit a cold host
+
+        Raises:
+            RuntimeError: If Ollama cannot load the model
+        """
+        start = time.time()
+        try:
+            for client in get_ollama_clients(model) if clients is None else clients:
+                if model == self.embedding_model:
+                    client.embed(model=model, input="warm up", keep_alive=get_keep_alive())
+                else:
+                    # An empty prompt only loads the model
+                    client.generate(model=model, prompt="", keep_alive=get_keep_alive())
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model '{model}': {str(e)}") from e
+        return int((time.time() - start) * 1000)
+
+    def warm(self, models: list[str] | None = None, clients: dict | None = None) -> dict:
+        """
+        Load models in parallel.
+
+        Args:
+            models: Models to load, by default all managed models
+            clients: Optional {model: hosts to load it on}, see warm_model
+
+        Returns:
+            dict: {model: load time in ms, or None if it failed}
+        """
+        models = self.models if models is None else models
+        clients = clients or {}
+        if not models:
+            return {}
+
+        def warm_one(model):
+            try:
+                elapsed_ms = self.warm_model(model, clients.get(model))
+                print(f"  ✓ {model} loaded in {elapsed_ms} ms")
+                return elapsed_ms
+            except RuntimeError as e:
+                print(f"  ✗ {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(models)), thread_name_prefix="warm") as pool:
+            return dict(zip(models, pool.map(warm_one, models)))
+
+    def resident_models(self, client) -> set[str]:
+        """
+        Names of the models one Ollama host currently has loaded (/api/ps).
+
+        Raises:
+            RuntimeError: If the host cannot be reached
+        """
+        try:
+            return {entry.model for entry in client.ps().models}
+        except Exception as e:
+            raise RuntimeError(f"Failed to list loaded models: {str(e)}") from e
+
+    def evicted_hosts(self, models: list[str]) -> dict:
+        """
+        Hosts that should have each model loaded but do not.
+
+        Every host is asked once. A host that cannot be reached is skipped;
+        the pool ejects it and the next check retries.
+
+        Returns:
+            dict: {model: [clients missing it]} for the models missing anywhere
+        """
+        resident = {}
+        evicted = {}
+        for model in models:
+            for client in get_ollama_clients(model):
+                if id(client) not in resident:
+                    try:
+                        resident[id(client)] = self.resident_models(client)
+                    except RuntimeError as e:
+                        print(f"Model residency check failed: {e}")
+                        resident[id(client)] = None
+                if resident[id(client)] is not None and model not in resident[id(client)]:
+                    evicted.setdefault(model, []).append(client)
+        return evicted
+
+    def plan(self, backlog: dict | None = None) -> list[str]:
+        """
+        Order models by how soon they are needed.
+
+        Args:
+            backlog: Optional {role: waiting jobs}; the busiest role's models come first
+
+        Returns:
+            list[str]: Every managed model, most needed first
+        """
+        backlog = backlog or {}
+        roles = sorted(self.role_models, key=lambda role: backlog.get(role, 0), reverse=True)
+        return list(dict.fromkeys(model for role in roles for model in self.role_models[role]))
+
+    def ensure_resident(self, backlog: dict | None = None) -> dict:
+        """
+        Reload the models Ollama has evicted, in plan() order.
+
+        Loading happens in waves of max_workers, so with a backlog the busy
+        role's models are back first.
+
+        Returns:
+            dict: {model: load time in ms, or None if it failed} for the models reloaded
+        """
+        plan = self.plan(backlog)
+        evicted = self.evicted_hosts(plan)
+        missing = [model for model in plan if model in evicted]
+        if not missing:
+            return {}
+
+        print(f"Reloading evicted models: {', '.join(missing)} (backlog: {backlog or {}})")
+        warmed = {}
+        for start in range(0, len(missing), self.max_workers):
+            warmed.update(self.warm(missing[start:start + self.max_workers], evicted))
+        return warmed
+
+
+async def get_queue_backlog(queues, job_roles: dict, sample_size: int = 200) -> dict:
+    """
+    Count waiting jobs per role across bullmq queues.
+
+    Jobs are sampled from the head of each queue, so a shared queue is
+    split by job name.
+
+    Args:
+        queues: bullmq Queue objects
+        job_roles: {job name: role}
+        sample_size: Waiting jobs inspected per queue
+
+    Returns:
+        dict: {role: waiting jobs}
+    """
+    backlog = {}
+    for queue in queues:
+        jobs = await queue.getJobs(["waiting", "prioritized"], 0, sample_size - 1, True)
+        for job in jobs:
+            role = job_roles.get(job.name)
+            if role is not None:
+                backlog[role] = backlog.get(role, 0) + 1
+    return backlog
+
+
+async def run_model_residency(manager: ModelResidencyManager, get_backlog, stop_event: asyncio.Event, interval: float):
+    """
+    Warm every model, then keep them resident until stop_event is set.
+
+    Runs alongside the workers, so startup does not wait for models to load.
+    Every interval seconds the backlog is sampled and evicted models are
+    reloaded, the busy role's first.
+    """
+    print("Warming Ollama models...")
+    await asyncio.to_thread(manager.warm)
+    print("Model warm-up complete!")
+
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            break
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            backlog = await get_backlog()
+        except Exception as e:
+            print(f"Failed to sample queue backlog: {e}")
+            backlog = {}
+        await asyncio.to_thread(manager.ensure_resident, backlog)
@@ -1,6 +1,53 @@
 
-from src.utils.ollama import query_ollama_model
+from src.utils.ollama import (
+    get_model_digest,
+    get_model_digest_async,
+    query_ollama_structured,
+    query_ollama_structured_async,
+)
+from src.models.extraction import EducationTimezone, ResumeSkills
+from src.models.scoring import ExperiencePeriods
+from src.utils.timezone import parse_timezone, resolve_timezone_from_text, format_timezone
+from src.services.resume_preprocessing import split_resume_sections
+from src.storage.cache import TieredCache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import asyncio
 from datetime import datetime
+import hashlib
+import json
+import os
+import re
+import time
+
+# Extractor models queried for every resume, none depends on another's output
+EXTRACTOR_MODELS = [
+    "edu-timezone-extractor:latest",
+    "skills-extractor:latest",
+    "experience-extractor:latest",
+]
+
+# Output schema each extractor's decoding is constrained to
+EXTRACTOR_SCHEMAS = {
+    "edu-timezone-extractor:latest": EducationTimezone,
+    "skills-extractor:latest": ResumeSkills,
+    "experience-extractor:latest": ExperiencePeriods,
+}
+
+# Lines of the resume header searched for location hints
+TIMEZONE_HEADER_LINES = 15
+
+# Shared thread pool for fanning out extractor calls
+_extractor_pool = None
+
+# Singleton store of parsed resumes
+_parsed_resume_cache = None
+
+
+def _default_timeouts():
+    """Per-model timeouts in seconds, configurable via EXTRACTOR_TIMEOUT_SECONDS."""
+    timeout = float(os.getenv("EXTRACTOR_TIMEOUT_SECONDS", "300"))
+    return {model: timeout for model in EXTRACTOR_MODELS}
+
 
 def validate_year(year_str):
     """
@@ -42,35 +89,295 @@ def filter_experience_periods(experience_data):
     experience_data['experiencePeriods'] = filtered_periods
     return experience_data
 
-def parse_resume_text(resume_text):
+def resolve_resume_timezone(resume_text, extracted_timezone=None):
+    """
+    Normalize the extractor's timezone, falling back to rules when it has none.
+
+    A valid extracted timezone is kept. If it is missing or cannot be parsed,
+    the header (text before the first section heading, where the address and
+    phone number usually are) is searched for offsets, IANA names and known
+    locations. The header's first line is the applicant's name, which is
+    skipped, since names such as "Maria Santiago" read as places.
+
+    Returns:
+        str | None: Timezone as "GMT+X" / "GMT+X:XX", or None if unresolved
+    """
+    offset = parse_timezone(extracted_timezone) if extracted_timezone else None
+
+    if offset is None:
+        header = split_resume_sections(resume_text).get("header", "")
+        header_lines = [line for line in header.split("\n") if line.strip()][1:TIMEZONE_HEADER_LINES]
+        offset = resolve_timezone_from_text("\n".join(header_lines))
+
+    return format_timezone(offset) if offset is not None else None
+
+
+def _run_extractor(model, resume_text, on_partial=None):
+    """
+    Run a single extractor model and return its output with the elapsed time in ms.
+
+    on_partial, if given, is called as on_partial(model, partial output) while
+    the output streams in.
+    """
+    start = time.time()
+    result = query_ollama_structured(
+        model=model,
+        content=resume_text,
+        schema=EXTRACTOR_SCHEMAS[model],
+        on_partial=(lambda partial: on_partial(model, partial)) if on_partial else None,
+    )
+    return result.model_dump(by_alias=True, exclude_none=True), int((time.time() - start) * 1000)
+
+
+def _get_extractor_pool():
+    """Get or create the shared thread pool used to fan out extractor calls."""
+    global _extractor_pool
+    if _extractor_pool is None:
+        max_workers = int(os.getenv("PARSER_MAX_WORKERS", str(len(EXTRACTOR_MODELS))))
+        _extractor_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extractor")
+    return _extractor_pool
+
+
+def parse_resume_text(
+    resume_text,
+    concurrent=True,
+    timeouts=None,
+    allow_partial=False,
+    timings=None,
+    model_inputs=None,
+    on_partial=None,
+):
     """
     Parse the resume text using an AI model to extract structured information.
+
+    The edu-timezone, skills and experience extractors are independent of each
+    other, so by default they are queried concurrently and the parse takes about
+    as long as the slowest model. The timezone is normalized, and resolved by
+    rules when the model has none, see resolve_resume_timezone.
+
+    Args:
+        resume_text: The resume text extracted from the PDF
+        concurrent: Query the extractor models in parallel instead of one after another
+        timeouts: Optional {model: seconds} overrides for the per-model timeout
+        allow_partial: Return whatever extractors succeeded instead of failing the parse
+        timings: Optional dict that is filled with {model: elapsed_ms}
+        model_inputs: Optional {model: text} sent to that model instead of
+            resume_text, see preprocess_resume_text
+        on_partial: Optional callback(model, partial output) receiving each
+            extractor's output parsed so far, e.g. the first skills, while it streams
+
+    Returns:
+        dict: Merged output of all extractor models
+
+    Raises:
+        ValueError: If any extractor fails (and allow_partial is False)
     """
+    timeouts = {**_default_timeouts(), **(timeouts or {})}
+    if timings is None:
+        timings = {}
+    model_inputs = {model: (model_inputs or {}).get(model, resume_text) for model in EXTRACTOR_MODELS}
 
-    try:
-        print("Parsing resume text with AI model...")
-        education_and_timezone = query_ollama_model(model="edu-timezone-extractor:latest", content=resume_text)
-        print("Education and Timezone extracted:", education_and_timezone)
-        print("Extracting skills and experience...")
-        
-        skills = query_ollama_model(model="skills-extractor:latest", content=resume_text)
-        print("Skills extracted:", skills)
-        print("Extracting experience...")
+    results = {}
+    errors = {}
+
+    print("Parsing resume text with AI models...")
 
-        experience = query_ollama_model(model="experience-extractor:latest", content=resume_text)
-        print("Experience extracted:", experience)
+    if concurrent:
+        pool = _get_extractor_pool()
+        futures = {
+            model: pool.submit(_run_extractor, model, model_inputs[model], on_partial)
+            for model in EXTRACTOR_MODELS
+        }
+        start = time.time()
+        for model, future in futures.items():
+            # Each model's budget counts from the fan-out, not from when we get to it
+            remaining = max(0.0, start + timeouts[model] - time.time())
+            try:
+                results[model], timings[model] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                errors[model] = f"timed out after {timeouts[model]}s"
+            except Exception as e:
+                errors[model] = str(e)
+    else:
+        for model in EXTRACTOR_MODELS:
+            try:
+                results[model], timings[model] = _run_extractor(model, model_inputs[model], on_partial)
+            except Exception as e:
+                errors[model] = str(e)
+
+    return _merge_extractor_results(resume_text, results, errors, timings, allow_partial)
+
+
+def _merge_extractor_results(resume_text, results, errors, timings, allow_partial):
+    """
+    Merge the extractor outputs into one parsed resume.
+
+    Raises:
+        ValueError: If any extractor failed (and allow_partial is False)
+    """
+    for model in EXTRACTOR_MODELS:
+        if model in results:
+            print(f"{model} extracted in {timings[model]} ms:", results[model])
+        else:
+            print(f"{model} failed: {errors[model]}")
+
+    if errors and not allow_partial:
+        failed = "; ".join(f"{model}: {error}" for model, error in errors.items())
+        raise ValueError(f"Failed to parse resume text: {failed}")
+
+    try:
+        experience = results.get("experience-extractor:latest", {})
 
         # Filter out unreasonable years from experience
         experience = filter_experience_periods(experience)
         print("Experience after filtering:", experience)
 
         parsed_resume = {
-            **education_and_timezone,
-            **skills,
+            **results.get("edu-timezone-extractor:latest", {}),
+            **results.get("skills-extractor:latest", {}),
             **experience,
         }
 
+        # Normalize the model's timezone, rules fill in when it has none
+        timezone = resolve_resume_timezone(resume_text, parsed_resume.get("timezone"))
+        if timezone is not None:
+            parsed_resume["timezone"] = timezone
+
         return parsed_resume
 
     except Exception as e:
-        raise ValueError(f"Failed to parse resume text: {str(e)}") from e
\ No newline at end of file
+        raise ValueError(f"Failed to parse resume text: {str(e)}") from e
+
+
+async def _run_extractor_async(model, resume_text, on_partial=None):
+    """Async _run_extractor."""
+    start = time.time()
+    result = await query_ollama_structured_async(
+        model=model,
+        content=resume_text,
+        schema=EXTRACTOR_SCHEMAS[model],
+        on_partial=(lambda partial: on_partial(model, partial)) if on_partial else None,
+    )
+    return result.model_dump(by_alias=True, exclude_none=True), int((time.time() - start) * 1000)
+
+
+async def parse_resume_text_async(
+    resume_text,
+    timeouts=None,
+    allow_partial=False,
+    timings=None,
+    model_inputs=None,
+    on_partial=None,
+):
+    """
+    Async parse_resume_text: the extractors are awaited concurrently on the
+    event loop, without a thread per model call.
+
+    Arguments, return value and errors are those of parse_resume_text.
+    """
+    timeouts = {**_default_timeouts(), **(timeouts or {})}
+    if timings is None:
+        timings = {}
+    model_inputs = {model: (model_inputs or {}).get(model, resume_text) for model in EXTRACTOR_MODELS}
+
+    print("Parsing resume text with AI models...")
+
+    # All budgets count from the fan-out
+    outcomes = await asyncio.gather(*(
+        asyncio.wait_for(_run_extractor_async(model, model_inputs[model], on_partial), timeouts[model])
+        for model in EXTRACTOR_MODELS
+    ), return_exceptions=True)
+
+    results = {}
+    errors = {}
+    for model, outcome in zip(EXTRACTOR_MODELS, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            errors[model] = f"timed out after {timeouts[model]}s"
+        elif isinstance(outcome, Exception):
+            errors[model] = str(outcome)
+        else:
+            results[model], timings[model] = outcome
+
+    return _merge_extractor_results(resume_text, results, errors, timings, allow_partial)
+
+
+def get_parsed_resume_cache():
+    """
+    Get or create the singleton parsed resume store.
+
+    Least recently used entries are evicted past PARSED_RESUME_CACHE_MAX_ENTRIES.
+    """
+    global _parsed_resume_cache
+    if _parsed_resume_cache is None:
+        _parsed_resume_cache = TieredCache(
+            "parsed_resumes",
+            memory_entries=256,
+            max_entries=int(os.getenv("PARSED_RESUME_CACHE_MAX_ENTRIES", "10000")),
+        )
+    return _parsed_resume_cache
+
+
+def normalize_resume_text(resume_text):
+    """Normalize whitespace so trivially different extractions share a cache entry."""
+    return re.sub(r"\s+", " ", resume_text).strip()
+
+
+def parsed_resume_cache_key(resume_text, model_inputs=None, digests=None):
+    """
+    Key a resume by its normalized text and the digests of the extractor models.
+
+    Re-creating any extractor from a changed modelfile changes its digest, so
+    results parsed by the old model are never reused. Per-model inputs are
+    part of the key, so a changed routing or token budget parses again.
+    digests, if given, are the extractor digests in EXTRACTOR_MODELS order.
+    """
+    digests = digests or [get_model_digest(model) for model in EXTRACTOR_MODELS]
+    inputs = [normalize_resume_text((model_inputs or {}).get(model, resume_text)) for model in EXTRACTOR_MODELS]
+    payload = json.dumps([normalize_resume_text(resume_text), inputs, digests])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def parse_resume_text_cached(resume_text, **kwargs):
+    """
+    Parse resume text, reusing the stored result if the same text was parsed before.
+
+    Candidates applying to several jobs share one parse. Only complete parses
+    are stored. Keyword arguments are passed on to parse_resume_text.
+
+    Returns:
+        tuple[dict, bool]: (parsed resume, whether it came from the store)
+    """
+    cache = get_parsed_resume_cache()
+    key = parsed_resume_cache_key(resume_text, kwargs.get("model_inputs"))
+
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached), True
+
+    parsed_resume = parse_resume_text(resume_text, **kwargs)
+    if not kwargs.get("allow_partial"):
+        cache.set(key, json.dumps(parsed_resume))
+    return parsed_resume, False
+
+
+async def parse_resume_text_cached_async(resume_text, **kwargs):
+    """
+    Async parse_resume_text_cached, keyword arguments are passed on to
+    parse_resume_text_async.
+
+    Returns:
+        tuple[dict, bool]: (parsed resume, whether it came from the store)
+    """
+    cache = get_parsed_resume_cache()
+    digests = [await get_model_digest_async(model) for model in EXTRACTOR_MODELS]
+    key = parsed_resume_cache_key(resume_text, kwargs.get("model_inputs"), digests)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached), True
+
+    parsed_resume = await parse_resume_text_async(resume_text, **kwargs)
+    if not kwargs.get("allow_partial"):
+        cache.set(key, json.dumps(parsed_resume))
+    return parsed_resume, False
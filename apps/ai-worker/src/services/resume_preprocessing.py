@@ -0,0 +1,238 @@
+import os
+import re
+from collections import Counter
+
+# Separator extract_resume_text puts between pages, so page furniture can be found
+PAGE_SEPARATOR = "\f"
+
+# Rough size of a prompt token, good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Context left for the model's reply when deriving a budget from num_ctx
+OUTPUT_TOKEN_RESERVE = 2048
+
+MODELFILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "modelfiles")
+
+NUM_CTX_PATTERN = re.compile(r"^PARAMETER\s+num_ctx\s+(\d+)", re.MULTILINE)
+
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+
+# Lines with dates are resume content, never page furniture, even at a page edge
+DATE_PATTERN = re.compile(
+    r"\b(19|20)\d{2}\b|\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\b|\bpresent\b",
+    re.IGNORECASE,
+)
+
+# Heading keywords for each resume section, matched against short heading lines
+SECTION_HEADINGS = {
+    "education": ["education", "educational background", "academic background", "academic qualifications"],
+    "skills": ["skills", "technical skills", "computer skills", "core competencies", "competencies", "technologies", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history", "work history", "career history"],
+    "summary": ["summary", "profile", "professional summary", "objective", "about me"],
+    "references": ["references", "character references", "character reference"],
+    "other": ["activities", "activities and interests", "interests", "hobbies", "seminars", "trainings", "certifications", "awards", "projects", "languages"],
+}
+
+# Sections each extractor needs, "header" is the text before the first heading (name, contact, location)
+EXTRACTOR_SECTIONS = {
+    "edu-timezone-extractor:latest": ["header", "education"],
+    "skills-extractor:latest": ["summary", "skills", "experience", "other"],
+    "experience-extractor:latest": ["experience"],
+}
+
+
+def _furniture_key(line):
+    """
+    Compare lines with digits masked, so "Resume | Page 1" and "Resume | Page 2" count as the same furniture.
+
+    Lines with a year or month name get no key, so date ranges such as
+    "2019 - 2021" at the top of several pages are never taken for furniture,
+    and neither do bare numbers, which are only dropped as page numbers on a
+    page's first or last line.
+    """
+    line = line.strip()
+    if DATE_PATTERN.search(line) or PAGE_NUMBER_PATTERN.match(line):
+        return None
+    return re.sub(r"\d+", "#", line.casefold())
+
+
+def clean_resume_text(resume_text):
+    """
+    Remove page furniture and redundant whitespace from extracted resume text.
+
+    Lines repeated at the top or bottom of most pages (headers, footers) are
+    dropped, as are page numbers on a page's first or last line and
+    consecutive duplicate lines.
+    Whitespace runs are collapsed and pdfium's soft hyphen marker is restored.
+    """
+    text = resume_text.replace("\r\n", "\n").replace("\r", "\n").replace("\ufffe", "-")
+    pages = [page.split("\n") for page in text.split(PAGE_SEPARATOR)]
+
+    # Count each page's edge lines once per page
+    furniture = set()
+    if len(pages) > 1:
+        edge_counts = Counter()
+        for lines in pages:
+            non_empty = [line for line in lines if line.strip()]
+            edge_counts.update({_furniture_key(line) for line in non_empty[:3] + non_empty[-3:]})
+        min_pages = max(2, (len(pages) + 1) // 2)
+        furniture = {key for key, count in edge_counts.items() if count >= min_pages and key}
+
+    cleaned = []
+    for lines in pages:
+        non_empty = [index for index, line in enumerate(lines) if line.strip()]
+        edges = {non_empty[0], non_empty[-1]} if non_empty else set()
+        for index, line in enumerate(lines):
+            line = re.sub(r"[ \t\u00a0]+", " ", line).strip()
+            if not line:
+                if cleaned and cleaned[-1] != "":
+                    cleaned.append("")
+                continue
+            if index in edges and PAGE_NUMBER_PATTERN.match(line):
+                continue
+            if _furniture_key(line) in furniture:
+                continue
+            if cleaned and cleaned[-1] == line:
+                continue
+            cleaned.append(line)
+
+    return "\n".join(cleaned).strip()
+
+
+def _heading_section(line):
+    """Return the section a heading line starts, or None if the line is not a heading."""
+    words = line.split()
+    if not words or len(words) > 5:
+        return None
+    heading = re.sub(r"[^a-z ]", "", line.casefold()).strip()
+    for section, keywords in SECTION_HEADINGS.items():
+        if heading in keywords:
+            return section
+    return None
+
+
+def split_resume_sections(resume_text):
+    """
+    Split cleaned resume text into sections by their headings.
+
+    Returns:
+        dict: {section: text}, text before the first heading is under "header"
+    """
+    sections = {"header": []}
+    current = "header"
+    for line in resume_text.split("\n"):
+        section = _heading_section(line)
+        if section is not None:
+            current = section
+            sections.setdefault(current, [])
+        sections[current].append(line)
+    joined = {section: "\n".join(lines).strip() for section, lines in sections.items()}
+    return {section: text for section, text in joined.items() if text}
+
+
+def truncate_to_budget(text, max_tokens):
+    """Cut text to roughly max_tokens prompt tokens, on a line boundary where possible."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if not max_tokens or len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[: cut if cut > max_chars // 2 else max_chars].strip()
+
+
+def get_context_budget(model):
+    """
+    Prompt tokens that fit a model's context window.
+
+    Read from its modelfile (modelfiles/<name>/Modelfile, e.g.
+    experience_extractor for "experience-extractor:latest"): num_ctx minus
+    the system prompt and OUTPUT_TOKEN_RESERVE for the reply.
+
+    Returns:
+        int: The budget, or 0 (no limit) if the modelfile has no num_ctx
+    """
+    name = model.split(":", 1)[0].replace("-", "_")
+    try:
+        with open(os.path.join(MODELFILES_DIR, name, "Modelfile"), encoding="utf-8") as f:
+            modelfile = f.read()
+    except OSError:
+        return 0
+    match = NUM_CTX_PATTERN.search(modelfile)
+    if match is None:
+        return 0
+    return max(0, int(match.group(1)) - len(modelfile) // CHARS_PER_TOKEN - OUTPUT_TOKEN_RESERVE)
+
+
+def get_token_budgets(models):
+    """
+    Per-model prompt token budgets.
+
+    By default each model's budget is what fits its context window, see
+    get_context_budget, so text is only cut where Ollama would otherwise
+    truncate the prompt itself. EXTRACTOR_TOKEN_BUDGET sets one budget for
+    every model instead (0 disables budgeting) and EXTRACTOR_TOKEN_BUDGETS
+    overrides single models, e.g.
+    "experience-extractor:latest=1500,skills-extractor:latest=1000".
+    """
+    default = os.getenv("EXTRACTOR_TOKEN_BUDGET")
+    budgets = {
+        model: int(default) if default is not None else get_context_budget(model)
+        for model in models
+    }
+    for entry in os.getenv("EXTRACTOR_TOKEN_BUDGETS", "").split(","):
+        if "=" in entry:
+            model, budget = entry.rsplit("=", 1)
+            budgets[model.strip()] = int(budget)
+    return budgets
+
+
+def route_resume_sections(resume_text, budgets=None):
+    """
+    Build each extractor's input from only the sections it needs.
+
+    A model whose sections are not found gets the whole text instead, so an
+    unusual layout never hides information from it.
+
+    Returns:
+        dict: {model: text}
+    """
+    budgets = budgets if budgets is not None else get_token_budgets(EXTRACTOR_SECTIONS)
+    sections = split_resume_sections(resume_text)
+
+    model_inputs = {}
+    for model, wanted in EXTRACTOR_SECTIONS.items():
+        parts = [sections[section] for section in wanted if section in sections and section != "header"]
+        if not parts:
+            text = resume_text
+        else:
+            if "header" in wanted and "header" in sections:
+                parts.insert(0, sections["header"])
+            text = "\n\n".join(parts)
+        model_inputs[model] = truncate_to_budget(text, budgets.get(model, 0))
+    return model_inputs
+
+
+def preprocess_resume_text(resume_text, route_sections=None, budgets=None):
+    """
+    Prepare extracted resume text for the extractor models.
+
+    Args:
+        resume_text: Text from extract_resume_text, pages separated by PAGE_SEPARATOR
+        route_sections: Send each extractor only its sections, defaults to
+            the RESUME_SECTION_ROUTING env setting
+        budgets: Optional {model: max prompt tokens}, see get_token_budgets
+
+    Returns:
+        tuple[str, dict]: (cleaned text, {model: text to send that model})
+    """
+    if route_sections is None:
+        route_sections = os.getenv("RESUME_SECTION_ROUTING", "false").lower() == "true"
+    budgets = budgets if budgets is not None else get_token_budgets(EXTRACTOR_SECTIONS)
+
+    cleaned = clean_resume_text(resume_text)
+    if route_sections:
+        return cleaned, route_resume_sections(cleaned, budgets)
+
+    return cleaned, {
+        model: truncate_to_budget(cleaned, budgets.get(model, 0))
+        for model in EXTRACTOR_SECTIONS
+    }
@@ -1,11 +1,19 @@
 
+import asyncio
 import json
+import os
+import numpy as np
 from src.config.constants import DEGREE_VALUES, MONTH_MAP
-from src.utils.ollama import query_ollama_model
-from src.utils.timezone import tz_score, parse_timezone
+from src.utils.ollama import query_ollama_structured_async
+from src.models.scoring import JobSkillScores, RelevanceEvaluations
+from src.services.education_fields import get_education_field_index
+from src.services.skill_matching import match_skills_by_rules, merge_scored_skills
+from src.services.skill_embeddings import get_skill_embedding_index
+from src.services.experience_relevance import get_experience_relevance_index, normalize_job_title
+from src.utils.timezone import tz_score, tz_scores, parse_timezone
 from datetime import datetime
 
-def score_education_match(
+async def score_education_match(
     applicant_highest_degree: str,
     applicant_education_field: str,
     job_required_degree: str,
@@ -26,104 +34,169 @@ def score_education_match(
         ) * 100
 
 
-    # Calculate field score
-    field_score = 0
-
-    try:
-        field_score = query_ollama_model(model="edu-match:latest", content=f"{job_education_field}, {applicant_education_field}", json_output=False)
-        field_score = float(field_score)
-    except Exception as e:
-        raise ValueError(f"Failed to score education field match: {str(e)}") from e
+    # Calculate field score, looked up from the memoized field-pair index
+    field_score = await get_education_field_index().get_similarity(job_education_field, applicant_education_field)
     
     # Calculate overall education score
     overall_score = (degree_score * 0.6) + (field_score * 0.4)
 
     return overall_score
 
-def score_skills_match(job_skills, applicant_skills):
-    # job_skills: [{name: str, weight: float}]
-    # This is a weighed average match score, the weight is a points assigned to each skill based on its importance to the job.
+def get_skills_backend():
+    """Skill matching backend, "llm" (skills_score) or "embedding", set via SKILLS_BACKEND."""
+    return os.getenv("SKILLS_BACKEND", "llm").lower()
 
-    # applicant_skills: [str]
 
-    try:
-        payload = {
-        "job_skills": [skill['name'] for skill in job_skills],
-        "applicant_skills": applicant_skills
-        }
+def _use_skill_rules(use_rules):
+    if use_rules is None:
+        return os.getenv("SKILLS_RULE_PREPASS", "true").lower() == "true"
+    return use_rules
 
-        json_payload = json.dumps(payload, indent=2)
 
-        # {"job_skills": [{"skill": str, "match_type": str, "from_cv": str or None, "score": float, "reason": str}]}
-        scored_skills = query_ollama_model(model="skills_score:latest", content=json_payload)
+def summarize_skill_matches(job_skills, scored_entries):
+    """
+    Turn per job skill match entries into the weighted score and API payload.
 
+    scored_entries are in skills_score's output shape:
+    [{"skill": str, "match_type": str, "from_cv": str or None, "score": float, "reason": str}]
+    """
+    job_weight_map = {skill['name']: float(skill['weight']) for skill in job_skills}
 
-        job_weight_map = {skill['name']: float(skill['weight']) for skill in job_skills}
+    # 2. Calculate Total Possible Points
+    total_job_skills_points = sum(job_weight_map.values())
 
-        # 2. Calculate Total Possible Points
-        total_job_skills_points = sum(job_weight_map.values())
+    # 3. Calculate Matched Points
+    total_matched_skill_points = 0.0
 
-        # 3. Calculate Matched Points
-        total_matched_skill_points = 0.0
+    final_score = 0.0
 
-        final_score = 0.0
+    disqualified = False
+    required_skills = [skill['name'] for skill in job_skills if float(skill['weight']) >= 10]
+    n_required_skills_matched = 0
+    
+    for match in scored_entries:
+        skill_name = match['skill']
+        match_score = float(match['score'])
+        
+        # Get weight from the map
+        weight = job_weight_map.get(skill_name, 0)
 
-        disqualified = False
-        required_skills = [skill['name'] for skill in job_skills if float(skill['weight']) >= 10]
-        n_required_skills_matched = 0
+        if weight >= 10 and match_score > 0:
+            n_required_skills_matched += 1
         
-        for match in scored_skills["job_skills"]:
-            skill_name = match['skill']
-            match_score = float(match['score'])
-            
-            # Get weight from the map
-            weight = job_weight_map.get(skill_name, 0)
-
-            if weight >= 10 and match_score > 0:
-                n_required_skills_matched += 1
-            
-            # Multiply Weight by the Semantic Match Score (1.0 or 0.5)
-            # 10 * 1.0 = 10
-            # 5 * 0.5 = 2.5
-            points_earned = weight * match_score
-            
-            total_matched_skill_points += points_earned
+        # Multiply Weight by the Semantic Match Score (1.0 or 0.5)
+        # 10 * 1.0 = 10
+        # 5 * 0.5 = 2.5
+        points_earned = weight * match_score
         
-        # Disqualify if not all required skills are matched
-        if n_required_skills_matched < len(required_skills):
-            disqualified = True
+        total_matched_skill_points += points_earned
+    
+    # Disqualify if not all required skills are matched
+    if n_required_skills_matched < len(required_skills):
+        disqualified = True
+
+    # 4. Final Calculation
+    if total_job_skills_points > 0:
+        final_score = (total_matched_skill_points / total_job_skills_points) * 100
+    else:
+        final_score = 0
+
+    scored_skills_payload = [
+            {
+                "jobSkill": entry["skill"],
+                "matchType": entry["match_type"],
+                "applicantSkill": (
+                    entry["from_cv"] if entry["from_cv"] is not None else ""
+                ),
+                "score": entry["score"],
+                "reason": entry.get("reason", ""),
+            } for entry in scored_entries
+        ]
+    
+
+
+    return {
+        "score": final_score,
+        "scored_skills": scored_skills_payload,
+        "disqualified": disqualified
+    }
+
 
-        # 4. Final Calculation
-        if total_job_skills_points > 0:
-            final_score = (total_matched_skill_points / total_job_skills_points) * 100
+async def score_skills_match(job_skills, applicant_skills, use_rules=None, backend=None):
+    # job_skills: [{name: str, weight: float}]
+    # This is a weighed average match score, the weight is a points assigned to each skill based on its importance to the job.
+
+    # applicant_skills: [str]
+
+    # Skills the applicant lists explicitly are matched by rules, only the rest go
+    # to skills_score (or the embedding index with SKILLS_BACKEND=embedding).
+    # Toggle the rules with SKILLS_RULE_PREPASS.
+    use_rules = _use_skill_rules(use_rules)
+    backend = backend or get_skills_backend()
+
+    try:
+        job_skill_names = [skill['name'] for skill in job_skills]
+
+        if use_rules:
+            resolved, unresolved = match_skills_by_rules(job_skill_names, applicant_skills)
         else:
-            final_score = 0
-
-        scored_skills_payload = [
-                {
-                    "jobSkill": entry["skill"],
-                    "matchType": entry["match_type"],
-                    "applicantSkill": (
-                        entry["from_cv"] if entry["from_cv"] is not None else ""
-                    ),
-                    "score": entry["score"],
-                    "reason": entry.get("reason", ""),
-                } for entry in scored_skills["job_skills"]
-            ]
-        
+            resolved, unresolved = {}, job_skill_names
+
+        model_entries = []
+        if unresolved and backend == "embedding":
+            model_entries = (await get_skill_embedding_index().score_skills(unresolved, [applicant_skills]))[0]
+        elif unresolved:
+            payload = {
+            "job_skills": unresolved,
+            "applicant_skills": applicant_skills
+            }
 
+            json_payload = json.dumps(payload, indent=2)
 
-        return {
-            "score": final_score,
-            "scored_skills": scored_skills_payload,
-            "disqualified": disqualified
-        }
+            # {"job_skills": [{"skill": str, "match_type": str, "from_cv": str or None, "score": float, "reason": str}]}
+            scored = await query_ollama_structured_async(model="skills_score:latest", content=json_payload, schema=JobSkillScores)
+            model_entries = scored.model_dump(mode="json")["job_skills"]
+
+        return summarize_skill_matches(job_skills, merge_scored_skills(job_skill_names, resolved, model_entries))
+    except Exception as e:
+        raise ValueError(f"Failed to score skills match: {str(e)}") from e
+
+
+async def score_skills_match_batch(job_skills, applicant_skill_lists, use_rules=None):
+    """
+    Score many applicants' skills with the embedding backend in one pass.
+
+    Rule matches are resolved per applicant, then every applicant's remaining
+    job skills are scored from a single job x applicant-skill similarity matrix.
+
+    Returns:
+        list[dict]: One score_skills_match result per applicant, in input order
+
+    Raises:
+        ValueError: If the skill embeddings cannot be computed
+    """
+    use_rules = _use_skill_rules(use_rules)
+    try:
+        job_skill_names = [skill['name'] for skill in job_skills]
+        resolved_lists = [
+            match_skills_by_rules(job_skill_names, applicant_skills)[0] if use_rules else {}
+            for applicant_skills in applicant_skill_lists
+        ]
+        embedding_lists = await get_skill_embedding_index().score_skills(job_skill_names, applicant_skill_lists)
+
+        results = []
+        for resolved, embedding_entries in zip(resolved_lists, embedding_lists):
+            model_entries = [entry for entry in embedding_entries if entry["skill"] not in resolved]
+            results.append(summarize_skill_matches(
+                job_skills, merge_scored_skills(job_skill_names, resolved, model_entries)
+            ))
+        return results
     except Exception as e:
         raise ValueError(f"Failed to score skills match: {str(e)}") from e
 
 
 def score_timezone_match(applicant_timezone: str, job_timezone: str):
-    # BOTH are in "GMT+X" or "GMT-X" format str
+    # Usually "GMT+X" / "GMT-X", abbreviations, IANA names and known locations also resolve
     try:
         applicant_offset = parse_timezone(applicant_timezone)
         job_offset = parse_timezone(job_timezone)
@@ -140,7 +213,31 @@ def score_timezone_match(applicant_timezone: str, job_timezone: str):
         raise ValueError(f"Failed to score timezone match: {str(e)}") from e
 
 
-def score_experience_match(experience_periods: list[dict], job_relevant_experience_years: int, job_title: str): 
+def score_timezone_match_batch(applicant_timezones: list[str], job_timezone: str) -> list[dict | None]:
+    """
+    Score many applicant timezones against one job timezone in one vectorized pass.
+
+    Returns one score_timezone_match-shaped result per applicant, in input
+    order, or None for a timezone that cannot be resolved.
+
+    Raises:
+        ValueError: If the job timezone cannot be resolved
+    """
+    job_offset = parse_timezone(job_timezone)
+    if job_offset is None:
+        raise ValueError(f"Failed to score timezone match: Invalid timezone format '{job_timezone}'")
+
+    offsets = [parse_timezone(timezone) for timezone in applicant_timezones]
+    resolved = [index for index, offset in enumerate(offsets) if offset is not None]
+    scores, diffs = tz_scores([offsets[index] for index in resolved], job_offset)
+
+    results = [None] * len(applicant_timezones)
+    for index, score, diff in zip(resolved, scores, diffs):
+        results[index] = {"score": float(score), "difference_in_hours": float(diff)}
+    return results
+
+
+async def score_experience_match(experience_periods: list[dict], job_relevant_experience_years: int, job_title: str): 
     # takes in experience periods.
     # "experiencePeriods": [
     #     { "startYear": "2024", "startMonth": "None", "endYear": "Present", "endMonth": "None", "jobTitle": "Computer Programmer, City Medical Center" },
@@ -154,72 +251,20 @@ def score_experience_match(experience_periods: list[dict], job_relevant_experien
     print(experience_periods)
 
     try:
-        payload = {
-            "experiencePeriods": experience_periods,
-            "jobTitle": job_title,
-        }
-
-        json_payload = json.dumps(payload, indent=2)
-        # This returns the same experience periods list with an added field: relevant: bool
-
-        added_relevant_experiences = query_ollama_model(model="exp_relevance_eval:latest", content=json_payload)
-
-        experience_periods_with_relevance = added_relevant_experiences['experiencePeriods']
-
-
-        # Calculate total relevant experience years
+        # Repeat role titles are answered from the relevance store without a model call
+        experience_periods_with_relevance = (await evaluate_experience_relevance_batch([experience_periods], job_title))[0]
+        if isinstance(experience_periods_with_relevance, Exception):
+            raise experience_periods_with_relevance
 
-        current_year = datetime.now().year
-        current_month = datetime.now().month
-
-        ranges = []
-        for exp in experience_periods_with_relevance:
-            if not exp.get("relevant", False):
-                continue
-
-            start_year = int(exp["startYear"])
-            start_month = MONTH_MAP.get(exp["startMonth"], 1)
-
-            if exp["endYear"] == "Present":
-                end_year = current_year
-                end_month = current_month
-            else:
-                end_year = int(exp["endYear"])
-                end_month = MONTH_MAP.get(exp["endMonth"], 1)
-
-            start_index = start_year * 12 + start_month
-            end_index = end_year * 12 + end_month
-
-            ranges.append((start_index, end_index))
-        if not ranges:
+        if not any(exp.get("relevant", False) for exp in experience_periods_with_relevance):
             return {
                 "score": 0.0,
                 "years_of_experience": 0.0,
                 "experience_periods_with_relevance": experience_periods_with_relevance
             }
-        
-        ranges.sort()
-        merged = [ranges[0]]
-
-        for start, end in ranges[1:]:
-            last_start, last_end = merged[-1]
-            if start <= last_end:  # overlap or continuous
-                merged[-1] = (last_start, max(last_end, end))
-            else:
-                merged.append((start, end))
-
-        total_months = sum(end - start for start, end in merged)
-        total_years = total_months // 12
-        remaining_months = total_months % 12
-
-        total_years_with_months = total_years + (remaining_months / 12)
-
-        # Score calculation based on required years, if more than required, give bonus
-        if total_years_with_months >= job_relevant_experience_years:
-            bonus = (total_years_with_months - job_relevant_experience_years) * 3
-            score = 100 + bonus
-        else:
-            score = (total_years_with_months / job_relevant_experience_years) * 100
+
+        total_years_with_months = calculate_relevant_experience_years(experience_periods_with_relevance)
+        score = calculate_experience_score(total_years_with_months, job_relevant_experience_years)
 
         # return (relevant_experience, score, total_years_with_months)
         return {
@@ -230,4 +275,227 @@ def score_experience_match(experience_periods: list[dict], job_relevant_experien
 
 
     except Exception as e:
-        raise ValueError(f"Failed to score experience match: {str(e)}") from e
\ No newline at end of file
+        raise ValueError(f"Failed to score experience match: {str(e)}") from e
+
+
+async def evaluate_experience_relevance(experience_periods: list[dict], job_title: str) -> list[dict]:
+    """
+    Ask exp_relevance_eval which experience periods are relevant to the job title.
+
+    Returns the same experience periods list with an added field: relevant: bool
+    """
+    payload = {
+        "experiencePeriods": experience_periods,
+        "jobTitle": job_title,
+    }
+
+    json_payload = json.dumps(payload, indent=2)
+
+    added_relevant_experiences = await query_ollama_structured_async(
+        model="exp_relevance_eval:latest",
+        content=json_payload,
+        schema=RelevanceEvaluations,
+    )
+
+    return added_relevant_experiences.model_dump()['experiencePeriods']
+
+
+async def evaluate_experience_relevance_batch(
+    experience_period_lists: list[list[dict]],
+    job_title: str,
+    max_periods_per_call: int = 40,
+) -> list[list[dict]]:
+    """
+    Evaluate experience relevance for several applicants against one job title.
+
+    Relevance depends only on the (role title, job title) pair, so results are
+    stored per normalized title pair and only unseen role titles reach the
+    model. Those are sent once each as compact {"jobTitle": ...} periods,
+    packed up to max_periods_per_call per exp_relevance_eval call, and the
+    calls are awaited concurrently. Results are matched back by their
+    normalized jobTitle, never by position; titles the model dropped or
+    renamed get one call each, and a title that still cannot be matched
+    counts as not relevant without being stored. A packed call that fails
+    falls back to one call per title as well, so only the applicants with a
+    title that failed on its own call get an error.
+
+    Args:
+        experience_period_lists: One list of experience periods per applicant
+        job_title: Target job title
+        max_periods_per_call: Maximum number of titles packed into one prompt
+
+    Returns:
+        list[list[dict] | ValueError]: Periods with relevance, in the same
+            order as the input, or the error for an applicant with a title
+            that could not be evaluated
+    """
+    index = get_experience_relevance_index()
+
+    # One representative original title per normalized title, in first-seen order
+    titles = {}
+    for periods in experience_period_lists:
+        for period in periods or []:
+            titles.setdefault(normalize_job_title(period.get("jobTitle", "")), period.get("jobTitle", ""))
+
+    relevance = await index.get_many(job_title, list(titles))
+    unseen = [title for title in titles if title not in relevance]
+    chunks = [unseen[i:i + max_periods_per_call] for i in range(0, len(unseen), max(1, max_periods_per_call))]
+
+    async def evaluate_chunk(chunk):
+        results, errors = {}, {}
+        if len(chunk) > 1:
+            compact = [{"jobTitle": titles[title]} for title in chunk]
+            try:
+                packed = await evaluate_experience_relevance(compact, job_title) or []
+            except Exception as e:
+                print(f"Packed relevance call for {len(chunk)} titles failed, evaluating them one by one: {e}")
+                packed = []
+            for result in packed:
+                title = normalize_job_title(result.get("jobTitle", ""))
+                if title in chunk and title not in results:
+                    results[title] = bool(result.get("relevant", False))
+
+        for title in chunk:
+            if title not in results:
+                # One title in, one result out: the answer is for this title
+                try:
+                    evaluated = await evaluate_experience_relevance([{"jobTitle": titles[title]}], job_title) or []
+                except Exception as e:
+                    errors[title] = e
+                    continue
+                if len(evaluated) == 1:
+                    results[title] = bool(evaluated[0].get("relevant", False))
+        return results, errors
+
+    failed = {}
+    for chunk_result, chunk_errors in await asyncio.gather(*(evaluate_chunk(chunk) for chunk in chunks)):
+        await index.set_many(job_title, chunk_result)
+        relevance.update(chunk_result)
+        failed.update(chunk_errors)
+
+    return [_periods_with_relevance(periods, titles, relevance, failed) for periods in experience_period_lists]
+
+
+def _periods_with_relevance(periods, titles, relevance, failed):
+    """One applicant's periods with their relevance, or the error of a title that failed."""
+    for period in periods or []:
+        title = normalize_job_title(period.get("jobTitle", ""))
+        if title in failed:
+            return ValueError(f"Failed to evaluate relevance of '{titles[title]}': {str(failed[title])}")
+    return [
+        {**period, "relevant": relevance.get(normalize_job_title(period.get("jobTitle", "")), False)}
+        for period in periods or []
+    ]
+
+
+def _period_month_range(exp: dict, now: datetime) -> tuple[int, int]:
+    """Start and end of an experience period as month indices (year * 12 + month)."""
+    start_year = int(exp["startYear"])
+    start_month = MONTH_MAP.get(exp["startMonth"], 1)
+
+    if exp["endYear"] == "Present":
+        end_year = now.year
+        end_month = now.month
+    else:
+        end_year = int(exp["endYear"])
+        end_month = MONTH_MAP.get(exp["endMonth"], 1)
+
+    return start_year * 12 + start_month, end_year * 12 + end_month
+
+
+def calculate_relevant_experience_years(experience_periods_with_relevance: list[dict], now: datetime | None = None) -> float:
+    """
+    Total years covered by the relevant experience periods, overlaps counted once.
+    """
+    now = now or datetime.now()
+
+    ranges = [
+        _period_month_range(exp, now)
+        for exp in experience_periods_with_relevance
+        if exp.get("relevant", False)
+    ]
+    if not ranges:
+        return 0.0
+
+    ranges.sort()
+    merged = [ranges[0]]
+
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end:  # overlap or continuous
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    total_months = sum(end - start for start, end in merged)
+    total_years = total_months // 12
+    remaining_months = total_months % 12
+
+    return total_years + (remaining_months / 12)
+
+
+def calculate_relevant_experience_years_batch(
+    experience_period_lists: list[list[dict]],
+    now: datetime | None = None,
+) -> np.ndarray:
+    """
+    Vectorized calculate_relevant_experience_years for many applicants at once.
+
+    All relevant periods become one array of month-index intervals. They are
+    sorted by (applicant, start), and a cumulative max of the interval ends,
+    offset per applicant so groups never mix, gives the end covered so far.
+    Each interval adds only the months past that point.
+
+    Args:
+        experience_period_lists: Periods with relevance, one list per applicant
+        now: Moment "Present" refers to, defaults to the current time
+
+    Returns:
+        np.ndarray: Relevant years per applicant, in input order
+    """
+    now = now or datetime.now()
+
+    applicant_ids, starts, ends = [], [], []
+    for applicant_id, periods in enumerate(experience_period_lists):
+        for exp in periods or []:
+            if exp.get("relevant", False):
+                start, end = _period_month_range(exp, now)
+                applicant_ids.append(applicant_id)
+                starts.append(start)
+                ends.append(end)
+
+    if not applicant_ids:
+        return np.zeros(len(experience_period_lists))
+
+    applicant_ids = np.asarray(applicant_ids, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.maximum(np.asarray(ends, dtype=np.int64), starts)
+
+    order = np.lexsort((starts, applicant_ids))
+    applicant_ids, starts, ends = applicant_ids[order], starts[order], ends[order]
+
+    # Shift into [0, span) and offset each applicant by a multiple of span
+    base = starts.min()
+    span = int(ends.max() - base) + 1
+    offset = applicant_ids * span
+    covered_until = np.maximum.accumulate(ends - base + offset) - offset
+
+    # End covered before each interval, nothing for an applicant's first interval
+    previous = np.empty_like(covered_until)
+    previous[0] = -1
+    previous[1:] = covered_until[:-1]
+    first = np.ones(len(applicant_ids), dtype=bool)
+    first[1:] = applicant_ids[1:] != applicant_ids[:-1]
+    previous[first] = -1
+
+    added = np.maximum(0, ends - base - np.maximum(starts - base, previous))
+    total_months = np.bincount(applicant_ids, weights=added, minlength=len(experience_period_lists))
+    return total_months / 12
+
+
+def calculate_experience_score(total_years_with_months: float, job_relevant_experience_years: int) -> float:
+    """Score relevant experience against the required years, with a bonus past the requirement."""
+    if total_years_with_months >= job_relevant_experience_years:
+        bonus = (total_years_with_months - job_relevant_experience_years) * 3
+        return 100 + bonus
+    return (total_years_with_months / job_relevant_experience_years) * 100
@@ -0,0 +1,136 @@
+import hashlib
+import os
+from src.config.settings import get_settings
+from src.services.resume_extraction import extract_pdf_text_async, extract_pdf_text_isolated
+from src.services.resume_preprocessing import PAGE_SEPARATOR
+from src.storage.cache import TieredCache
+from src.storage.minio_client import (
+    spool_minio_object,
+    spool_minio_object_async,
+    stat_minio_object,
+    stat_minio_object_async,
+)
+from src.utils.metrics import observe_stage
+
+# Bump when extraction changes in a way that invalidates cached text
+TEXT_CACHE_VERSION = 2
+
+# Singleton extracted text cache
+_resume_text_cache = None
+
+
+def get_resume_text_cache():
+    """
+    Get or create the singleton extracted resume text cache.
+
+    Least recently used entries are evicted past RESUME_TEXT_CACHE_MAX_ENTRIES.
+    """
+    global _resume_text_cache
+    if _resume_text_cache is None:
+        _resume_text_cache = TieredCache(
+            "resume_text",
+            memory_entries=256,
+            max_entries=int(os.getenv("RESUME_TEXT_CACHE_MAX_ENTRIES", "10000")),
+        )
+    return _resume_text_cache
+
+
+def _cache_key(kind, value):
+    return f"v{TEXT_CACHE_VERSION}:{get_settings().pdf_max_pages}:{kind}:{value}"
+
+
+def extract_pdf_text_cached(path):
+    """
+    Extract text from a PDF path or bytes, reusing earlier extractions of the same content.
+
+    Cached by the SHA-256 of the PDF, so the same file under any name or
+    path is decoded once. Pages are separated by PAGE_SEPARATOR.
+    """
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        sha256 = hashlib.sha256(path).hexdigest()
+    else:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        sha256 = sha256.hexdigest()
+
+    cache = get_resume_text_cache()
+    key = _cache_key("sha256", sha256)
+    text = cache.get(key)
+    if text is None:
+        with observe_stage("pdf_extraction"):
+            text = extract_pdf_text_isolated(path, PAGE_SEPARATOR)
+        cache.set(key, text)
+    return text
+
+
+def extract_resume_text(object_name):
+    """
+    Extract the text of a resume stored in MinIO, skipping work seen before.
+
+    The object's ETag is checked first, so re-processing a resume skips both
+    the download and the PDF decode. Otherwise the object is downloaded and
+    its SHA-256 is checked, which catches the same CV uploaded under another
+    name, before pdfium runs. Pages are separated by PAGE_SEPARATOR, see
+    preprocess_resume_text.
+
+    Returns:
+        tuple[str, dict]: (extracted text, {"cache_hit": bool, "sha256": str | None})
+
+    Raises:
+        ValueError: If the object cannot be fetched or the PDF cannot be read
+    """
+    cache = get_resume_text_cache()
+
+    stat = stat_minio_object(object_name)
+    etag = (stat.etag or "").strip('"')
+    etag_key = _cache_key("etag", f"{etag}:{stat.size}")
+    text = cache.get(etag_key)
+    if text is not None:
+        return text, {"cache_hit": True, "sha256": None}
+
+    with spool_minio_object(object_name, stat=stat) as (pdf_path, pdf_checksum):
+        sha_key = _cache_key("sha256", pdf_checksum)
+        text = cache.get(sha_key)
+        cache_hit = text is not None
+        if text is None:
+            with observe_stage("pdf_extraction"):
+                text = extract_pdf_text_isolated(pdf_path, PAGE_SEPARATOR)
+            cache.set(sha_key, text)
+
+    cache.set(etag_key, text)
+    return text, {"cache_hit": cache_hit, "sha256": pdf_checksum}
+
+
+async def extract_resume_text_async(object_name):
+    """
+    Async extract_resume_text: the MinIO stat and download are awaited and
+    only pdfium leaves the event loop, see extract_pdf_text_async.
+
+    Returns:
+        tuple[str, dict]: (extracted text, {"cache_hit": bool, "sha256": str | None})
+
+    Raises:
+        ValueError: If the object cannot be fetched or the PDF cannot be read
+    """
+    cache = get_resume_text_cache()
+
+    stat = await stat_minio_object_async(object_name)
+    etag = (stat.etag or "").strip('"')
+    etag_key = _cache_key("etag", f"{etag}:{stat.size}")
+    text = cache.get(etag_key)
+    if text is not None:
+        return text, {"cache_hit": True, "sha256": None}
+
+    async with spool_minio_object_async(object_name, stat=stat) as (pdf_path, pdf_checksum):
+        sha_key = _cache_key("sha256", pdf_checksum)
+        text = cache.get(sha_key)
+        cache_hit = text is not None
+        if text is None:
+            with observe_stage("pdf_extraction"):
+                text = await extract_pdf_text_async(pdf_path, PAGE_SEPARATOR)
+            cache.set(sha_key, text)
+
+    cache.set(etag_key, text)
+    return text, {"cache_hit": cache_hit, "sha256": pdf_checksum}
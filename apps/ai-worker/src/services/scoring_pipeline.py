@@ -0,0 +1,372 @@
+import asyncio
+import inspect
+import os
+import time
+from src.services.resume_scoring import (
+    score_education_match,
+    score_skills_match,
+    score_skills_match_batch,
+    get_skills_backend,
+    score_timezone_match,
+    score_timezone_match_batch,
+    score_experience_match,
+    evaluate_experience_relevance_batch,
+    calculate_relevant_experience_years,
+    calculate_relevant_experience_years_batch,
+    calculate_experience_score,
+)
+
+
+async def _timed(fn, *args, **kwargs):
+    """Call fn, awaiting its result if it is a coroutine, and return it with the elapsed time in ms."""
+    start = time.time()
+    result = fn(*args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result, int((time.time() - start) * 1000)
+
+
+async def _limited(limit, fn, *args, **kwargs):
+    """_timed once one of limit's slots is free."""
+    async with limit:
+        return await _timed(fn, *args, **kwargs)
+
+
+async def _cancel(tasks):
+    """Cancel scorer tasks and wait until they stopped."""
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _score_education(applicant_data, job_data):
+    """Education score of one applicant, its fields are read here so a missing one fails only it."""
+    return await score_education_match(
+        applicant_highest_degree=applicant_data['parsedHighestEducationDegree'],
+        applicant_education_field=applicant_data['parsedEducationField'],
+        job_required_degree=job_data['educationDegree'],
+        job_education_field=job_data['educationField'],
+    )
+
+
+def _years_or_error(periods_with_relevance):
+    """Relevant years of one applicant, or the error computing them."""
+    try:
+        return calculate_relevant_experience_years(periods_with_relevance)
+    except Exception as e:
+        return ValueError(f"Failed to score experience match: {str(e)}")
+
+
+def calculate_overall_score(job_data, skills_score, education_score, timezone_score, experience_score):
+    """Combine the individual scores using the job's weights."""
+    return (
+        education_score * float(job_data['educationWeight']) +
+        skills_score * float(job_data['skillsWeight']) +
+        timezone_score * float(job_data['timezoneWeight']) +
+        experience_score * float(job_data['experienceWeight'])
+    )
+
+
+def _start_independent_scorers(applicant_data, job_data):
+    """Start the education, timezone and experience scorers as tasks, none depends on another."""
+    return {
+        "education": asyncio.create_task(_timed(_score_education, applicant_data, job_data)),
+        "timezone": asyncio.create_task(_timed(
+            score_timezone_match,
+            applicant_data['parsedTimezone'],
+            job_data['timezone'],
+        )),
+        "experience": asyncio.create_task(_timed(
+            score_experience_match,
+            applicant_data['experiences'],
+            job_data['yearsOfExperience'],
+            job_data['title'],
+        )),
+    }
+
+
+async def score_applicant(applicant_data, job_data, speculative=None):
+    """
+    Score an applicant against a job.
+
+    Skills are scored first since a missing required skill disqualifies the
+    applicant. The education, timezone and experience scorers then run as
+    concurrent tasks awaiting Ollama, so the wall time is about the slowest
+    single scorer and no thread is held while they wait. In speculative mode
+    they start together with the skills scorer and are cancelled if the
+    applicant is disqualified.
+
+    Args:
+        applicant_data: Parsed applicant record (as sent by the web app)
+        job_data: Job record (as sent by the web app)
+        speculative: Start all scorers before the disqualification check,
+            defaults to the SCORING_SPECULATIVE env setting
+
+    Returns:
+        dict: {
+            "disqualified": bool,
+            "skills_score": float,
+            "scored_skills": list[dict],
+            "education_score": float | None,
+            "timezone_score": float | None,
+            "experience_score": float | None,
+            "years_of_experience": float,
+            "experience_periods_with_relevance": list[dict],
+            "overall_score": float | None,
+            "timings_ms": {scorer: ms},
+            "scoring_time_ms": int,
+        }
+    """
+    if speculative is None:
+        speculative = os.getenv("SCORING_SPECULATIVE", "false").lower() == "true"
+
+    start = time.time()
+    timings = {}
+
+    applicant_skills = [skill.strip() for skill in applicant_data['parsedSkills'].split(",")]
+    skills_task = asyncio.create_task(_timed(score_skills_match, job_data['skills'], applicant_skills))
+
+    tasks = {}
+    if speculative:
+        tasks = _start_independent_scorers(applicant_data, job_data)
+
+    try:
+        skills_result, timings["skills"] = await skills_task
+    except Exception:
+        await _cancel(tasks.values())
+        raise
+
+    result = {
+        "disqualified": skills_result['disqualified'],
+        "skills_score": skills_result['score'],
+        "scored_skills": skills_result['scored_skills'],
+        "education_score": None,
+        "timezone_score": None,
+        "experience_score": None,
+        "years_of_experience": 0.0,
+        "experience_periods_with_relevance": [],
+        "overall_score": None,
+        "timings_ms": timings,
+    }
+
+    if result["disqualified"]:
+        # Speculatively started scorers are not needed anymore
+        await _cancel(tasks.values())
+        result["scoring_time_ms"] = int((time.time() - start) * 1000)
+        return result
+
+    if not tasks:
+        tasks = _start_independent_scorers(applicant_data, job_data)
+
+    try:
+        education_score, timings["education"] = await tasks["education"]
+        timezone_result, timings["timezone"] = await tasks["timezone"]
+        experience_result, timings["experience"] = await tasks["experience"]
+    except Exception:
+        await _cancel(tasks.values())
+        raise
+
+    result.update({
+        "education_score": education_score,
+        "timezone_score": timezone_result['score'],
+        "experience_score": experience_result['score'],
+        "years_of_experience": experience_result['years_of_experience'],
+        "experience_periods_with_relevance": experience_result['experience_periods_with_relevance'],
+    })
+    result["overall_score"] = calculate_overall_score(
+        job_data,
+        result["skills_score"],
+        result["education_score"],
+        result["timezone_score"],
+        result["experience_score"],
+    )
+    result["scoring_time_ms"] = int((time.time() - start) * 1000)
+
+    return result
+
+
+async def score_applicants_batch(applicants_data, job_data, max_periods_per_call=None):
+    """
+    Score many applicants against one job in a single pass.
+
+    Work shared across the pool is done once: applicants with the same skill
+    list share one skills_score call (with SKILLS_BACKEND=embedding, all
+    applicants share one similarity matrix), education field pairs go through
+    the memoized field index, timezones are scored in one vectorized pass, and
+    role titles not yet in the relevance store are packed into batched
+    exp_relevance_eval calls. skills_score takes a single CV skill list per
+    prompt, so skills calls are deduplicated rather than packed. Model calls
+    are awaited concurrently, at most SCORING_MAX_CONCURRENT_CALLS of the
+    skills and education calls at once.
+
+    Args:
+        applicants_data: Parsed applicant records (as sent by the web app)
+        job_data: Job record (as sent by the web app)
+        max_periods_per_call: Role titles packed per relevance call,
+            defaults to the EXPERIENCE_BATCH_SIZE env setting
+
+    Returns:
+        list[dict]: One result per applicant, in input order, shaped like
+            score_applicant's result, or {"error": str} if that applicant failed.
+            scoring_time_ms is the batch wall time divided across applicants.
+    """
+    if max_periods_per_call is None:
+        max_periods_per_call = int(os.getenv("EXPERIENCE_BATCH_SIZE", "40"))
+
+    limit = asyncio.Semaphore(int(os.getenv("SCORING_MAX_CONCURRENT_CALLS", "8")))
+    start = time.time()
+    results = [None] * len(applicants_data)
+
+    applicant_skill_keys = [
+        tuple(skill.strip() for skill in (applicant_data.get('parsedSkills') or "").split(","))
+        for applicant_data in applicants_data
+    ]
+    distinct_skill_keys = list(dict.fromkeys(applicant_skill_keys))
+
+    # Skills: (result, ms) or the exception, per distinct applicant skill list
+    skills_outcomes = {}
+    if get_skills_backend() == "embedding":
+        # One similarity matrix covers every applicant
+        try:
+            batch_results, skills_time_ms = await _timed(
+                score_skills_match_batch, job_data['skills'], [list(key) for key in distinct_skill_keys]
+            )
+            for key, skills_result in zip(distinct_skill_keys, batch_results):
+                skills_outcomes[key] = (skills_result, skills_time_ms)
+        except Exception as e:
+            skills_outcomes = {key: e for key in distinct_skill_keys}
+    else:
+        # One model call per distinct applicant skill list
+        outcomes = await asyncio.gather(
+            *(_limited(limit, score_skills_match, job_data['skills'], list(key)) for key in distinct_skill_keys),
+            return_exceptions=True,
+        )
+        skills_outcomes = dict(zip(distinct_skill_keys, outcomes))
+
+    qualified = []
+    for index, key in enumerate(applicant_skill_keys):
+        if isinstance(skills_outcomes[key], Exception):
+            results[index] = {"error": str(skills_outcomes[key])}
+            continue
+        skills_result, skills_time_ms = skills_outcomes[key]
+
+        results[index] = {
+            "disqualified": skills_result['disqualified'],
+            "skills_score": skills_result['score'],
+            "scored_skills": skills_result['scored_skills'],
+            "education_score": None,
+            "timezone_score": None,
+            "experience_score": None,
+            "years_of_experience": 0.0,
+            "experience_periods_with_relevance": [],
+            "overall_score": None,
+            "timings_ms": {"skills": skills_time_ms},
+        }
+        if not skills_result['disqualified']:
+            qualified.append(index)
+
+    # Education per applicant, cheap once the field pairs are memoized; runs while
+    # timezone and experience are scored
+    education_outcomes = asyncio.gather(
+        *(_limited(limit, _score_education, applicants_data[index], job_data) for index in qualified),
+        return_exceptions=True,
+    )
+
+    # Timezone: resolved by rules and scored for all applicants in one vectorized pass
+    timezone_start = time.time()
+    try:
+        timezone_results = score_timezone_match_batch(
+            [applicants_data[index].get('parsedTimezone') for index in qualified],
+            job_data['timezone'],
+        )
+        timezone_error = None
+    except Exception as e:
+        timezone_results = [None] * len(qualified)
+        timezone_error = str(e)
+    timezone_time_ms = int((time.time() - timezone_start) * 1000)
+
+    # Experience: unseen role titles of all applicants packed into each relevance call
+    experience_start = time.time()
+    try:
+        relevance_lists = await evaluate_experience_relevance_batch(
+            [applicants_data[index].get('experiences') for index in qualified],
+            job_data['title'],
+            max_periods_per_call=max_periods_per_call,
+        )
+        experience_error = None
+    except Exception as e:
+        relevance_lists = [None] * len(qualified)
+        experience_error = f"Failed to score experience match: {str(e)}"
+
+    # Relevant years for every applicant in one vectorized pass
+    years_list = [0.0] * len(qualified)
+    if experience_error is None:
+        try:
+            years_list = calculate_relevant_experience_years_batch(
+                [[] if isinstance(periods, Exception) else periods for periods in relevance_lists]
+            ).tolist()
+        except Exception:
+            # A malformed period fails only its own applicant
+            years_list = [
+                periods if isinstance(periods, Exception) else _years_or_error(periods)
+                for periods in relevance_lists
+            ]
+    experience_time_ms = int((time.time() - experience_start) * 1000)
+
+    education_outcomes = await education_outcomes
+
+    for index, education_outcome, periods_with_relevance, timezone_result, relevant_years in zip(
+        qualified, education_outcomes, relevance_lists, timezone_results, years_list
+    ):
+        result = results[index]
+        try:
+            if isinstance(education_outcome, BaseException):
+                raise education_outcome
+            education_score, result["timings_ms"]["education"] = education_outcome
+
+            if timezone_result is None:
+                raise ValueError(timezone_error or (
+                    "Failed to score timezone match: Invalid timezone format "
+                    f"'{applicants_data[index].get('parsedTimezone')}'"
+                ))
+            result["timings_ms"]["timezone"] = timezone_time_ms
+
+            if experience_error is not None:
+                raise ValueError(experience_error)
+            if isinstance(periods_with_relevance, Exception):
+                raise ValueError(f"Failed to score experience match: {str(periods_with_relevance)}")
+            if isinstance(relevant_years, Exception):
+                raise relevant_years
+
+            if any(exp.get("relevant", False) for exp in periods_with_relevance):
+                years_of_experience = relevant_years
+                experience_score = calculate_experience_score(years_of_experience, job_data['yearsOfExperience'])
+            else:
+                years_of_experience, experience_score = 0.0, 0.0
+            result["timings_ms"]["experience"] = experience_time_ms
+        except Exception as e:
+            results[index] = {"error": str(e)}
+            continue
+
+        result.update({
+            "education_score": education_score,
+            "timezone_score": timezone_result['score'],
+            "experience_score": experience_score,
+            "years_of_experience": years_of_experience,
+            "experience_periods_with_relevance": periods_with_relevance,
+        })
+        result["overall_score"] = calculate_overall_score(
+            job_data,
+            result["skills_score"],
+            result["education_score"],
+            result["timezone_score"],
+            result["experience_score"],
+        )
+
+    per_applicant_time_ms = int((time.time() - start) * 1000 / max(1, len(applicants_data)))
+    for result in results:
+        if "error" not in result:
+            result["scoring_time_ms"] = per_applicant_time_ms
+
+    return results
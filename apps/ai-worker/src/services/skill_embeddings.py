@@ -0,0 +1,211 @@
+import glob
+import os
+import re
+import uuid
+import numpy as np
+from src.config.constants import SkillMatchType
+from src.storage.cache import get_cache_dir
+from src.utils.embeddings import embed_texts, get_embedding_model
+
+# Singleton skill vocabulary index
+_skill_embedding_index = None
+
+# Score given per match type, same scale skills_score uses
+MATCH_TYPE_SCORES = {
+    SkillMatchType.EXPLICIT: 1.0,
+    SkillMatchType.IMPLIED: 0.5,
+    SkillMatchType.MISSING: 0.0,
+}
+
+
+def _skill_text(skill: str) -> str:
+    """Text embedded for a skill, case and spacing do not change its meaning."""
+    return re.sub(r"\s+", " ", (skill or "").casefold()).strip()
+
+
+class SkillEmbeddingIndex:
+    """
+    Skill vocabulary embedded once and kept as a single normalized matrix.
+
+    The vocabulary is saved next to the other caches, so a restarted worker
+    reloads it instead of re-embedding. Every save appends only the newly
+    embedded skills as a shard .npz in the vocabulary directory, and once
+    COMPACT_SHARDS shards pile up they are merged into one; worker processes
+    sharing the cache directory never overwrite each other's skills. Skill
+    similarity is cosine similarity, and scoring many applicants is one
+    matrix product.
+    """
+
+    # Shards in the vocabulary directory that trigger merging them into one
+    COMPACT_SHARDS = 32
+
+    def __init__(
+        self,
+        path: str | None = None,
+        model: str | None = None,
+        explicit_threshold: float = 0.9,
+        implied_threshold: float = 0.75,
+    ):
+        self.model = model or get_embedding_model()
+        safe_model = re.sub(r"[^\w.-]", "_", self.model)
+        self.path = path or os.path.join(get_cache_dir(), f"skill_vocabulary_{safe_model}")
+        self.explicit_threshold = explicit_threshold
+        self.implied_threshold = implied_threshold
+        self._rows = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    def _shards(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.path, "*.npz")))
+
+    def _read_shards(self, shards: list[str]) -> tuple[list[str], list[np.ndarray]]:
+        """Skills and vectors of the readable shards, first occurrence of a skill wins."""
+        skills, vectors, seen = [], [], set()
+        for shard in shards:
+            try:
+                with np.load(shard) as data:
+                    shard_skills = [str(skill) for skill in data["skills"]]
+                    shard_vectors = data["vectors"].astype(np.float32)
+            except Exception as e:
+                print(f"Ignoring unreadable skill vocabulary shard {shard}: {e}")
+                continue
+            for skill, vector in zip(shard_skills, shard_vectors):
+                if skill not in seen:
+                    seen.add(skill)
+                    skills.append(skill)
+                    vectors.append(vector)
+        return skills, vectors
+
+    def _load(self):
+        skills, vectors = self._read_shards(self._shards())
+        if skills:
+            self._matrix = np.vstack(vectors)
+            self._rows = {skill: row for row, skill in enumerate(skills)}
+
+    def _write_shard(self, skills: list[str], vectors: np.ndarray):
+        """Write a shard under a name no other process uses, complete or not at all."""
+        os.makedirs(self.path, exist_ok=True)
+        name = uuid.uuid4().hex
+        tmp_path = os.path.join(self.path, f"{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, skills=np.array(skills), vectors=vectors)
+        os.replace(tmp_path, os.path.join(self.path, f"{name}.npz"))
+
+    def _save(self, new_skills: list[str], new_vectors: np.ndarray):
+        """Append the newly embedded skills, merging the shards once there are too many."""
+        self._write_shard(new_skills, new_vectors)
+
+        shards = self._shards()
+        if len(shards) < self.COMPACT_SHARDS:
+            return
+        # Only the shards read here are removed, so skills another process
+        # appends meanwhile survive; a concurrent merge just writes the same skills
+        skills, vectors = self._read_shards(shards)
+        self._write_shard(skills, np.vstack(vectors))
+        for shard in shards:
+            try:
+                os.remove(shard)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self._rows)
+
+    async def vectors(self, skills: list[str]) -> np.ndarray:
+        """
+        Return the normalized vectors of skills, embedding any new ones.
+
+        Raises:
+            RuntimeError: If new skills cannot be embedded
+        """
+        texts = [_skill_text(skill) for skill in skills]
+        new = [text for text in dict.fromkeys(texts) if text not in self._rows]
+        if new:
+            embedded = await embed_texts(new, model=self.model)
+            # Another scorer may have added some of them while this one awaited
+            added = [(text, vector) for text, vector in zip(new, embedded) if text not in self._rows]
+            if added:
+                start = len(self._rows)
+                added_vectors = np.vstack([vector for _, vector in added])
+                self._matrix = added_vectors if not start else np.vstack([self._matrix, added_vectors])
+                self._rows.update({text: start + offset for offset, (text, _) in enumerate(added)})
+                self._save([text for text, _ in added], added_vectors)
+        rows = [self._rows[text] for text in texts]
+        return self._matrix[rows]
+
+    async def similarity_matrix(self, job_skills: list[str], applicant_skills: list[str]) -> np.ndarray:
+        """Cosine similarity of every job skill (rows) with every applicant skill (columns)."""
+        if not job_skills or not applicant_skills:
+            return np.zeros((len(job_skills), len(applicant_skills)), dtype=np.float32)
+        job_vectors = await self.vectors(job_skills)
+        applicant_vectors = await self.vectors(applicant_skills)
+        return job_vectors @ applicant_vectors.T
+
+    def match_type(self, similarity: float) -> SkillMatchType:
+        if similarity >= self.explicit_threshold:
+            return SkillMatchType.EXPLICIT
+        if similarity >= self.implied_threshold:
+            return SkillMatchType.IMPLIED
+        return SkillMatchType.MISSING
+
+    async def score_skills(self, job_skills: list[str], applicant_skill_lists: list[list[str]]) -> list[list[dict]]:
+        """
+        Match job skills against many applicants' skills in one pass.
+
+        All distinct applicant skills form the columns of a single similarity
+        matrix; each applicant's best match per job skill is a max over its
+        columns.
+
+        Returns:
+            list[list[dict]]: Per applicant, one entry per job skill in
+                skills_score's output shape
+        """
+        vocabulary = list(dict.fromkeys(
+            skill for skills in applicant_skill_lists for skill in skills if skill and skill.strip()
+        ))
+        columns = {skill: column for column, skill in enumerate(vocabulary)}
+        similarity = await self.similarity_matrix(job_skills, vocabulary)
+
+        results = []
+        for skills in applicant_skill_lists:
+            applicant_columns = [columns[skill] for skill in dict.fromkeys(skills) if skill in columns]
+            if applicant_columns:
+                block = similarity[:, applicant_columns]
+                best = block.argmax(axis=1)
+                best_similarity = block[np.arange(len(job_skills)), best]
+            else:
+                best = best_similarity = [None] * len(job_skills)
+
+            entries = []
+            for row, job_skill in enumerate(job_skills):
+                value = best_similarity[row]
+                match_type = self.match_type(float(value)) if value is not None else SkillMatchType.MISSING
+                from_cv = vocabulary[applicant_columns[best[row]]] if match_type != SkillMatchType.MISSING else None
+                entries.append({
+                    "skill": job_skill,
+                    "match_type": match_type.value,
+                    "from_cv": from_cv,
+                    "score": MATCH_TYPE_SCORES[match_type],
+                    "reason": (
+                        f"Embedding similarity {float(value):.2f}" if value is not None
+                        else "No CV skills to compare"
+                    ),
+                })
+            results.append(entries)
+        return results
+
+
+def get_skill_embedding_index() -> SkillEmbeddingIndex:
+    """
+    Get or create the singleton skill embedding index.
+
+    Thresholds are configurable via SKILL_EMBEDDING_EXPLICIT_THRESHOLD and
+    SKILL_EMBEDDING_IMPLIED_THRESHOLD.
+    """
+    global _skill_embedding_index
+    if _skill_embedding_index is None:
+        _skill_embedding_index = SkillEmbeddingIndex(
+            explicit_threshold=float(os.getenv("SKILL_EMBEDDING_EXPLICIT_THRESHOLD", "0.9")),
+            implied_threshold=float(os.getenv("SKILL_EMBEDDING_IMPLIED_THRESHOLD", "0.75")),
+        )
+    return _skill_embedding_index
@@ -0,0 +1,177 @@
+import re
+from src.config.constants import SkillMatchType
+
+# Spellings of the same skill, keyed by normalized spelling
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "angular.js": "angular",
+    "nextjs": "next.js",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "expressjs": "express",
+    "express.js": "express",
+    "golang": "go",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "ms sql": "sql server",
+    "mssql": "sql server",
+    "microsoft sql server": "sql server",
+    "k8s": "kubernetes",
+    "html5": "html",
+    "css3": "css",
+    "tailwindcss": "tailwind",
+    "tailwind css": "tailwind",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "dotnet": ".net",
+    "cpp": "c++",
+    "py": "python",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "oop": "object oriented programming",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ms word": "word",
+    "microsoft word": "word",
+    "ms powerpoint": "powerpoint",
+    "microsoft powerpoint": "powerpoint",
+    "ms office": "microsoft office",
+    "adobe photoshop": "photoshop",
+    "adobe illustrator": "illustrator",
+    "ui ux": "ui/ux",
+    "ux ui": "ui/ux",
+    "git hub": "github",
+    "restful api": "rest api",
+    "restful apis": "rest api",
+    "rest apis": "rest api",
+}
+
+# Noise around a skill name: "Experience in Python", "Python skills"
+NOISE_PREFIX_PATTERN = re.compile(
+    r"^(experience|experienced|knowledge|proficiency|proficient|familiarity|familiar|skilled)( (in|with|of))? "
+)
+NOISE_SUFFIX_PATTERN = re.compile(r" (skills|skill|proficiency)$")
+
+# Words that only say what kind of thing a known skill is, "MySQL Database" is MySQL
+KIND_TOKENS = {"database", "databases", "db", "programming", "language", "framework", "library"}
+
+# Skills a kind word may be dropped from; anything else keeps it ("Database Management")
+KNOWN_SKILLS = set(SKILL_ALIASES.values()) | {
+    "mysql", "mariadb", "sqlite", "oracle", "redis", "firebase", "dynamodb", "cassandra",
+    "python", "java", "php", "ruby", "rust", "kotlin", "swift", "c", "r", "dart", "scala",
+    "django", "flask", "laravel", "spring", "rails", "flutter", "jquery",
+}
+
+RULE_MATCH_REASON = "Exact match after normalization"
+
+
+def _canonical(skill: str) -> str:
+    normalized = (skill or "").casefold().replace("&", " and ")
+    # Keep the characters that tell skills apart: c++, c#, .net, node.js, ui/ux
+    normalized = re.sub(r"[^\w\s+#./-]", " ", normalized)
+    # Only trailing periods go, a leading one is part of ".NET"
+    normalized = re.sub(r"[\s_-]+", " ", normalized).strip().rstrip(".").strip()
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+def normalize_skill(skill: str) -> frozenset:
+    """
+    Normalize a skill to a set of canonical tokens.
+
+    "MySQL", "Mysql Database" and "mysql" all normalize to {"mysql"}, and
+    "ReactJS" to {"react"}. Only noise is removed ("Experience in", "skills"),
+    and a kind word such as "database" only after a known skill, so the
+    tokens of "Database Management" or "Visual Basic" are all kept. Returns
+    an empty set for a blank skill.
+    """
+    canonical = _canonical(skill)
+    stripped = NOISE_SUFFIX_PATTERN.sub("", NOISE_PREFIX_PATTERN.sub("", canonical))
+    canonical = SKILL_ALIASES.get(stripped, stripped) if stripped else canonical
+
+    tokens = [SKILL_ALIASES.get(token, token) for token in canonical.split()]
+    while len(tokens) > 1 and tokens[-1] in KIND_TOKENS and " ".join(tokens[:-1]) in KNOWN_SKILLS:
+        tokens.pop()
+    return frozenset(tokens)
+
+
+def build_skill_index(applicant_skills: list[str]) -> dict:
+    """
+    Index applicant skills by their normalized token set.
+
+    Combined entries such as "HTML/CSS" are also indexed by each part.
+
+    Returns:
+        dict: {frozenset of tokens: original applicant skill}
+    """
+    index = {}
+    for skill in applicant_skills:
+        if not skill or not skill.strip():
+            continue
+        index.setdefault(normalize_skill(skill), skill)
+        if "/" in skill and _canonical(skill) not in SKILL_ALIASES.values():
+            for part in skill.split("/"):
+                key = normalize_skill(part)
+                if key:
+                    index.setdefault(key, skill)
+    return index
+
+
+def match_skills_by_rules(job_skill_names: list[str], applicant_skills: list[str]):
+    """
+    Resolve job skills the applicant lists explicitly, without a model call.
+
+    Only explicit matches are decided here; whether a skill is implied or
+    missing needs the model, so those are returned as unresolved.
+
+    Returns:
+        tuple[dict, list[str]]: ({job skill: scored entry in skills_score's
+            output shape}, unresolved job skill names in input order)
+    """
+    index = build_skill_index(applicant_skills)
+
+    resolved = {}
+    unresolved = []
+    for job_skill in job_skill_names:
+        applicant_skill = index.get(normalize_skill(job_skill))
+        if applicant_skill is None or not normalize_skill(job_skill):
+            unresolved.append(job_skill)
+            continue
+        resolved[job_skill] = {
+            "skill": job_skill,
+            "match_type": SkillMatchType.EXPLICIT.value,
+            "from_cv": applicant_skill,
+            "score": 1.0,
+            "reason": RULE_MATCH_REASON,
+        }
+    return resolved, unresolved
+
+
+def merge_scored_skills(job_skill_names: list[str], resolved: dict, model_entries: list[dict]) -> list[dict]:
+    """
+    Merge rule-resolved entries with the model's entries, in job skill order.
+
+    Model entries for skills not in the job list are kept at the end, as before.
+    """
+    by_skill = {entry["skill"]: entry for entry in model_entries}
+    merged = []
+    for job_skill in job_skill_names:
+        if job_skill in resolved:
+            merged.append(resolved[job_skill])
+            by_skill.pop(job_skill, None)
+        elif job_skill in by_skill:
+            merged.append(by_skill.pop(job_skill))
+    merged.extend(by_skill.values())
+    return merged
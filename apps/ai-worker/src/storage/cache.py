@@ -0,0 +1,259 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from src.utils.metrics import CACHE_LOOKUPS
+
+
+# apps/ai-worker/.cache, independent of the working directory
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache"
+)
+
+
+def get_cache_dir() -> str:
+    """Directory for the worker's on-disk caches, configurable via AI_WORKER_CACHE_DIR."""
+    cache_dir = os.getenv("AI_WORKER_CACHE_DIR", DEFAULT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with an optional TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache backed by a SQLite file.
+
+    Entries expire after ttl_seconds (if set), and once the table grows past
+    max_entries the least recently used entries are evicted. Reads do not
+    write: access times are kept in memory and written with the next set(),
+    evict() or once TOUCH_BATCH_SIZE of them are pending.
+    """
+
+    # How many writes between eviction passes, keeps set() cheap
+    EVICTION_INTERVAL = 100
+    # Pending access times written in one transaction
+    TOUCH_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "cache",
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._touched = {}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB, created_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed_at ON {table} (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds and created_at + self.ttl_seconds < now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+            return value
+
+    def set(self, key: str, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+            self._touched.clear()
+
+    def items(self):
+        """Return all (key, value) pairs that have not expired."""
+        with self._lock:
+            if self.ttl_seconds:
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.table} WHERE created_at >= ?",
+                    (time.time() - self.ttl_seconds,),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(f"SELECT key, value FROM {self.table}").fetchall()
+        return rows
+
+    def evict(self):
+        """Drop expired entries and trim the table down to max_entries."""
+        with self._lock:
+            self._flush_touched()
+            self._evict(time.time())
+            self._conn.commit()
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        if self.max_entries:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """
+    Two-tier cache: an in-memory LRU in front of a persistent SQLite store.
+
+    Keeps hit/miss counters for both tiers, see stats().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory_entries: int = 1024,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+        path: str | None = None,
+    ):
+        self.name = name
+        self.memory = LRUCache(max_entries=memory_entries, ttl_seconds=ttl_seconds)
+        self.disk = SQLiteCache(
+            path or os.path.join(get_cache_dir(), f"{name}.sqlite3"),
+            ttl_seconds=ttl_seconds,
+            max_entries=max_entries,
+        )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            CACHE_LOOKUPS.labels(cache=self.name, result="memory_hit").inc()
+            return value
+
+        value = self.disk.get(key)
+        if value is not None:
+            self.disk_hits += 1
+            CACHE_LOOKUPS.labels(cache=self.name, result="disk_hit").inc()
+            self.memory.set(key, value)
+            return value
+
+        self.misses += 1
+        CACHE_LOOKUPS.labels(cache=self.name, result="miss").inc()
+        return None
+
+    def set(self, key: str, value):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def items(self):
+        return self.disk.items()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
@@ -1,9 +1,26 @@
 from minio import Minio
+from minio.datatypes import Object
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timedelta
+import hashlib
+import httpx
+import os
+import re
+import tempfile
 
 from src.config.settings import get_settings
+from src.utils.metrics import observe_stage
+
+# Read size when streaming objects to the spool file
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+# Lifetime of the presigned URLs used by the async fetch
+PRESIGNED_URL_EXPIRY = timedelta(minutes=10)
 
 
 _minio_client = None
+_minio_http_client = None
 settings = get_settings()
 bucket_name = settings.minio_bucket_name
 
@@ -32,4 +49,184 @@ def get_minio_object(object_name):
         return data
     except Exception as e:
         print(f"Error retrieving object {object_name} from bucket {bucket_name}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def stat_minio_object(object_name):
+    """
+    Retrieve an object's metadata (size, ETag) from MinIO without downloading it.
+
+    Raises:
+        ValueError: If the object cannot be found
+    """
+    try:
+        with observe_stage("minio_stat"):
+            return get_minio_client().stat_object(bucket_name, object_name)
+    except Exception as e:
+        print(f"Error retrieving metadata for {object_name} from bucket {bucket_name}: {e}")
+        raise ValueError(f"Failed to retrieve object {object_name} from MinIO: {str(e)}") from e
+
+
+@contextmanager
+def spool_minio_object(object_name, max_bytes=None, stat=None):
+    """
+    Stream an object from MinIO into a spool file and yield its path.
+
+    The object is copied chunk by chunk into MINIO_SPOOL_DIR (tmpfs when
+    available), so it is never held in Python memory as a whole; pdfium can
+    read the file directly. Objects larger than max_bytes are refused before
+    and during the download, and the MD5 of the stream is checked against the
+    object's ETag when the ETag is a plain MD5 (single-part uploads).
+
+    Args:
+        object_name: Object to fetch from the resume bucket
+        max_bytes: Size limit, defaults to PDF_MAX_BYTES
+        stat: Result of stat_minio_object if the caller already has it
+
+    Yields:
+        tuple[str, str]: (spool file path, SHA-256 hex digest of the object)
+
+    Raises:
+        ValueError: If the object cannot be fetched, is too large or fails the checksum
+    """
+    max_bytes = settings.pdf_max_bytes if max_bytes is None else max_bytes
+    client = get_minio_client()
+
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=".pdf", dir=settings.minio_spool_dir)
+    try:
+        response = None
+        with observe_stage("minio_fetch"):
+            try:
+                stat = stat or client.stat_object(bucket_name, object_name)
+                if max_bytes and stat.size > max_bytes:
+                    raise ValueError(f"Object is {stat.size} bytes, larger than the {max_bytes} byte limit")
+
+                sha256 = hashlib.sha256()
+                md5 = hashlib.md5()
+                size = 0
+                response = client.get_object(bucket_name, object_name)
+                with os.fdopen(fd, "wb") as spool:
+                    fd = None
+                    for chunk in response.stream(SPOOL_CHUNK_SIZE):
+                        size += len(chunk)
+                        if max_bytes and size > max_bytes:
+                            raise ValueError(f"Object is larger than the {max_bytes} byte limit")
+                        sha256.update(chunk)
+                        md5.update(chunk)
+                        spool.write(chunk)
+
+                etag = (stat.etag or "").strip('"')
+                if re.fullmatch(r"[0-9a-f]{32}", etag) and md5.hexdigest() != etag:
+                    raise ValueError(f"Checksum mismatch for {object_name}")
+            except Exception as e:
+                print(f"Error retrieving object {object_name} from bucket {bucket_name}: {e}")
+                raise ValueError(f"Failed to retrieve object {object_name} from MinIO: {str(e)}") from e
+            finally:
+                if fd is not None:
+                    os.close(fd)
+                if response is not None:
+                    response.close()
+                    response.release_conn()
+
+        yield path, sha256.hexdigest()
+    finally:
+        os.remove(path)
+
+
+def get_minio_http_client() -> httpx.AsyncClient:
+    """Get or create the async HTTP client used to fetch objects through presigned URLs."""
+    global _minio_http_client
+    if _minio_http_client is None:
+        _minio_http_client = httpx.AsyncClient(
+            timeout=settings.api_timeout_seconds,
+            limits=httpx.Limits(max_keepalive_connections=settings.api_pool_size),
+        )
+    return _minio_http_client
+
+
+async def close_minio_http_client():
+    global _minio_http_client
+    if _minio_http_client is not None:
+        await _minio_http_client.aclose()
+        _minio_http_client = None
+
+
+def _presigned_url(method, object_name):
+    # Signing is local; only the first call per bucket looks up its region
+    return get_minio_client().get_presigned_url(method, bucket_name, object_name, expires=PRESIGNED_URL_EXPIRY)
+
+
+async def stat_minio_object_async(object_name):
+    """
+    Async stat_minio_object, a HEAD request on a presigned URL.
+
+    Raises:
+        ValueError: If the object cannot be found
+    """
+    try:
+        with observe_stage("minio_stat"):
+            response = await get_minio_http_client().head(_presigned_url("HEAD", object_name))
+        response.raise_for_status()
+        return Object(
+            bucket_name,
+            object_name,
+            etag=response.headers.get("ETag", "").strip('"'),
+            size=int(response.headers.get("Content-Length", 0)),
+            content_type=response.headers.get("Content-Type"),
+        )
+    except Exception as e:
+        print(f"Error retrieving metadata for {object_name} from bucket {bucket_name}: {e}")
+        raise ValueError(f"Failed to retrieve object {object_name} from MinIO: {str(e)}") from e
+
+
+@asynccontextmanager
+async def spool_minio_object_async(object_name, max_bytes=None, stat=None):
+    """
+    Async spool_minio_object: streams the object from a presigned URL with
+    httpx, so the download awaits instead of holding a thread. Same limits
+    and checksums.
+
+    Yields:
+        tuple[str, str]: (spool file path, SHA-256 hex digest of the object)
+
+    Raises:
+        ValueError: If the object cannot be fetched, is too large or fails the checksum
+    """
+    max_bytes = settings.pdf_max_bytes if max_bytes is None else max_bytes
+
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=".pdf", dir=settings.minio_spool_dir)
+    try:
+        with observe_stage("minio_fetch"):
+            try:
+                stat = stat or await stat_minio_object_async(object_name)
+                if max_bytes and stat.size > max_bytes:
+                    raise ValueError(f"Object is {stat.size} bytes, larger than the {max_bytes} byte limit")
+
+                sha256 = hashlib.sha256()
+                md5 = hashlib.md5()
+                size = 0
+                async with get_minio_http_client().stream("GET", _presigned_url("GET", object_name)) as response:
+                    response.raise_for_status()
+                    with os.fdopen(fd, "wb") as spool:
+                        fd = None
+                        async for chunk in response.aiter_bytes(SPOOL_CHUNK_SIZE):
+                            size += len(chunk)
+                            if max_bytes and size > max_bytes:
+                                raise ValueError(f"Object is larger than the {max_bytes} byte limit")
+                            sha256.update(chunk)
+                            md5.update(chunk)
+                            spool.write(chunk)
+
+                etag = (stat.etag or "").strip('"')
+                if re.fullmatch(r"[0-9a-f]{32}", etag) and md5.hexdigest() != etag:
+                    raise ValueError(f"Checksum mismatch for {object_name}")
+            except Exception as e:
+                print(f"Error retrieving object {object_name} from bucket {bucket_name}: {e}")
+                raise ValueError(f"Failed to retrieve object {object_name} from MinIO: {str(e)}") from e
+            finally:
+                if fd is not None:
+                    os.close(fd)
+
+        yield path, sha256.hexdigest()
+    finally:
+        os.remove(path)
@@ -0,0 +1,74 @@
+from src.storage.cache import TieredCache
+from src.utils.ollama import get_async_ollama_client, get_keep_alive
+import hashlib
+import numpy as np
+import os
+
+
+# Singleton embedding cache, vectors never change for a given model and text
+_embedding_cache = None
+
+
+def get_embedding_model() -> str:
+    """Ollama embedding model, configurable via OLLAMA_EMBED_MODEL."""
+    return os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text:latest")
+
+
+def get_embedding_cache():
+    """Get or create the singleton embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = TieredCache("embeddings", memory_entries=8192)
+    return _embedding_cache
+
+
+def _embedding_cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+async def embed_texts(texts: list[str], model: str | None = None) -> np.ndarray:
+    """
+    Embed texts with Ollama's embeddings endpoint, awaited on the async client.
+
+    Vectors are cached per (model, text) and returned L2-normalized, so the
+    cosine similarity between two sets is a plain matrix product.
+
+    Args:
+        texts: Texts to embed
+        model: Embedding model, defaults to OLLAMA_EMBED_MODEL
+
+    Returns:
+        np.ndarray: float32 matrix of shape (len(texts), dimensions)
+
+    Raises:
+        RuntimeError: If the embedding request fails
+    """
+    model = model or get_embedding_model()
+    cache = get_embedding_cache()
+
+    vectors = {}
+    missing = []
+    for text in dict.fromkeys(texts):
+        cached = cache.get(_embedding_cache_key(model, text))
+        if cached is not None:
+            vectors[text] = np.frombuffer(cached, dtype=np.float32)
+        else:
+            missing.append(text)
+
+    if missing:
+        try:
+            response = await get_async_ollama_client().embed(model=model, input=missing, keep_alive=get_keep_alive())
+        except Exception as e:
+            raise RuntimeError(f"Failed to embed texts with model '{model}': {str(e)}") from e
+
+        for text, embedding in zip(missing, response.embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                vector = vector / norm
+            cache.set(_embedding_cache_key(model, text), vector.tobytes())
+            vectors[text] = vector
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack([vectors[text] for text in texts])
@@ -0,0 +1,166 @@
+import json
+import re
+
+# Backslashes that do not start a valid JSON escape
+INVALID_ESCAPE_PATTERN = re.compile(r'\\(?!["\\/bfnrtu])')
+
+NUMBER_PATTERN = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+
+BARE_LITERALS = {
+    "true": "true",
+    "false": "false",
+    "null": "null",
+    "none": "null",
+}
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+def _tokenize(text: str):
+    """
+    Split text into JSON tokens: punctuation, ("string", raw) and ("bare", word).
+
+    Strings may be single or double quoted; an unterminated string runs to
+    the end of the text.
+    """
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char.isspace():
+            i += 1
+        elif char in "{}[]:,":
+            yield char, char
+            i += 1
+        elif char in "\"'":
+            end = i + 1
+            while end < len(text) and text[end] != char:
+                end += 2 if text[end] == "\\" else 1
+            yield "string", (text[i + 1:end], char)
+            i = end + 1
+        else:
+            end = i
+            while end < len(text) and not text[end].isspace() and text[end] not in "{}[]:,\"'":
+                end += 1
+            yield "bare", text[i:end]
+            i = end
+
+
+def _string(raw: str, quote: str) -> str:
+    if quote == "'":
+        raw = raw.replace("\\'", "'").replace('"', '\\"')
+    raw = INVALID_ESCAPE_PATTERN.sub(r"\\\\", raw)
+    try:
+        value = json.loads(f'"{raw}"', strict=False)
+    except json.JSONDecodeError:
+        value = raw
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _bare(word: str) -> str:
+    literal = BARE_LITERALS.get(word.lower())
+    if literal is not None:
+        return literal
+    if NUMBER_PATTERN.fullmatch(word):
+        return word
+    return json.dumps(word, ensure_ascii=False)
+
+
+def repair_json(text: str) -> str:
+    """
+    Best-effort repair of a model's malformed JSON.
+
+    Starts at the first '{' or '[' and rebuilds the value token by token:
+    missing or extra commas and colons are fixed, trailing commas dropped,
+    single-quoted strings, unquoted keys and Python literals converted, and
+    anything left open at the end (strings, objects, arrays) is closed.
+    Text after the top-level value is ignored.
+
+    Raises:
+        ValueError: If the text contains no JSON object or array
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("No JSON object or array found")
+
+    out = []
+    # [opener, stage]: objects go key -> colon -> value -> comma, arrays value -> comma
+    stack = []
+
+    def close():
+        opener, stage = stack.pop()
+        if out[-1] == ",":
+            out.pop()
+        elif stage == "colon":
+            out.append(":null")
+        elif opener == "{" and stage == "value":
+            out.append("null")
+        out.append(CLOSERS[opener])
+        if stack:
+            stack[-1][1] = "comma"
+
+    for kind, value in _tokenize(text[min(starts):]):
+        if not stack and out:
+            break
+        if not stack:
+            if kind in CLOSERS:
+                out.append(kind)
+                stack.append([kind, "key" if kind == "{" else "value"])
+            continue
+
+        opener, stage = stack[-1]
+        if kind in "}]":
+            close()
+        elif kind == ",":
+            if stage == "colon":
+                out.append(":null")
+            elif opener == "{" and stage == "value":
+                out.append("null")
+            if stage == "key" or (opener == "[" and stage == "value"):
+                continue
+            out.append(",")
+            stack[-1][1] = "key" if opener == "{" else "value"
+        elif kind == ":":
+            if stage == "colon":
+                out.append(":")
+                stack[-1][1] = "value"
+        else:
+            # A value (or key) token
+            if stage == "comma":
+                out.append(",")
+                stage = "key" if opener == "{" else "value"
+            if stage == "key":
+                if kind not in ("string", "bare"):
+                    continue
+                out.append(_string(*value) if kind == "string" else json.dumps(value, ensure_ascii=False))
+                stack[-1][1] = "colon"
+                continue
+            if stage == "colon":
+                out.append(":")
+            if kind in CLOSERS:
+                stack[-1][1] = "comma"
+                out.append(kind)
+                stack.append([kind, "key" if kind == "{" else "value"])
+            else:
+                out.append(_string(*value) if kind == "string" else _bare(value))
+                stack[-1][1] = "comma"
+
+    while stack:
+        close()
+    return "".join(out)
+
+
+def loads_tolerant(text: str):
+    """
+    json.loads that falls back to repair_json.
+
+    Raises:
+        ValueError: If the text cannot be repaired into JSON
+    """
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(repair_json(text))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Could not repair JSON: {str(e)}") from e
@@ -0,0 +1,121 @@
+from src.utils.json_repair import loads_tolerant
+
+
+class IncrementalJSONParser:
+    """
+    Follows a JSON value as it is generated, chunk by chunk.
+
+    Only the new characters of each chunk are scanned, tracking nesting and
+    string state, so the parser knows the moment the top-level object or
+    array closes; anything generated after that is ignored. Text before the
+    value (and a leading <think>...</think> block) is skipped.
+
+    partial() parses what has arrived so far, cut back to the last complete
+    element, e.g. {"skills": ["Python", "SQL"]} while the third skill is
+    still being generated.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.start = None
+        self.end = None
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # End of the last complete element, partial() parses up to here
+        self._boundary = None
+        self._partial_boundary = None
+        self._partial = None
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    @property
+    def text(self) -> str:
+        """The JSON value so far, exactly as generated."""
+        if self.start is None:
+            return ""
+        return self.buffer[self.start:self.end]
+
+    def _find_start(self):
+        search_from = 0
+        if "<think>" in self.buffer:
+            think_end = self.buffer.find("</think>")
+            if think_end == -1:
+                return
+            search_from = think_end + len("</think>")
+
+        starts = [i for i in (self.buffer.find("{", search_from), self.buffer.find("[", search_from)) if i != -1]
+        if starts:
+            self.start = self._position = min(starts)
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Add generated text.
+
+        Returns:
+            bool: Whether the top-level value is complete
+        """
+        if self.complete:
+            return True
+        self.buffer += chunk
+        if self.start is None:
+            self._find_start()
+            if self.start is None:
+                return False
+
+        buffer = self.buffer
+        for position in range(self._position, len(buffer)):
+            char = buffer[position]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                self._boundary = position + 1
+                if self._depth == 0:
+                    self.end = position + 1
+                    return True
+            elif char == ",":
+                self._boundary = position
+        self._position = len(buffer)
+        return False
+
+    def partial(self):
+        """
+        The value parsed up to the last complete element, or None before the first one.
+
+        Unchanged text is not parsed again.
+        """
+        if self.complete:
+            return self.value()
+        if self._boundary is None:
+            return None
+        if self._boundary != self._partial_boundary:
+            try:
+                self._partial = loads_tolerant(self.buffer[self.start:self._boundary])
+            except ValueError:
+                pass
+            self._partial_boundary = self._boundary
+        return self._partial
+
+    def value(self):
+        """
+        Parse the value, repairing it if generation stopped before it closed.
+
+        Raises:
+            ValueError: If no JSON value was generated
+        """
+        if self.start is None:
+            raise ValueError("No JSON object or array found")
+        return loads_tolerant(self.text)
@@ -0,0 +1,168 @@
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Histogram, start_http_server
+
+# Seconds, from cache hits and API callbacks up to slow model calls and large PDFs
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "ai_worker_stage_seconds",
+    "Duration of a pipeline stage (minio_fetch, pdf_extraction, parse, score_skills, ...)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MODEL_CALL_SECONDS = Histogram(
+    "ai_worker_model_call_seconds",
+    "Duration of an Ollama call",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MODEL_TOKENS = Counter(
+    "ai_worker_model_tokens_total",
+    "Tokens processed by Ollama, direction is prompt or generated",
+    ["model", "direction"],
+)
+
+MODEL_TOKENS_PER_SECOND = Histogram(
+    "ai_worker_model_tokens_per_second",
+    "Generation speed of an Ollama call (eval_count / eval_duration)",
+    ["model"],
+    buckets=(1, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500),
+)
+
+API_CALL_SECONDS = Histogram(
+    "ai_worker_api_call_seconds",
+    "Duration of an API callback, batched mutations are labeled batch",
+    ["procedure", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+QUEUE_WAIT_SECONDS = Histogram(
+    "ai_worker_queue_wait_seconds",
+    "Time a job waited in its queue before processing started",
+    ["job"],
+    buckets=LATENCY_BUCKETS + (600, 1800, 3600),
+)
+
+JOB_SECONDS = Histogram(
+    "ai_worker_job_seconds",
+    "Duration of a job handler",
+    ["job", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CACHE_LOOKUPS = Counter(
+    "ai_worker_cache_lookups_total",
+    "Cache lookups by result (memory_hit, disk_hit, miss), hit rate is hits / all",
+    ["cache", "result"],
+)
+
+
+# Rough size of a prompt token, for prompts whose count Ollama never reported
+PROMPT_CHARS_PER_TOKEN = 4
+
+# Histograms labeled with the outcome (ok / error) of what they time
+OUTCOME_HISTOGRAMS = (MODEL_CALL_SECONDS, API_CALL_SECONDS, JOB_SECONDS)
+
+
+@contextmanager
+def observe(histogram: Histogram, **labels):
+    """
+    Time the block into histogram.
+
+    For the OUTCOME_HISTOGRAMS the "outcome" label is set to ok or error.
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        if histogram in OUTCOME_HISTOGRAMS:
+            labels["outcome"] = outcome
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def observe_stage(stage: str):
+    """Time the block as a pipeline stage."""
+    return observe(STAGE_SECONDS, stage=stage)
+
+
+def record_stage_timings(prefix: str, timings_ms: dict):
+    """Record {name: ms} timings measured elsewhere as stages named prefix_name."""
+    for name, elapsed_ms in timings_ms.items():
+        STAGE_SECONDS.labels(stage=f"{prefix}_{name}").observe(elapsed_ms / 1000)
+
+
+def record_model_usage(
+    model: str,
+    response=None,
+    generated_chunks: int = 0,
+    generation_seconds: float = 0.0,
+    prompt_chars: int = 0,
+):
+    """
+    Count an Ollama call's tokens from its final response.
+
+    Ollama reports prompt_eval_count, eval_count and eval_duration (ns) on
+    the final response. A stream closed early never gets one: then the
+    generated chunks (one token each) over the streaming time are used, and
+    the prompt is estimated from prompt_chars and counted under the
+    "prompt_estimated" direction, so it is never mixed with exact counts.
+    """
+    prompt_tokens = _field(response, "prompt_eval_count")
+    eval_count = _field(response, "eval_count")
+    eval_duration = _field(response, "eval_duration")
+
+    if eval_count is None:
+        eval_count, eval_duration = generated_chunks, generation_seconds * 1e9
+    if prompt_tokens:
+        MODEL_TOKENS.labels(model=model, direction="prompt").inc(prompt_tokens)
+    elif prompt_tokens is None and prompt_chars:
+        MODEL_TOKENS.labels(model=model, direction="prompt_estimated").inc(-(-prompt_chars // PROMPT_CHARS_PER_TOKEN))
+    if eval_count:
+        MODEL_TOKENS.labels(model=model, direction="generated").inc(eval_count)
+        if eval_duration:
+            MODEL_TOKENS_PER_SECOND.labels(model=model).observe(eval_count / (eval_duration / 1e9))
+
+
+def _field(response, name):
+    if response is None:
+        return None
+    try:
+        return response[name]
+    except (KeyError, TypeError):
+        return getattr(response, name, None)
+
+
+def record_queue_wait(job):
+    """Record how long a bullmq job waited, from when it became ready to now."""
+    created_ms = getattr(job, "timestamp", None)
+    if not created_ms:
+        return
+    ready_ms = created_ms + (getattr(job, "delay", 0) or 0)
+    QUEUE_WAIT_SECONDS.labels(job=job.name).observe(max(0.0, time.time() - ready_ms / 1000))
+
+
+def start_metrics_server(port: int, addr: str = "127.0.0.1") -> bool:
+    """
+    Serve the metrics on http://addr:port/metrics from a daemon thread; port 0 disables it.
+
+    A port already in use only disables the metrics, the worker keeps running.
+
+    Returns:
+        bool: Whether the server was started
+    """
+    if not port:
+        return False
+    try:
+        start_http_server(port, addr=addr)
+    except OSError as e:
+        print(f"Metrics disabled, cannot serve on {addr}:{port}: {e}")
+        return False
+    print(f"Serving metrics on http://{addr}:{port}/metrics")
+    return True
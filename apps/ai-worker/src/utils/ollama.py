@@ -1,20 +1,152 @@
-from ollama import Client
+from pydantic import BaseModel, ValidationError
+from src.storage.cache import TieredCache
+from src.utils.json_repair import loads_tolerant
+from src.utils.json_stream import IncrementalJSONParser
+from src.utils.metrics import MODEL_CALL_SECONDS, observe, record_model_usage
+from src.utils.ollama_pool import PooledAsyncClient, PooledClient, create_endpoint_pool
+import hashlib
 import json
 import os
+import time
 
 
-# Singleton Ollama client instance
+# Singleton Ollama endpoint pool and the clients routing through it
+_endpoint_pool = None
 _ollama_client = None
+_async_ollama_client = None
+
+# Singleton LLM response cache
+_response_cache = None
+
+# {model: (digest, fetched_at)}, so a re-created model invalidates its cached responses
+_model_digests = {}
+MODEL_DIGEST_TTL_SECONDS = 60
 
 def get_ollama_client():
-    """Get or create the singleton Ollama client instance."""
+    """
+    Get or create the singleton Ollama client instance.
+
+    Calls are routed across the hosts in OLLAMA_HOSTS (or the single
+    OLLAMA_HOST), see create_endpoint_pool.
+    """
     global _ollama_client
     if _ollama_client is None:
-        host = os.getenv("OLLAMA_HOST")
-        _ollama_client = Client(host=host)
+        _ollama_client = PooledClient(get_endpoint_pool())
     return _ollama_client
 
 
+def get_endpoint_pool():
+    """Get or create the singleton Ollama endpoint pool, shared by the sync and async clients."""
+    global _endpoint_pool
+    if _endpoint_pool is None:
+        _endpoint_pool = create_endpoint_pool()
+    return _endpoint_pool
+
+
+def get_async_ollama_client():
+    """
+    Get or create the singleton async Ollama client instance.
+
+    Routes through the same endpoint pool as get_ollama_client, so load
+    balancing sees sync and async requests alike.
+    """
+    global _async_ollama_client
+    if _async_ollama_client is None:
+        _async_ollama_client = PooledAsyncClient(get_endpoint_pool())
+    return _async_ollama_client
+
+
+def get_ollama_clients(model: str) -> list:
+    """Clients of every healthy host serving model, e.g. to load it on all of them."""
+    client = get_ollama_client()
+    if not isinstance(client, PooledClient):
+        return [client]
+    return [
+        endpoint.client for endpoint in client.pool.candidates(model)
+        if endpoint.serves(model) and endpoint.healthy
+    ] or [endpoint.client for endpoint in client.pool.candidates(model)[:1]]
+
+
+def get_keep_alive():
+    """
+    How long Ollama keeps a model loaded after a request, set via OLLAMA_KEEP_ALIVE.
+
+    Every request resets the model's timer to this value, so it is sent with
+    each call; without it Ollama falls back to its own 5 minute default.
+    Accepts durations like "30m" or "24h", or seconds, where -1 keeps the
+    model loaded indefinitely.
+    """
+    keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    return int(keep_alive) if keep_alive.lstrip("-").isdigit() else keep_alive
+
+
+def get_response_cache():
+    """
+    Get or create the singleton LLM response cache, or None if disabled.
+
+    Configured via LLM_CACHE_ENABLED, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+    and LLM_CACHE_MEMORY_ENTRIES.
+    """
+    global _response_cache
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    if _response_cache is None:
+        _response_cache = TieredCache(
+            "llm_responses",
+            memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024")),
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000")),
+        )
+    return _response_cache
+
+
+def get_model_digest(model: str) -> str:
+    """
+    Get the digest of a local Ollama model.
+
+    Falls back to the model name if the digest cannot be looked up.
+    """
+    cached = _model_digests.get(model)
+    if cached is not None and cached[1] + MODEL_DIGEST_TTL_SECONDS > time.time():
+        return cached[0]
+
+    try:
+        for entry in get_ollama_client().list().models:
+            _model_digests[entry.model] = (entry.digest, time.time())
+    except Exception as e:
+        print(f"Failed to look up digest for model '{model}': {str(e)}")
+        return model
+
+    cached = _model_digests.get(model)
+    return cached[0] if cached is not None else model
+
+
+async def get_model_digest_async(model: str) -> str:
+    """Async get_model_digest, sharing its digest cache."""
+    cached = _model_digests.get(model)
+    if cached is not None and cached[1] + MODEL_DIGEST_TTL_SECONDS > time.time():
+        return cached[0]
+
+    try:
+        for entry in (await get_async_ollama_client().list()).models:
+            _model_digests[entry.model] = (entry.digest, time.time())
+    except Exception as e:
+        print(f"Failed to look up digest for model '{model}': {str(e)}")
+        return model
+
+    cached = _model_digests.get(model)
+    return cached[0] if cached is not None else model
+
+
+def _response_cache_key(model: str, content: str, think: bool, schema=None, digest=None) -> str:
+    parts = [digest or get_model_digest(model), model, think, content]
+    if schema is not None:
+        # A schema changes the reply, structured and free-form answers are kept apart
+        parts.append(schema.model_json_schema())
+    payload = json.dumps(parts)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def clean_response(response: str) -> str:
     response = response.split("</think>")[-1]
     # if response has ```json ... ```
@@ -29,14 +161,100 @@ def clean_response(response: str) -> str:
     return response.strip()
 
 
-def query_ollama_model(model: str, content: str, think: bool = False, json_output: bool = True) -> dict:
+def use_json_streaming() -> bool:
+    """Whether JSON replies are streamed and cut off once complete, set via OLLAMA_STREAM_JSON."""
+    return os.getenv("OLLAMA_STREAM_JSON", "true").lower() == "true"
+
+
+def _stream_json(model: str, content: str, think: bool, response_format, on_partial=None) -> str:
+    """
+    Stream a JSON reply, stopping the generation as soon as the value is complete.
+
+    Closing the stream closes the connection, which makes Ollama stop
+    generating, so trailing chatter and repeated output cost no tokens.
+
+    Args:
+        on_partial: Optional callback, called with the value parsed so far
+            each time another element completes
+
+    Returns:
+        str: The generated JSON text
+    """
+    parser = IncrementalJSONParser()
+    usage = {}
+    generated = 0
+    first_chunk_at = None
+    last_partial = None
+    with observe(MODEL_CALL_SECONDS, model=model):
+        chunks = stream_ollama_model(model, content, think=think, response_format=response_format, usage=usage)
+        try:
+            for chunk in chunks:
+                generated += 1
+                first_chunk_at = first_chunk_at or time.perf_counter()
+                if parser.feed(chunk):
+                    break
+                if on_partial is not None:
+                    partial = parser.partial()
+                    if partial is not None and partial != last_partial:
+                        last_partial = partial
+                        on_partial(partial)
+        finally:
+            chunks.close()
+    record_model_usage(
+        model, usage or None, generated,
+        time.perf_counter() - first_chunk_at if first_chunk_at else 0.0,
+        prompt_chars=len(content),
+    )
+
+    # Without any JSON, return the raw reply so the caller's error shows it
+    return parser.text if parser.start is not None else clean_response(parser.buffer)
+
+
+def _chat(model: str, content: str, think: bool, response_format=None, on_partial=None) -> str:
+    """Send a single user message and return the cleaned reply."""
+    if response_format is not None and (on_partial is not None or use_json_streaming()):
+        return _stream_json(model, content, think, response_format, on_partial)
+
+    with observe(MODEL_CALL_SECONDS, model=model):
+        response = get_ollama_client().chat(
+            model=model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": content,
+                },
+            ],
+            think=think,
+            format=response_format,
+            keep_alive=get_keep_alive(),
+        )
+    record_model_usage(model, response)
+    return clean_response(response["message"]["content"])
+
+
+def query_ollama_model(
+    model: str,
+    content: str,
+    think: bool = False,
+    json_output: bool = True,
+    use_cache: bool = True,
+    on_partial=None,
+) -> dict:
     """
     Query an Ollama model and return cleaned JSON response.
+
+    Responses are cached by model digest and prompt hash, so repeating an
+    identical query skips Ollama entirely. Slightly malformed JSON (trailing
+    commas, unclosed brackets, ...) is repaired locally, see loads_tolerant.
+    JSON replies are streamed and cut off once complete, see _stream_json.
     
     Args:
         model: The Ollama model name
         content: The content to send to the model
         think: Whether to enable thinking mode
+        json_output: Parse the response as JSON
+        use_cache: Look up and store the response in the LLM response cache
+        on_partial: Optional callback receiving the JSON parsed so far while it streams
         
     Returns:
         dict: Parsed JSON response
@@ -46,78 +264,339 @@ def query_ollama_model(model: str, content: str, think: bool = False, json_outpu
         RuntimeError: If model query fails
     """
     try:
-        ollama_client = get_ollama_client()
+        cache = get_response_cache() if use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = _response_cache_key(model, content, think)
+            cached_response = cache.get(cache_key)
+            if cached_response is not None:
+                return json.loads(cached_response) if json_output else cached_response
 
-        response = ollama_client.chat(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": content,
-                },
-            ],
-            think=think,
+        # format="json" keeps decoding to syntactically valid JSON
+        cleaned_response = _chat(
+            model, content, think,
+            response_format="json" if json_output else None,
+            on_partial=on_partial,
         )
-        
-        cleaned_response = clean_response(response["message"]["content"])
+        parsed_response = cleaned_response
         if json_output:
-            return json.loads(cleaned_response)
-        else:
-            return cleaned_response
+            try:
+                parsed_response = loads_tolerant(cleaned_response)
+            except ValueError as e:
+                raise ValueError(f"Failed to parse JSON from model '{model}': {str(e)}") from e
+            cleaned_response = json.dumps(parsed_response)
+
+        # Only cache replies that parsed, so a bad generation can be retried
+        if cache is not None:
+            cache.set(cache_key, cleaned_response)
+
+        return parsed_response
         
-    except json.JSONDecodeError as e:
-        error_msg = f"Failed to parse JSON from model '{model}': {str(e)}"
-        raise ValueError(error_msg) from e
+    except ValueError:
+        raise
         
     except Exception as e:
         error_msg = f"Failed to query model '{model}': {str(e)}"
         raise RuntimeError(error_msg) from e
 
 
-def preload_models():
+def get_json_fixer_model():
+    """Model broken structured output is sent to, set via JSON_FIXER_MODEL; empty disables it."""
+    return os.getenv("JSON_FIXER_MODEL", "json_fixer:latest")
+
+
+def validate_structured_response(model: str, response: str, schema: type[BaseModel]) -> BaseModel:
     """
-    Preload all Ollama models used by the application.
-    This keeps models in memory and avoids reload delays on first use.
+    Validate a model's reply into schema, repairing it if needed.
+
+    The reply is validated as is first. If that fails, it is repaired by the
+    local tolerant parser, and only if the result still does not validate is
+    it sent to the json_fixer model (constrained to the same schema).
+
+    Raises:
+        ValueError: If the reply cannot be turned into a valid schema instance
     """
-    models_to_preload = [
-        "edu-timezone-extractor:latest",
-        "skills-extractor:latest", 
-        "experience-extractor:latest",
-        "edu-match:latest",
-        "skills_score:latest",
-        "exp_relevance_eval:latest"
-    ]
-    
-    print("Preloading Ollama models...")
-    ollama_client = get_ollama_client()
-    
-    # Simple test prompt to warm up each model
-    test_prompt = "test"
-    
-    for model in models_to_preload:
+    result, error = _validate_locally(model, response, schema)
+    if result is not None:
+        return result
+
+    fixer = get_json_fixer_model()
+    if fixer and model != fixer:
         try:
-            print(f"  Loading {model}...")
-            # Make a simple call to load the model into memory
-            ollama_client.chat(
-                model=model,
-                messages=[{"role": "user", "content": test_prompt}],
-                think=False
-            )
-            print(f"  ✓ {model} loaded")
+            fixed = _chat(fixer, response, think=False, response_format=schema.model_json_schema())
+            return _validate_fixed(model, fixer, fixed, schema)
+        except (ValueError, ValidationError) as e:
+            error = e
         except Exception as e:
-            print(f"  ✗ Failed to load {model}: {str(e)}")
-    
-    print("Model preloading complete!\n")
+            print(f"JSON fixer '{fixer}' failed: {str(e)}")
 
+    raise ValueError(f"Invalid {schema.__name__} output from model '{model}': {str(error)}") from error
 
-def stream_ollama_model(model: str, content: str, think: bool = False):
+
+def _validate_locally(model: str, response: str, schema: type[BaseModel]):
+    """Validate a reply as is, then after local repair. Returns (instance or None, last error)."""
+    try:
+        return schema.model_validate_json(response), None
+    except ValidationError:
+        pass
+
+    try:
+        repaired = schema.model_validate(loads_tolerant(response))
+        print(f"Repaired malformed {schema.__name__} output from '{model}' locally")
+        return repaired, None
+    except (ValueError, ValidationError) as e:
+        return None, e
+
+
+def _validate_fixed(model: str, fixer: str, fixed: str, schema: type[BaseModel]) -> BaseModel:
+    repaired = schema.model_validate(loads_tolerant(fixed))
+    print(f"Repaired malformed {schema.__name__} output from '{model}' with {fixer}")
+    return repaired
+
+
+def query_ollama_structured(
+    model: str,
+    content: str,
+    schema: type[BaseModel],
+    think: bool = False,
+    use_cache: bool = True,
+    on_partial=None,
+) -> BaseModel:
+    """
+    Query an Ollama model with its output constrained to a pydantic schema.
+
+    The schema's JSON schema is passed as Ollama's `format`, so decoding can
+    only produce matching JSON, and the reply is validated into the schema.
+    Replies that still fail validation are repaired, see
+    validate_structured_response. Validated replies are cached like
+    query_ollama_model's.
+
+    Args:
+        model: The Ollama model name
+        content: The content to send to the model
+        schema: Pydantic model the reply must match
+        think: Whether to enable thinking mode
+        use_cache: Look up and store the response in the LLM response cache
+        on_partial: Optional callback receiving the JSON parsed so far while it
+            streams (a plain dict, not yet validated)
+
+    Returns:
+        BaseModel: The validated schema instance
+
+    Raises:
+        ValueError: If the reply cannot be validated
+        RuntimeError: If model query fails
+    """
+    try:
+        cache = get_response_cache() if use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = _response_cache_key(model, content, think, schema)
+            cached_response = cache.get(cache_key)
+            if cached_response is not None:
+                return schema.model_validate_json(cached_response)
+
+        response = _chat(model, content, think, response_format=schema.model_json_schema(), on_partial=on_partial)
+        result = validate_structured_response(model, response, schema)
+
+        if cache is not None:
+            cache.set(cache_key, result.model_dump_json(by_alias=True))
+
+        return result
+
+    except ValueError:
+        raise
+
+    except Exception as e:
+        error_msg = f"Failed to query model '{model}': {str(e)}"
+        raise RuntimeError(error_msg) from e
+
+
+async def _stream_json_async(model: str, content: str, think: bool, response_format, on_partial=None) -> str:
+    """Async _stream_json."""
+    parser = IncrementalJSONParser()
+    final_chunk = None
+    generated = 0
+    first_chunk_at = None
+    last_partial = None
+    with observe(MODEL_CALL_SECONDS, model=model):
+        chunks = await get_async_ollama_client().chat(
+            model=model,
+            messages=[{"role": "user", "content": content}],
+            think=think,
+            format=response_format,
+            stream=True,
+            keep_alive=get_keep_alive(),
+        )
+        try:
+            async for chunk in chunks:
+                if chunk["done"]:
+                    final_chunk = chunk
+                if not chunk["message"]["content"]:
+                    continue
+                generated += 1
+                first_chunk_at = first_chunk_at or time.perf_counter()
+                if parser.feed(chunk["message"]["content"]):
+                    break
+                if on_partial is not None:
+                    partial = parser.partial()
+                    if partial is not None and partial != last_partial:
+                        last_partial = partial
+                        on_partial(partial)
+        finally:
+            await chunks.aclose()
+    record_model_usage(
+        model, final_chunk, generated,
+        time.perf_counter() - first_chunk_at if first_chunk_at else 0.0,
+        prompt_chars=len(content),
+    )
+
+    return parser.text if parser.start is not None else clean_response(parser.buffer)
+
+
+async def _chat_async(model: str, content: str, think: bool, response_format=None, on_partial=None) -> str:
+    """Async _chat."""
+    if response_format is not None and (on_partial is not None or use_json_streaming()):
+        return await _stream_json_async(model, content, think, response_format, on_partial)
+
+    with observe(MODEL_CALL_SECONDS, model=model):
+        response = await get_async_ollama_client().chat(
+            model=model,
+            messages=[{"role": "user", "content": content}],
+            think=think,
+            format=response_format,
+            keep_alive=get_keep_alive(),
+        )
+    record_model_usage(model, response)
+    return clean_response(response["message"]["content"])
+
+
+async def query_ollama_model_async(
+    model: str,
+    content: str,
+    think: bool = False,
+    json_output: bool = True,
+    use_cache: bool = True,
+    on_partial=None,
+) -> dict:
+    """
+    Async query_ollama_model, awaiting Ollama instead of blocking a thread.
+
+    Shares the response cache with query_ollama_model.
+
+    Raises:
+        ValueError: If JSON parsing fails
+        RuntimeError: If model query fails
+    """
+    try:
+        cache = get_response_cache() if use_cache else None
+        cache_key = None
+        if cache is not None:
+            digest = await get_model_digest_async(model)
+            cache_key = _response_cache_key(model, content, think, digest=digest)
+            cached_response = cache.get(cache_key)
+            if cached_response is not None:
+                return json.loads(cached_response) if json_output else cached_response
+
+        cleaned_response = await _chat_async(
+            model, content, think,
+            response_format="json" if json_output else None,
+            on_partial=on_partial,
+        )
+        parsed_response = cleaned_response
+        if json_output:
+            try:
+                parsed_response = loads_tolerant(cleaned_response)
+            except ValueError as e:
+                raise ValueError(f"Failed to parse JSON from model '{model}': {str(e)}") from e
+            cleaned_response = json.dumps(parsed_response)
+
+        if cache is not None:
+            cache.set(cache_key, cleaned_response)
+
+        return parsed_response
+
+    except ValueError:
+        raise
+
+    except Exception as e:
+        error_msg = f"Failed to query model '{model}': {str(e)}"
+        raise RuntimeError(error_msg) from e
+
+
+async def validate_structured_response_async(model: str, response: str, schema: type[BaseModel]) -> BaseModel:
+    """Async validate_structured_response."""
+    result, error = _validate_locally(model, response, schema)
+    if result is not None:
+        return result
+
+    fixer = get_json_fixer_model()
+    if fixer and model != fixer:
+        try:
+            fixed = await _chat_async(fixer, response, think=False, response_format=schema.model_json_schema())
+            return _validate_fixed(model, fixer, fixed, schema)
+        except (ValueError, ValidationError) as e:
+            error = e
+        except Exception as e:
+            print(f"JSON fixer '{fixer}' failed: {str(e)}")
+
+    raise ValueError(f"Invalid {schema.__name__} output from model '{model}': {str(error)}") from error
+
+
+async def query_ollama_structured_async(
+    model: str,
+    content: str,
+    schema: type[BaseModel],
+    think: bool = False,
+    use_cache: bool = True,
+    on_partial=None,
+) -> BaseModel:
+    """
+    Async query_ollama_structured, awaiting Ollama instead of blocking a thread.
+
+    Raises:
+        ValueError: If the reply cannot be validated
+        RuntimeError: If model query fails
+    """
+    try:
+        cache = get_response_cache() if use_cache else None
+        cache_key = None
+        if cache is not None:
+            digest = await get_model_digest_async(model)
+            cache_key = _response_cache_key(model, content, think, schema, digest)
+            cached_response = cache.get(cache_key)
+            if cached_response is not None:
+                return schema.model_validate_json(cached_response)
+
+        response = await _chat_async(model, content, think, response_format=schema.model_json_schema(), on_partial=on_partial)
+        result = await validate_structured_response_async(model, response, schema)
+
+        if cache is not None:
+            cache.set(cache_key, result.model_dump_json(by_alias=True))
+
+        return result
+
+    except ValueError:
+        raise
+
+    except Exception as e:
+        error_msg = f"Failed to query model '{model}': {str(e)}"
+        raise RuntimeError(error_msg) from e
+
+
+def stream_ollama_model(model: str, content: str, think: bool = False, response_format=None, usage=None):
     """
     Stream an Ollama model response in real-time.
+
+    Closing the generator early closes the connection and stops the generation.
     
     Args:
         model: The Ollama model name
         content: The content to send to the model
         think: Whether to enable thinking mode
+        response_format: Optional Ollama format, "json" or a JSON schema
+        usage: Optional dict, filled with the token counts Ollama reports
+            at the end (prompt_eval_count, eval_count, eval_duration)
         
     Yields:
         str: Chunks of the response as they arrive
@@ -134,8 +613,12 @@ def stream_ollama_model(model: str, content: str, think: bool = False):
                 },
             ],
             think=think,
+            format=response_format,
             stream=True,
+            keep_alive=get_keep_alive(),
         ):
+            if usage is not None and chunk.get("done"):
+                usage.update({key: chunk.get(key) for key in ("prompt_eval_count", "eval_count", "eval_duration")})
             if chunk.get("message", {}).get("content"):
                 yield chunk["message"]["content"]
                 
@@ -0,0 +1,360 @@
+import fnmatch
+import itertools
+import os
+import threading
+import time
+import httpx
+from ollama import AsyncClient, Client, ListResponse, ProcessResponse, ResponseError
+
+
+class OllamaEndpoint:
+    """One Ollama server, with the models it serves and its current load."""
+
+    def __init__(self, host: str, model_patterns: list[str] | None = None, timeout: float | None = None):
+        host = host.rstrip("/")
+        self.host = host if "://" in host else f"http://{host}"
+        self.model_patterns = model_patterns or ["*"]
+        self.timeout = timeout
+        self.client = Client(host=self.host, timeout=timeout)
+        self._async_client = None
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def async_client(self) -> AsyncClient:
+        """AsyncClient for this host, created on first use inside the event loop."""
+        if self._async_client is None:
+            self._async_client = AsyncClient(host=self.host, timeout=self.timeout)
+        return self._async_client
+
+    def serves(self, model: str) -> bool:
+        return any(fnmatch.fnmatch(model, pattern) for pattern in self.model_patterns)
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.time()
+
+    def __repr__(self):
+        return f"OllamaEndpoint({self.host}, outstanding={self.outstanding}, healthy={self.healthy})"
+
+
+def _is_endpoint_failure(error: Exception) -> bool:
+    """Whether an error means the host is unusable, rather than the request being bad."""
+    if isinstance(error, ResponseError):
+        return error.status_code >= 500
+    return isinstance(error, (ConnectionError, httpx.TransportError))
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether another host may succeed, a model missing on one host may exist on another."""
+    return _is_endpoint_failure(error) or (isinstance(error, ResponseError) and error.status_code == 404)
+
+
+class OllamaEndpointPool:
+    """
+    Routes Ollama requests across several inference hosts.
+
+    A request for a model goes to the healthy host serving that model (per
+    its affinity patterns) with the fewest requests in flight. A host that
+    fails to connect or returns a 5xx is ejected for eject_seconds and the
+    request fails over to the next host. Ejected hosts come back when the
+    ejection expires or an active health check sees them answer.
+    """
+
+    def __init__(self, endpoints: list[OllamaEndpoint], eject_seconds: float = 30, health_timeout: float = 2):
+        if not endpoints:
+            raise ValueError("An Ollama endpoint pool needs at least one host")
+        self.endpoints = endpoints
+        self.eject_seconds = eject_seconds
+        self.health_timeout = health_timeout
+        self._lock = threading.Lock()
+        self._tiebreak = itertools.count()
+        self._health_thread = None
+        self._stop_health = threading.Event()
+
+    def candidates(self, model: str | None) -> list[OllamaEndpoint]:
+        """
+        Endpoints to try for a model, best first.
+
+        Healthy hosts with affinity for the model come first, least
+        outstanding requests first. If none of them is healthy, any healthy
+        host is tried, and with every host ejected all of them are tried
+        anyway rather than failing outright.
+        """
+        with self._lock:
+            tiebreak = next(self._tiebreak)
+            size = len(self.endpoints)
+
+            def order(endpoints):
+                # Least outstanding first, rotating among equally loaded hosts
+                return sorted(
+                    endpoints,
+                    key=lambda endpoint: (endpoint.outstanding, (self.endpoints.index(endpoint) - tiebreak) % size),
+                )
+
+            affine = [endpoint for endpoint in self.endpoints if model is None or endpoint.serves(model)] or self.endpoints
+            healthy = [endpoint for endpoint in affine if endpoint.healthy]
+            if healthy:
+                others = [endpoint for endpoint in self.endpoints if endpoint.healthy and endpoint not in healthy]
+                return order(healthy) + order(others)
+            fallback = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+            return order(fallback) or order(affine)
+
+    def _next_endpoint(self, model: str | None, tried: list) -> OllamaEndpoint | None:
+        """Best endpoint not tried yet, ranked by the load at the time of the attempt."""
+        for endpoint in self.candidates(model):
+            if endpoint not in tried:
+                tried.append(endpoint)
+                return endpoint
+        return None
+
+    def _begin(self, endpoint: OllamaEndpoint):
+        with self._lock:
+            endpoint.outstanding += 1
+
+    def _end(self, endpoint: OllamaEndpoint, error: Exception | None = None):
+        with self._lock:
+            endpoint.outstanding -= 1
+            if error is None:
+                endpoint.failures = 0
+            elif _is_endpoint_failure(error):
+                endpoint.failures += 1
+                endpoint.ejected_until = time.time() + self.eject_seconds
+                print(f"Ejecting Ollama host {endpoint.host} for {self.eject_seconds}s: {error}")
+
+    def call(self, model: str | None, fn):
+        """
+        Run fn(client) on the best endpoint for model, failing over on host errors.
+
+        Streaming responses keep their endpoint counted as busy until consumed.
+
+        Raises:
+            The last endpoint's error if every endpoint failed
+        """
+        last_error = None
+        tried = []
+        while (endpoint := self._next_endpoint(model, tried)) is not None:
+            self._begin(endpoint)
+            try:
+                result = fn(endpoint.client)
+                if hasattr(result, "__next__"):
+                    # Pull the first chunk here, so a failed connect can still fail over
+                    first = next(result, None)
+                    return self._stream(endpoint, first, result)
+            except Exception as e:
+                self._end(endpoint, e)
+                if not _is_retryable(e):
+                    raise
+                last_error = e
+                continue
+            self._end(endpoint)
+            return result
+        raise last_error
+
+    def _stream(self, endpoint, first, rest):
+        error = None
+        try:
+            if first is not None:
+                yield first
+            yield from rest
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Also runs when the consumer stops early and the generator is closed
+            self._end(endpoint, error)
+
+    async def call_async(self, model: str | None, fn):
+        """
+        Async call(): await fn(async_client) on the best endpoint for model.
+
+        Raises:
+            The last endpoint's error if every endpoint failed
+        """
+        last_error = None
+        tried = []
+        while (endpoint := self._next_endpoint(model, tried)) is not None:
+            self._begin(endpoint)
+            try:
+                result = await fn(endpoint.async_client)
+                if hasattr(result, "__anext__"):
+                    first = await anext(result, None)
+                    return self._stream_async(endpoint, first, result)
+            except Exception as e:
+                self._end(endpoint, e)
+                if not _is_retryable(e):
+                    raise
+                last_error = e
+                continue
+            self._end(endpoint)
+            return result
+        raise last_error
+
+    async def _stream_async(self, endpoint, first, rest):
+        error = None
+        try:
+            if first is not None:
+                yield first
+            async for chunk in rest:
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            aclose = getattr(rest, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            self._end(endpoint, error)
+
+    def check_health(self) -> dict:
+        """
+        Probe every host's /api/version, ejecting the ones that do not answer.
+
+        Returns:
+            dict: {host: healthy}
+        """
+        status = {}
+        for endpoint in self.endpoints:
+            try:
+                httpx.get(f"{endpoint.host}/api/version", timeout=self.health_timeout).raise_for_status()
+                healthy = True
+            except Exception:
+                healthy = False
+
+            with self._lock:
+                if healthy:
+                    endpoint.ejected_until = 0.0
+                    endpoint.failures = 0
+                elif endpoint.healthy:
+                    endpoint.ejected_until = time.time() + self.eject_seconds
+                    print(f"Ejecting Ollama host {endpoint.host}: health check failed")
+            status[endpoint.host] = healthy
+        return status
+
+    def start_health_checks(self, interval: float):
+        """Run check_health every interval seconds in a daemon thread."""
+        if self._health_thread is not None or interval <= 0 or len(self.endpoints) < 2:
+            return
+
+        def run():
+            while not self._stop_health.wait(interval):
+                self.check_health()
+
+        self._health_thread = threading.Thread(target=run, name="ollama-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self):
+        self._stop_health.set()
+
+
+class PooledClient:
+    """
+    Drop-in for ollama.Client that routes each call through an endpoint pool.
+
+    Model calls (chat, generate, embed, ...) are routed by their model;
+    list() and ps() merge the answers of every healthy host.
+    """
+
+    def __init__(self, pool: OllamaEndpointPool):
+        self.pool = pool
+
+    def __getattr__(self, name):
+        def routed(*args, **kwargs):
+            model = kwargs.get("model", args[0] if args else None)
+            return self.pool.call(model, lambda client: getattr(client, name)(*args, **kwargs))
+        return routed
+
+    def _merge(self, method):
+        models = {}
+        errors = []
+        for endpoint in self.pool.endpoints:
+            if not endpoint.healthy:
+                continue
+            try:
+                for entry in getattr(endpoint.client, method)().models:
+                    models.setdefault(entry.model, entry)
+            except Exception as e:
+                errors.append(e)
+        if errors and not models:
+            raise errors[0]
+        return list(models.values())
+
+    def list(self) -> ListResponse:
+        return ListResponse(models=self._merge("list"))
+
+    def ps(self) -> ProcessResponse:
+        return ProcessResponse(models=self._merge("ps"))
+
+
+class PooledAsyncClient:
+    """Drop-in for ollama.AsyncClient that routes each call through an endpoint pool."""
+
+    def __init__(self, pool: OllamaEndpointPool):
+        self.pool = pool
+
+    def __getattr__(self, name):
+        async def routed(*args, **kwargs):
+            model = kwargs.get("model", args[0] if args else None)
+            return await self.pool.call_async(model, lambda client: getattr(client, name)(*args, **kwargs))
+        return routed
+
+    async def _merge(self, method):
+        models = {}
+        errors = []
+        for endpoint in self.pool.endpoints:
+            if not endpoint.healthy:
+                continue
+            try:
+                for entry in (await getattr(endpoint.async_client, method)()).models:
+                    models.setdefault(entry.model, entry)
+            except Exception as e:
+                errors.append(e)
+        if errors and not models:
+            raise errors[0]
+        return list(models.values())
+
+    async def list(self) -> ListResponse:
+        return ListResponse(models=await self._merge("list"))
+
+    async def ps(self) -> ProcessResponse:
+        return ProcessResponse(models=await self._merge("ps"))
+
+
+def parse_host_models(value: str) -> dict:
+    """
+    Parse OLLAMA_HOST_MODELS, e.g.
+    "http://gpu-a:11434=*extractor*;http://gpu-b:11434=skills_score*,exp_*,edu-match*".
+
+    Returns:
+        dict: {host: [model patterns]}
+    """
+    host_models = {}
+    for entry in value.split(";"):
+        if "=" not in entry:
+            continue
+        host, patterns = entry.rsplit("=", 1)
+        host_models[host.strip().rstrip("/")] = [pattern.strip() for pattern in patterns.split(",") if pattern.strip()]
+    return host_models
+
+
+def create_endpoint_pool() -> OllamaEndpointPool:
+    """
+    Build the endpoint pool from the environment.
+
+    OLLAMA_HOSTS lists the hosts (comma separated, defaults to OLLAMA_HOST),
+    OLLAMA_HOST_MODELS restricts hosts to model patterns (unlisted hosts serve
+    every model), OLLAMA_EJECT_SECONDS sets how long a failed host is skipped
+    and OLLAMA_HEALTH_CHECK_INTERVAL_SECONDS how often hosts are probed.
+    """
+    hosts = [host.strip().rstrip("/") for host in os.getenv("OLLAMA_HOSTS", "").split(",") if host.strip()]
+    if not hosts:
+        hosts = [os.getenv("OLLAMA_HOST") or "http://127.0.0.1:11434"]
+
+    host_models = parse_host_models(os.getenv("OLLAMA_HOST_MODELS", ""))
+    pool = OllamaEndpointPool(
+        [OllamaEndpoint(host, host_models.get(host)) for host in hosts],
+        eject_seconds=float(os.getenv("OLLAMA_EJECT_SECONDS", "30")),
+    )
+    pool.start_health_checks(float(os.getenv("OLLAMA_HEALTH_CHECK_INTERVAL_SECONDS", "15")))
+    return pool
@@ -1,3 +1,47 @@
+import json
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+import numpy as np
+
+# Offline location -> standard UTC offset table (countries, major cities, PH cities and provinces)
+LOCATIONS_PATH = os.path.join(os.path.dirname(__file__), "timezone_locations.json")
+
+# Standard-time offsets of common abbreviations, ambiguous ones resolve to the most common use
+TIMEZONE_ABBREVIATIONS = {
+    "UTC": 0, "GMT": 0, "UT": 0, "Z": 0, "WET": 0, "BST": 1, "IST": 5.5,
+    "CET": 1, "MET": 1, "WAT": 1, "CEST": 2, "EET": 2, "CAT": 2, "SAST": 2, "EEST": 3,
+    "MSK": 3, "EAT": 3, "AST": -4, "GST": 4, "PKT": 5, "NPT": 5.75, "BDT": 6,
+    "MMT": 6.5, "ICT": 7, "WIB": 7, "PHT": 8, "PHST": 8, "PST": -8, "SGT": 8, "MYT": 8,
+    "HKT": 8, "AWST": 8, "WITA": 8, "JST": 9, "KST": 9, "ACST": 9.5, "AEST": 10, "AEDT": 11,
+    "NZST": 12, "NZDT": 13, "HST": -10, "AKST": -9, "PDT": -7, "MST": -7, "MDT": -6,
+    "CST": -6, "CDT": -5, "EST": -5, "EDT": -4, "NST": -3.5, "ART": -3, "BRT": -3,
+}
+
+# "GMT+8", "UTC-04:00", "UTC+0545", "+05:30", "GMT" and the like
+OFFSET_PATTERN = re.compile(r"^(?:GMT|UTC|UT|Z)?\s*(?:([+\-−])\s*(\d{1,2})(?:[:.h]?(\d{2}))?)?$", re.IGNORECASE)
+
+# Explicit offsets inside free text, only with a GMT/UTC prefix
+TEXT_OFFSET_PATTERN = re.compile(r"\b(?:GMT|UTC)\s*([+\-−])\s*(\d{1,2})(?::?(\d{2}))?\b", re.IGNORECASE)
+
+# Lines that read as an address or location, only these are searched for place names
+LOCATION_LINE_PATTERN = re.compile(
+    r",|\d|\b(address|location|city|street|st|ave|avenue|road|rd|blvd|brgy|barangay|province|"
+    r"based in|living in|lives in|located in|residing in)\b",
+    re.IGNORECASE,
+)
+
+EMAIL_PATTERN = re.compile(r"\S+@\S+")
+
+# Compiled location and IANA name tables, built on first use
+_location_offsets = None
+_location_pattern = None
+_iana_offsets = None
+
+
 def tz_score(a_hours: float, b_hours: float) -> float:
     # convert to 0..24 circle
     a = (a_hours + 24) % 24
@@ -7,30 +51,127 @@ def tz_score(a_hours: float, b_hours: float) -> float:
     score = (1 - diff / 12) * 100  # 100 = same zone, 0 = 12h apart
     return max(0.0, min(100.0, score)), diff
 
+
+def tz_scores(a_hours, b_hours: float):
+    """
+    Vectorized tz_score for many applicant offsets against one job offset.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (scores, differences in hours)
+    """
+    a = (np.asarray(a_hours, dtype=float) + 24) % 24
+    b = (b_hours + 24) % 24
+    d = np.abs(a - b)
+    diff = np.minimum(d, 24 - d)
+    score = np.clip((1 - diff / 12) * 100, 0.0, 100.0)
+    return score, diff
+
+
+def _standard_offset(zone):
+    """UTC offset of an IANA zone outside daylight saving time, in hours."""
+    year = datetime.now().year
+    for month in (1, 7):
+        moment = datetime(year, month, 1, tzinfo=zone)
+        if not moment.dst():
+            return moment.utcoffset().total_seconds() / 3600
+    return datetime(year, 1, 1, tzinfo=zone).utcoffset().total_seconds() / 3600
+
+
+def _get_iana_offsets():
+    """Lowercased IANA zone name -> standard offset, e.g. "asia/manila" -> 8.0."""
+    global _iana_offsets
+    if _iana_offsets is None:
+        offsets = {}
+        for name in available_timezones():
+            try:
+                offsets[name.casefold()] = _standard_offset(ZoneInfo(name))
+            except Exception:
+                continue
+        _iana_offsets = offsets
+    return _iana_offsets
+
+
+def _get_location_offsets():
+    """Load the location table and compile one regex over all its names."""
+    global _location_offsets, _location_pattern
+    if _location_offsets is None:
+        with open(LOCATIONS_PATH, encoding="utf-8") as f:
+            offsets = {name.casefold(): float(offset) for name, offset in json.load(f).items()}
+        # Longest names first, so "new york" wins over "york"
+        names = sorted(offsets, key=len, reverse=True)
+        _location_pattern = re.compile(r"\b(" + "|".join(re.escape(name) for name in names) + r")\b", re.IGNORECASE)
+        _location_offsets = offsets
+    return _location_offsets
+
+
+def _offset_from_match(sign, hours, minutes):
+    offset = float(hours) + float(minutes or 0) / 60
+    return -offset if sign in ("-", "−") else offset
+
+
+@lru_cache(maxsize=4096)
 def parse_timezone(tz_string):
     """
-    Converts 'GMT+5:30' or 'UTC-4' into a float offset like 5.5 or -4.0
+    Converts a timezone string into a float offset in hours.
+
+    Understands offsets ('GMT+5:30', 'UTC-4', 'UTC+05:45', '+08:00'), common
+    abbreviations ('PST', 'PHT'), IANA names ('Asia/Manila') and locations
+    from the bundled table ('Philippines', 'Quezon City'). Returns None if the
+    string cannot be resolved.
     """
-    if "GMT" in tz_string:
-        tz = tz_string.split("GMT")[-1]
-    elif "UTC" in tz_string:
-        tz = tz_string.split("UTC")[-1]
-    else:
-        return None  # Unknown format
-
-    # Example tz: +5:30, -4, +8
-    sign = 1
-    if tz.startswith("-"):
-        sign = -1
-        tz = tz[1:]
-    elif tz.startswith("+"):
-        tz = tz[1:]
-
-    # Split hour/min if needed
-    if ":" in tz:
-        hours, mins = tz.split(":")
-        offset = sign * (float(hours) + float(mins) / 60)
-    else:
-        offset = sign * float(tz)
-
-    return offset
\ No newline at end of file
+    tz = (tz_string or "").strip()
+    if not tz:
+        return None
+
+    match = OFFSET_PATTERN.match(tz)
+    if match:
+        sign, hours, minutes = match.groups()
+        return _offset_from_match(sign, hours, minutes) if hours else 0.0
+
+    if tz.upper() in TIMEZONE_ABBREVIATIONS:
+        return float(TIMEZONE_ABBREVIATIONS[tz.upper()])
+
+    iana_offset = _get_iana_offsets().get(tz.casefold().replace(" ", "_"))
+    if iana_offset is not None:
+        return iana_offset
+
+    return _get_location_offsets().get(tz.casefold().rstrip("."))
+
+
+def resolve_timezone_from_text(text):
+    """
+    Find the timezone of free text such as a resume header, using rules only.
+
+    Looks for explicit GMT/UTC offsets, IANA zone names and known locations.
+    Place names are only matched on lines that read as an address (commas,
+    numbers, "Brgy.", "based in" ...) with email addresses removed, so a
+    name such as "Sydney Reyes" is not taken for a city. Returns None when
+    nothing is found or the hints disagree.
+    """
+    offsets = {
+        _offset_from_match(*match.groups())
+        for match in TEXT_OFFSET_PATTERN.finditer(text)
+    }
+    if not offsets:
+        iana_offsets = _get_iana_offsets()
+        for name in re.findall(r"\b[A-Z][A-Za-z_]+/[A-Z][A-Za-z_]+(?:/[A-Z][A-Za-z_]+)?\b", text):
+            if name.casefold() in iana_offsets:
+                offsets.add(iana_offsets[name.casefold()])
+    if not offsets:
+        locations = _get_location_offsets()
+        for line in text.split("\n"):
+            line = EMAIL_PATTERN.sub(" ", line)
+            if LOCATION_LINE_PATTERN.search(line):
+                offsets.update(locations[name.casefold()] for name in _location_pattern.findall(line))
+
+    if len(offsets) != 1:
+        return None
+    return offsets.pop()
+
+
+def format_timezone(offset: float) -> str:
+    """Format an offset in hours the way the extractor model does, e.g. 5.75 -> 'GMT+5:45'."""
+    sign = "-" if offset < 0 else "+"
+    total_minutes = round(abs(offset) * 60)
+    hours, minutes = divmod(total_minutes, 60)
+    return f"GMT{sign}{hours}:{minutes:02d}" if minutes else f"GMT{sign}{hours}"
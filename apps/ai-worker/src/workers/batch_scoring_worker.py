@@ -0,0 +1,53 @@
+import asyncio
+import json
+from src.services.scoring_pipeline import score_applicants_batch
+from src.services.api_client import get_async_api_client
+from src.config.constants import ApplicantStatus
+from src.config.settings import get_settings
+from src.utils.metrics import observe_stage
+from src.workers.scoring_worker import report_scoring_result
+
+
+async def batch_scoring_worker(job):
+    """
+    Score all applicants of a "score-applicants-batch" job against one job.
+
+    Job data:
+        jobData: JSON string of the job record
+        applicants: [{"applicantId": int, "applicantData": JSON string}]
+    """
+    api_client = get_async_api_client()
+    applicants = job.data.get("applicants", [])
+    applicant_ids = [applicant.get("applicantId") for applicant in applicants]
+
+    print(f"Starting batch scoring for {len(applicants)} applicants")
+
+    try:
+        job_data = json.loads(job.data.get("jobData"))
+        applicants_data = [json.loads(applicant.get("applicantData")) for applicant in applicants]
+
+        with observe_stage("score_batch"):
+            results = await score_applicants_batch(applicants_data, job_data)
+
+    except Exception as e:
+        print(f"Error batch scoring applicants {applicant_ids}: {e}")
+        async with api_client.batch(max_size=50):
+            for applicant_id in applicant_ids:
+                await api_client.set_status(applicant_id, ApplicantStatus.FAILED, f"Failed to score resume: {e}")
+        return
+
+    # Each applicant's updates are one batch of their own, so a failed mutation
+    # is attributed to the applicant that made it; applicants report concurrently
+    limit = asyncio.Semaphore(get_settings().api_pool_size)
+
+    async def report(applicant_id, result):
+        async with limit:
+            try:
+                if "error" in result:
+                    raise ValueError(result["error"])
+                await report_scoring_result(api_client, applicant_id, result)
+            except Exception as e:
+                print(f"Error scoring applicant {applicant_id}: {e}")
+                await api_client.set_status(applicant_id, ApplicantStatus.FAILED, f"Failed to score resume: {e}")
+
+    await asyncio.gather(*(report(applicant_id, result) for applicant_id, result in zip(applicant_ids, results)))
@@ -1,13 +1,14 @@
 import time
-from src.storage.minio_client import get_minio_object
-from src.services.resume_extraction import extract_pdf_text
-from src.services.resume_parser import parse_resume_text
-from src.services.api_client import APIClient
+from src.services.resume_text_cache import extract_resume_text_async
+from src.services.resume_parser import parse_resume_text_cached_async
+from src.services.resume_preprocessing import preprocess_resume_text
+from src.services.api_client import get_async_api_client
 from src.config.constants import ApplicantStatus
+from src.utils.metrics import observe_stage
 
 
-def extraction_worker(job):
-    api_client = APIClient()
+async def extraction_worker(job):
+    api_client = get_async_api_client()
     applicant_id = job.data.get("applicantId")
     resume_path = job.data.get("resumePath")
 
@@ -15,42 +16,71 @@ def extraction_worker(job):
 
     try:
 
-        pdf_data = get_minio_object(resume_path)
-        if pdf_data is None:
-            raise ValueError(f"Failed to retrieve object {resume_path} from MinIO.")
-        
-        # Time extraction
+        # Time extraction, previously extracted resumes skip the download and decode
         extraction_start = time.time()
-        extracted_text = extract_pdf_text(pdf_data)
+        with observe_stage("text_extraction"):
+            extracted_text, extraction_info = await extract_resume_text_async(resume_path)
         extraction_time_ms = int((time.time() - extraction_start) * 1000)
 
+        # Drop page furniture and fit each extractor's input to its token budget
+        extracted_text, model_inputs = preprocess_resume_text(extracted_text)
+
         print(extracted_text)
-        
+
         # Set status to parsing
-        api_client.set_status(applicant_id, ApplicantStatus.PARSING)
+        await api_client.set_status(applicant_id, ApplicantStatus.PARSING)
 
         # Time parsing
         parsing_start = time.time()
-        parsed_resume = parse_resume_text(extracted_text)
+        model_timings = {}
+        # Time to each extractor's first complete element, e.g. its first skill
+        first_partial_ms = {}
+
+        def on_partial(model, partial):
+            first_partial_ms.setdefault(model, int((time.time() - parsing_start) * 1000))
+
+        with observe_stage("parse"):
+            parsed_resume, parse_cache_hit = await parse_resume_text_cached_async(
+                extracted_text,
+                timings=model_timings,
+                model_inputs=model_inputs,
+                on_partial=on_partial,
+            )
         parsing_time_ms = int((time.time() - parsing_start) * 1000)
-        
+
+        print({
+            "applicant_id": applicant_id,
+            "pdf_sha256": extraction_info["sha256"],
+            "text_cache_hit": extraction_info["cache_hit"],
+            "extraction_time_ms": extraction_time_ms,
+            "parsing_time_ms": parsing_time_ms,
+            "parse_cache_hit": parse_cache_hit,
+            "model_input_chars": {model: len(text) for model, text in model_inputs.items()},
+            # Sum of the model calls, compare against parsing_time_ms for the concurrency speedup
+            "model_time_ms": sum(model_timings.values()),
+            "model_timings_ms": model_timings,
+            "model_first_partial_ms": first_partial_ms,
+        })
+
         total_time_ms = extraction_time_ms + parsing_time_ms
 
-        # Set status to processing
-        api_client.set_status(applicant_id, ApplicantStatus.PROCESSING)
+        # These updates are independent, send them as one batched request
+        async with api_client.batch():
+            # Set status to processing
+            await api_client.set_status(applicant_id, ApplicantStatus.PROCESSING)
 
-        # Update parsed data via API
-        api_client.update_parsed_data(applicant_id, parsed_resume)
+            # Update parsed data via API
+            await api_client.update_parsed_data(applicant_id, parsed_resume)
 
-        # Update parsing time
-        api_client.update_parsing_time(applicant_id, total_time_ms)
+            # Update parsing time
+            await api_client.update_parsing_time(applicant_id, total_time_ms)
 
-        # Queue for scoring
-        api_client.queue_score_resume(applicant_id)
+        # Queue for scoring, only once the parsed data is stored
+        await api_client.queue_score_resume(applicant_id)
 
 
     except Exception as e:
         # Set status to failed
         print(f"Error processing applicant {applicant_id}: {e}")
-        api_client.set_status(applicant_id, ApplicantStatus.FAILED, f"Failed to extract or parse resume: {e}")
+        await api_client.set_status(applicant_id, ApplicantStatus.FAILED, f"Failed to extract or parse resume: {e}")
         
\ No newline at end of file
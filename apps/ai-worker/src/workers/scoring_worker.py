@@ -1,119 +1,82 @@
-import time
 import json
-from src.services.resume_scoring import score_education_match, score_skills_match, score_timezone_match, score_experience_match
-from src.services.api_client import APIClient
+from src.services.scoring_pipeline import score_applicant
+from src.services.api_client import get_async_api_client
 from src.config.constants import ApplicantStatus
+from src.utils.metrics import observe_stage, record_stage_timings
 
-def scoring_worker(job):
-    api_client = APIClient()
-    applicant_id = job.data.get("applicantId")
-    applicant_data = job.data.get("applicantData")
-    job_data = job.data.get("jobData")
-
-    print(f"Starting scoring for applicant ID: {applicant_id}")
 
-    try:
-        
-        applicant_data = json.loads(applicant_data)
-        job_data = json.loads(job_data)
+async def report_scoring_result(api_client, applicant_id, result):
+    """
+    Send a scoring pipeline result for one applicant to the API.
 
-        score_skills_start = time.time()
-        # Score Skills
+    The result updates go out as one batched request; the final status is
+    sent only once they are stored, since tRPC runs a batch concurrently.
+    """
+    record_stage_timings("score", result['timings_ms'])
 
-        applicant_skills = [skill.strip() for skill in applicant_data['parsedSkills'].split(",")]
-        job_skills = job_data['skills']
-
-        skills_result =  score_skills_match(job_skills, applicant_skills)
-
-        skills_score = skills_result['score']
-        scored_skills = skills_result['scored_skills']
-        is_disqualified = skills_result['disqualified']
-
-        score_skills_time_ms = int((time.time() - score_skills_start) * 1000)
+    if result['disqualified']:
+        async with api_client.batch():
+            await api_client.update_matched_skills(applicant_id, result['scored_skills'])
+            await api_client.update_scoring_time(applicant_id, result['scoring_time_ms'])
+        await api_client.set_status(applicant_id, ApplicantStatus.DISQUALIFIED, "Applicant disqualified due to missing required skills.")
+        print({
+            "applicant_id": applicant_id,
+            "reason": "Disqualified due to missing required skills.",
+            "timings_ms": result['timings_ms'],
+        })
+        return
 
-        api_client.update_matched_skills(applicant_id, scored_skills)
+    async with api_client.batch():
+        await api_client.update_matched_skills(applicant_id, result['scored_skills'])
 
-        if is_disqualified:
-            api_client.set_status(applicant_id, ApplicantStatus.DISQUALIFIED, "Applicant disqualified due to missing required skills.")
+        # Scorers run concurrently, so report the wall time rather than the sum
+        await api_client.update_scoring_time(applicant_id, result['scoring_time_ms'])
 
-            api_client.update_scoring_time(applicant_id, score_skills_time_ms)
-            print({
-                "applicant_id": applicant_id,
-                "reason": "Disqualified due to missing required skills."
-            })
-            return
+        await api_client.update_applicant_experience_relevance(applicant_id, result['experience_periods_with_relevance'])
 
-        # Score Education
-        score_education_start = time.time()
-        education_score = score_education_match(
-            applicant_highest_degree=applicant_data['parsedHighestEducationDegree'],
-            applicant_education_field=applicant_data['parsedEducationField'],
-            job_required_degree=job_data['educationDegree'],
-            job_education_field=job_data['educationField']
+        await api_client.update_applicant_scores(
+            applicant_id,
+            result['skills_score'],
+            result['experience_score'],
+            result['education_score'],
+            result['timezone_score'],
+            result['overall_score'],
+            result['years_of_experience'],
         )
 
-        score_education_time_ms = int((time.time() - score_education_start) * 1000)
-
-    
-        # Score Timezone
-        score_timezone_start = time.time()
-        timezone_result = score_timezone_match(applicant_data['parsedTimezone'], job_data['timezone'])
-        timezone_score = timezone_result['score']
+    # Set status to completed
+    await api_client.set_status(applicant_id, ApplicantStatus.COMPLETED)
 
-        score_timezone_time_ms = int((time.time() - score_timezone_start) * 1000)
+    print({
+        "applicant_id": applicant_id,
+        "education_score": result['education_score'],
+        "skills_score": result['skills_score'],
+        "timezone_score": result['timezone_score'],
+        "experience_score": result['experience_score'],
+        "overall_score": result['overall_score'],
+        "scoring_time_ms": result['scoring_time_ms'],
+        "timings_ms": result['timings_ms'],
+    })
 
-        # Score Experience
-        score_experience_start = time.time()
-    
-        experience_periods = applicant_data['experiences']
-        job_relevant_experience_years = job_data['yearsOfExperience']
-        job_title = job_data['title']
 
-        experience_result = score_experience_match(experience_periods, job_relevant_experience_years, job_title)
-        experience_score = experience_result['score']
-        experience_periods_with_relevance = experience_result['experience_periods_with_relevance']
-        total_experience_years = experience_result['years_of_experience']
+async def scoring_worker(job):
+    api_client = get_async_api_client()
+    applicant_id = job.data.get("applicantId")
+    applicant_data = job.data.get("applicantData")
+    job_data = job.data.get("jobData")
 
-        score_experience_time_ms = int((time.time() - score_experience_start) * 1000)
+    print(f"Starting scoring for applicant ID: {applicant_id}")
 
-        total_scoring_time_ms = (score_skills_time_ms + score_education_time_ms +
-                                 score_timezone_time_ms + score_experience_time_ms)
+    try:
         
-        api_client.update_scoring_time(applicant_id, total_scoring_time_ms)
-
-        api_client.update_applicant_experience_relevance(applicant_id, experience_periods_with_relevance)
-
-
-        # Calculate Overall Score with Weights
-        overall_score = (
-            education_score * float(job_data['educationWeight']) +
-            skills_score * float(job_data['skillsWeight']) +
-            timezone_score * float(job_data['timezoneWeight']) +
-            experience_score * float(job_data['experienceWeight'])
-        )
-
-        api_client.update_applicant_scores(
-            applicant_id,
-            skills_score,
-            experience_score,
-            education_score,
-            timezone_score,
-            overall_score,
-            total_experience_years,
-        )
+        applicant_data = json.loads(applicant_data)
+        job_data = json.loads(job_data)
 
-        # Set status to completed
-        api_client.set_status(applicant_id, ApplicantStatus.COMPLETED)
+        with observe_stage("score"):
+            result = await score_applicant(applicant_data, job_data)
 
-        print({
-            "applicant_id": applicant_id,
-            "education_score": education_score,
-            "skills_score": skills_score,
-            "timezone_score": timezone_score,
-            "experience_score": experience_score,
-            "overall_score": overall_score
-        })
+        await report_scoring_result(api_client, applicant_id, result)
 
     except Exception as e:
         print(f"Error scoring applicant {applicant_id}: {e}")
-        api_client.set_status(applicant_id, ApplicantStatus.FAILED, f"Failed to score resume: {e}")
\ No newline at end of file
+        await api_client.set_status(applicant_id, ApplicantStatus.FAILED, f"Failed to score resume: {e}")
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from src.services.resume_scoring import score_education_match, score_skills_match, score_timezone_match, score_experience_match
 
@@ -7,18 +8,18 @@ job = {'id': 5, 'createdAt': '2025-08-20T18:30:19.479Z', 'updatedAt': '2025-08-2
 def test_scoring_applicant():
     """Test scoring an applicant against a job description."""
     # Score Education Match
-    education_score = score_education_match(
+    education_score = asyncio.run(score_education_match(
         applicant_highest_degree=applicant['parsedHighestEducationDegree'],
         applicant_education_field=applicant['parsedEducationField'],
         job_required_degree=job['educationDegree'],
         job_education_field=job['educationField']
-    )
+    ))
 
     # Score Skills Match
     job_skills = [{"name": skill.strip(), "weight": 0.1} for skill in job['skills'].split(",")]
     applicant_skills = [skill.strip() for skill in applicant['parsedSkills'].split(",")]
 
-    skills_result = score_skills_match(job_skills, applicant_skills)
+    skills_result = asyncio.run(score_skills_match(job_skills, applicant_skills))
 
     total_skills_score = skills_result['score']
 
@@ -30,7 +31,7 @@ def test_scoring_applicant():
     job_relevant_experience_years = job['yearsOfExperience']
     job_title = job['title']
 
-    experience_score_data = score_experience_match(experience_periods, job_relevant_experience_years, job_title)
+    experience_score_data = asyncio.run(score_experience_match(experience_periods, job_relevant_experience_years, job_title))
 
 
     result = {
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+import requests
+from src.services import api_client
+from src.services.api_client import APIClient, AsyncAPIClient
+from src.config.constants import ApplicantStatus
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports = []
+    paths = []
+    failures_left = 0
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubAPIHandler.client_ports.append(self.client_address[1])
+        StubAPIHandler.paths.append(self.path)
+
+        status = 200
+        if StubAPIHandler.failures_left > 0:
+            StubAPIHandler.failures_left -= 1
+            status = 503
+
+        result = {"result": {"data": {"json": {"success": status == 200}}}}
+        if self.path.endswith("?batch=1"):
+            procedures = self.path.split("/api/trpc/")[1].split("?")[0].split(",")
+            assert len(procedures) == len(payload)
+            result = [
+                {"error": {"json": {"message": "Applicant not found"}}}
+                if call["json"]["applicantId"] < 0 else result
+                for call in payload.values()
+            ]
+        body = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StubAPIHandler.client_ports = []
+    StubAPIHandler.paths = []
+    StubAPIHandler.failures_left = 0
+
+    monkeypatch.setenv("API_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("API_RETRY_BACKOFF", "0")
+    monkeypatch.setattr(api_client, "_sessions", {})
+    yield StubAPIHandler
+    server.shutdown()
+    server.server_close()
+
+
+def test_api_client_reuses_connections(stub_api):
+    """Test that consecutive callbacks share one keep-alive connection."""
+    client = APIClient()
+    for _ in range(5):
+        status_code, _ = client.set_status(1, ApplicantStatus.PROCESSING)
+        assert status_code == 200
+
+    assert len(stub_api.client_ports) == 5
+    assert len(set(stub_api.client_ports)) == 1
+
+
+def test_api_client_retries_unavailable(stub_api):
+    """Test that a 503 from the API is retried before giving up."""
+    stub_api.failures_left = 2
+    status_code, response = APIClient().set_status(1, ApplicantStatus.PROCESSING)
+
+    assert status_code == 200
+    assert len(stub_api.client_ports) == 3
+
+
+def test_api_client_does_not_resend_queue_scoring(stub_api):
+    """Test that queueScoring is sent once, the API may have queued it before failing."""
+    stub_api.failures_left = 1
+    with pytest.raises(requests.HTTPError):
+        APIClient().queue_score_resume(1)
+
+    assert len(stub_api.paths) == 1
+
+
+def test_async_api_client_does_not_resend_queue_scoring(stub_api, monkeypatch):
+    """Test that the async client retries idempotent mutations only."""
+    monkeypatch.setattr(api_client, "_async_api_client", None)
+
+    async def run():
+        client = AsyncAPIClient()
+        try:
+            stub_api.failures_left = 1
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.queue_score_resume(1)
+            stub_api.failures_left = 1
+            status_code, _ = await client.set_status(1, ApplicantStatus.PROCESSING)
+            assert status_code == 200
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+
+    assert len(stub_api.paths) == 3
+
+
+def test_api_client_batches_mutations(stub_api):
+    """Test that mutations made inside batch() are sent as one tRPC batch request."""
+    client = APIClient()
+    with client.batch():
+        client.set_status(1, ApplicantStatus.PROCESSING)
+        client.update_parsing_time(1, 1200)
+        client.update_scoring_time(1, 800)
+
+    assert stub_api.paths == [
+        "/api/trpc/applicant.updateStatusAI,applicant.updateParsingTimeAI,applicant.updateScoringTimeAI?batch=1"
+    ]
+
+
+def test_api_client_batch_flushes_at_max_size_and_reports_errors(stub_api):
+    """Test that a full batch is flushed early and a failed mutation raises."""
+    client = APIClient()
+    with client.batch(max_size=2):
+        client.update_scoring_time(1, 800)
+        client.update_scoring_time(2, 900)
+        client.update_scoring_time(3, 700)
+
+    assert len(stub_api.paths) == 2
+
+    with pytest.raises(RuntimeError, match="Applicant not found"):
+        with client.batch():
+            client.update_scoring_time(-1, 800)
+            client.update_scoring_time(1, 800)
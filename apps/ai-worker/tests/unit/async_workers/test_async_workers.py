@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+import httpx
+from types import SimpleNamespace
+from src.config.constants import ApplicantStatus
+from src.services import resume_parser
+from src.services.api_client import AsyncAPIClient
+from src.workers import batch_scoring_worker
+
+
+def test_parse_resume_text_async_runs_extractors_concurrently(monkeypatch):
+    outputs = {
+        "edu-timezone-extractor:latest": {"highestEducationDegree": "Bachelor", "educationField": "IT", "timezone": "GMT+8"},
+        "skills-extractor:latest": {"skills": ["Python"]},
+        "experience-extractor:latest": {"experiencePeriods": []},
+    }
+
+    async def fake_query(model, content, schema, **kwargs):
+        await asyncio.sleep(0.3)
+        return schema.model_validate(outputs[model])
+
+    monkeypatch.setattr(resume_parser, "query_ollama_structured_async", fake_query)
+
+    start = time.time()
+    timings = {}
+    result = asyncio.run(resume_parser.parse_resume_text_async("resume", timings=timings))
+
+    assert time.time() - start < 0.6
+    assert result["skills"] == ["Python"] and result["timezone"] == "GMT+8"
+    assert set(timings) == set(outputs)
+
+
+def test_parse_resume_text_async_times_out_slow_extractor(monkeypatch):
+    async def fake_query(model, content, schema, **kwargs):
+        if model == "skills-extractor:latest":
+            await asyncio.sleep(5)
+        return schema.model_validate({
+            "edu-timezone-extractor:latest": {"highestEducationDegree": "Unknown", "educationField": "Unknown"},
+            "experience-extractor:latest": {"experiencePeriods": []},
+        }[model])
+
+    monkeypatch.setattr(resume_parser, "query_ollama_structured_async", fake_query)
+
+    result = asyncio.run(resume_parser.parse_resume_text_async(
+        "resume", timeouts={"skills-extractor:latest": 0.1}, allow_partial=True,
+    ))
+
+    assert "skills" not in result and result["experiencePeriods"] == []
+
+
+def test_async_api_client_batches_per_task():
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        if request.url.params.get("batch") == "1":
+            return httpx.Response(200, json=[{"result": {}} for _ in body])
+        return httpx.Response(200, json={"result": {}})
+
+    async def job(api_client, applicant_id):
+        async with api_client.batch():
+            await api_client.update_scoring_time(applicant_id, 100)
+            await asyncio.sleep(0.01)
+            await api_client.update_parsing_time(applicant_id, 200)
+
+    async def run():
+        api_client = AsyncAPIClient()
+        api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await asyncio.gather(job(api_client, 1), job(api_client, 2))
+        await api_client.queue_score_resume(3)
+        await api_client.aclose()
+
+    asyncio.run(run())
+
+    batches = [body for path, body in requests if "," in path]
+    assert len(batches) == 2
+    assert sorted({call["json"]["applicantId"] for call in batch.values()} for batch in batches) == [{1}, {2}]
+    assert requests[-1][0] == "/api/trpc/applicant.queueScoring"
+
+
+def test_batch_scoring_worker_attributes_failures_and_sends_status_last(monkeypatch):
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        if request.url.params.get("batch") == "1":
+            return httpx.Response(200, json=[
+                {"error": {"json": {"message": "Applicant not found"}}} if call["json"]["applicantId"] == 2 else {"result": {}}
+                for call in body.values()
+            ])
+        return httpx.Response(200, json={"result": {}})
+
+    result = {
+        "disqualified": False,
+        "scored_skills": [],
+        "scoring_time_ms": 10,
+        "timings_ms": {"skills": 5},
+        "experience_periods_with_relevance": [],
+        "skills_score": 80,
+        "experience_score": 70,
+        "education_score": 60,
+        "timezone_score": 100,
+        "overall_score": 75,
+        "years_of_experience": 3,
+    }
+    api_client = AsyncAPIClient()
+    api_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(batch_scoring_worker, "get_async_api_client", lambda: api_client)
+    async def fake_score(applicants, job):
+        return [result, result, result]
+
+    monkeypatch.setattr(batch_scoring_worker, "score_applicants_batch", fake_score)
+
+    job = SimpleNamespace(data={
+        "jobData": "{}",
+        "applicants": [{"applicantId": i, "applicantData": "{}"} for i in (1, 2, 3)],
+    })
+    asyncio.run(batch_scoring_worker.batch_scoring_worker(job))
+
+    statuses = {
+        body["json"]["applicantId"]: (index, body["json"]["statusAI"])
+        for index, (path, body) in enumerate(requests)
+        if path.endswith("updateStatusAI")
+    }
+    assert statuses[1][1] == statuses[3][1] == ApplicantStatus.COMPLETED.value
+    assert statuses[2][1] == ApplicantStatus.FAILED.value
+
+    # Each applicant's results are stored before its final status is sent
+    for applicant_id, (status_index, _) in statuses.items():
+        batch_index = next(
+            index for index, (path, body) in enumerate(requests)
+            if "," in path and body["0"]["json"]["applicantId"] == applicant_id
+        )
+        assert batch_index < status_index
@@ -0,0 +1,101 @@
+import time
+import pytest
+from src.storage.cache import DEFAULT_CACHE_DIR, LRUCache, SQLiteCache, TieredCache, get_cache_dir
+from src.utils import ollama
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the LRU tier drops the oldest untouched entry."""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_sqlite_cache_ttl_and_size_eviction(tmp_path):
+    """Test that the disk tier expires old entries and trims to max_entries."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=0.2, max_entries=3)
+    for i in range(5):
+        cache.set(f"key{i}", f"value{i}")
+    cache.evict()
+
+    assert len(cache) == 3
+    assert cache.get("key4") == "value4"
+
+    time.sleep(0.3)
+    assert cache.get("key4") is None
+
+
+def test_tiered_cache_counts_hits_and_misses(tmp_path):
+    """Test that values survive a fresh memory tier and hits are counted per tier."""
+    path = str(tmp_path / "tiered.sqlite3")
+    cache = TieredCache("test", path=path)
+    assert cache.get("key") is None
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    reopened = TieredCache("test", path=path)
+    assert reopened.get("key") == "value"
+    assert reopened.get("key") == "value"
+
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["memory_hits"] == 1
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_query_ollama_model_uses_response_cache(tmp_path, monkeypatch):
+    """Test that an identical (model, content) query is answered from the cache."""
+    calls = []
+
+    class FakeClient:
+        def list(self):
+            raise ConnectionError("offline")
+
+        def chat(self, model, messages, think, format=None, stream=False, keep_alive=None):
+            calls.append(model)
+            content = '```json\n{"skills": ["Python"]}\n```'
+            if stream:
+                return iter([{"message": {"content": content}}])
+            return {"message": {"content": content}}
+
+    monkeypatch.setenv("AI_WORKER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(ollama, "_response_cache", None)
+    monkeypatch.setattr(ollama, "get_ollama_client", lambda: FakeClient())
+
+    first = ollama.query_ollama_model(model="skills-extractor:latest", content="resume")
+    second = ollama.query_ollama_model(model="skills-extractor:latest", content="resume")
+
+    assert first == second == {"skills": ["Python"]}
+    assert calls == ["skills-extractor:latest"]
+
+
+def test_sqlite_cache_reads_do_not_write_until_batched(tmp_path):
+    """Test that access times are batched and still drive LRU eviction."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    changes = cache._conn.total_changes
+
+    assert cache.get("a") == "1"
+    assert cache._conn.total_changes == changes
+
+    cache.set("c", "3")
+    cache.evict()
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+
+
+def test_cache_dir_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    """Test that the default cache directory is anchored to the package."""
+    monkeypatch.delenv("AI_WORKER_CACHE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    assert get_cache_dir() == DEFAULT_CACHE_DIR
+    assert not (tmp_path / ".cache").exists()
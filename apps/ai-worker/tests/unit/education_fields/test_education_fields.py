@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+import numpy as np
+from src.services import education_fields
+from src.services.education_fields import EducationFieldIndex, normalize_education_field
+
+
+def test_normalize_education_field():
+    """Test that degree wording, case and punctuation are normalized away."""
+    assert normalize_education_field("Bachelor of Science in Computer Science") == "computer science"
+    assert normalize_education_field("BS in  Computer Science") == "computer science"
+    assert normalize_education_field("Master's Degree in Data Science") == "data science"
+    assert normalize_education_field("Information & Communication Technology") == "information and communication technology"
+
+
+def test_education_field_index_memoizes_model_scores(tmp_path, monkeypatch):
+    """Test that each normalized field pair reaches edu-match only once."""
+    calls = []
+
+    async def fake_query(model, content, json_output):
+        calls.append(content)
+        return "70"
+
+    async def fake_digest(model):
+        return "sha256:a"
+
+    monkeypatch.setattr(education_fields, "query_ollama_model_async", fake_query)
+    monkeypatch.setattr(education_fields, "get_model_digest_async", fake_digest)
+    index = EducationFieldIndex(path=str(tmp_path / "fields.sqlite3"))
+
+    assert asyncio.run(index.get_similarity("Data Science", "Computer Science")) == 70.0
+    assert asyncio.run(index.get_similarity("data science", "BS Computer Science")) == 70.0
+    assert asyncio.run(index.get_similarity("Computer Science", "Computer Science")) == 100.0
+
+    reopened = EducationFieldIndex(path=str(tmp_path / "fields.sqlite3"))
+    assert asyncio.run(reopened.get_similarity("Data Science", "Computer Science")) == 70.0
+
+    assert calls == ["data science, computer science"]
+
+
+def test_education_field_index_keys_on_model_digest(tmp_path, monkeypatch):
+    """Test that a re-created edu-match model does not reuse old scores."""
+    digest = {"value": "sha256:a"}
+    scores = iter(["70", "40"])
+
+    async def fake_query(model, content, json_output):
+        return next(scores)
+
+    async def fake_digest(model):
+        return digest["value"]
+
+    monkeypatch.setattr(education_fields, "query_ollama_model_async", fake_query)
+    monkeypatch.setattr(education_fields, "get_model_digest_async", fake_digest)
+    index = EducationFieldIndex(path=str(tmp_path / "fields.sqlite3"))
+
+    assert asyncio.run(index.get_similarity("Data Science", "Computer Science")) == 70.0
+    digest["value"] = "sha256:b"
+    assert asyncio.run(index.get_similarity("Data Science", "Computer Science")) == 40.0
+
+
+def test_embedding_fallback_compares_only_fields_of_the_same_job_field(tmp_path, monkeypatch):
+    """Test that the fallback reuses a close applicant field of the same job field only."""
+    vectors = {
+        "computer science": [1.0, 0.0],
+        "computing science": [1.0, 0.0],
+        "biology": [0.0, 1.0],
+    }
+    embedded = []
+
+    async def fake_embed(texts):
+        embedded.append(list(texts))
+        return np.array([vectors[text] for text in texts], dtype=np.float32)
+
+    scores = iter(["70", "30", "55"])
+
+    async def fake_query(model, content, json_output):
+        return next(scores)
+
+    async def fake_digest(model):
+        return "sha256:a"
+    monkeypatch.setattr(education_fields, "query_ollama_model_async", fake_query)
+    monkeypatch.setattr(education_fields, "get_model_digest_async", fake_digest)
+    monkeypatch.setattr(education_fields, "embed_texts", fake_embed)
+    index = EducationFieldIndex(path=str(tmp_path / "fields.sqlite3"), embedding_fallback=True)
+
+    assert asyncio.run(index.get_similarity("Data Science", "Computer Science")) == 70.0
+    assert asyncio.run(index.get_similarity("Statistics", "Biology")) == 30.0
+
+    # Close to "computer science", scored for the same job field
+    assert asyncio.run(index.get_similarity("Data Science", "Computing Science")) == 70.0
+    assert embedded[-1] == ["computing science", "computer science"]
+
+    # No known field for this job field, so edu-match scores it
+    assert asyncio.run(index.get_similarity("Mathematics", "Computing Science")) == 55.0
+    assert len(embedded) == 1
@@ -0,0 +1,79 @@
+import pytest
+from src.models.scoring import ExperiencePeriods, JobSkillScores
+from src.utils import ollama
+from src.utils.json_repair import loads_tolerant, repair_json
+
+
+def test_repair_json_fixes_common_model_mistakes():
+    assert loads_tolerant('{"a": 1, "b": [1, 2,], }') == {"a": 1, "b": [1, 2]}
+    assert loads_tolerant("Here you go: {'skills': ['Python', 'SQL'], ok: True, note: None} Done.") == {
+        "skills": ["Python", "SQL"], "ok": True, "note": None,
+    }
+    assert loads_tolerant('{"a": "x" "b": 2, "c":, "d": [{"e": 1}{"e": 2}]}') == {
+        "a": "x", "b": 2, "c": None, "d": [{"e": 1}, {"e": 2}],
+    }
+
+
+def test_repair_json_closes_truncated_output():
+    truncated = '{"job_skills": [{"skill": "Go", "match_type": "missing", "score": 0}, {"skill": "Py'
+    assert loads_tolerant(truncated) == {"job_skills": [{"skill": "Go", "match_type": "missing", "score": 0}, {"skill": "Py"}]}
+
+
+def test_repair_json_without_json_raises():
+    with pytest.raises(ValueError):
+        repair_json("no json here")
+
+
+def test_validate_structured_response_repairs_locally_before_json_fixer(monkeypatch):
+    fixer_calls = []
+    monkeypatch.setattr(ollama, "_chat", lambda *args, **kwargs: fixer_calls.append(args))
+
+    result = ollama.validate_structured_response(
+        "experience-extractor:latest",
+        '{"experiencePeriods": [{"startYear": "2020", "startMonth": "May", "endYear": "Present", "endMonth": "None", "jobTitle": "Dev",}',
+        ExperiencePeriods,
+    )
+
+    assert result.experiencePeriods[0].jobTitle == "Dev"
+    assert fixer_calls == []
+
+
+def test_validate_structured_response_falls_back_to_json_fixer(monkeypatch):
+    fixed = '{"job_skills": [{"skill": "Go", "match_type": "missing", "from_cv": null, "score": 0.0, "reason": "Not in CV"}]}'
+    calls = []
+
+    def fake_chat(model, content, think, response_format=None, on_partial=None):
+        calls.append((model, response_format))
+        return fixed
+
+    monkeypatch.setenv("JSON_FIXER_MODEL", "json_fixer:latest")
+    monkeypatch.setattr(ollama, "_chat", fake_chat)
+
+    # Repairs to valid JSON, but "match" is not a field of the schema
+    result = ollama.validate_structured_response("skills_score:latest", '{"job_skills": [{"skill": "Go", "match', JobSkillScores)
+
+    assert result.job_skills[0].match_type.value == "missing"
+    assert calls == [("json_fixer:latest", JobSkillScores.model_json_schema())]
+
+
+def test_query_ollama_structured_passes_schema_as_format(tmp_path, monkeypatch):
+    formats = []
+
+    class FakeClient:
+        def list(self):
+            raise ConnectionError("offline")
+
+        def chat(self, model, messages, think, format=None, stream=False, keep_alive=None):
+            formats.append(format)
+            return {"message": {"content": '{"experiencePeriods": []}'}}
+
+    monkeypatch.setenv("AI_WORKER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("OLLAMA_STREAM_JSON", "false")
+    monkeypatch.setattr(ollama, "_response_cache", None)
+    monkeypatch.setattr(ollama, "get_ollama_client", lambda: FakeClient())
+
+    first = ollama.query_ollama_structured("experience-extractor:latest", "resume", ExperiencePeriods)
+    second = ollama.query_ollama_structured("experience-extractor:latest", "resume", ExperiencePeriods)
+
+    assert first == second == ExperiencePeriods(experiencePeriods=[])
+    assert formats == [ExperiencePeriods.model_json_schema()]
@@ -0,0 +1,60 @@
+from src.utils import ollama
+from src.utils.json_stream import IncrementalJSONParser
+
+
+def feed_all(parser, chunks):
+    partials = []
+    for chunk in chunks:
+        if parser.feed(chunk):
+            break
+        partials.append(parser.partial())
+    return partials
+
+
+def test_parser_exposes_complete_elements_while_streaming():
+    parser = IncrementalJSONParser()
+    partials = feed_all(parser, ['Sure: {"skills": ["Pyt', 'hon", "S', 'QL", "Dock', 'er"]}'])
+
+    assert partials == [None, {"skills": ["Python"]}, {"skills": ["Python", "SQL"]}]
+    assert parser.complete
+    assert parser.value() == {"skills": ["Python", "SQL", "Docker"]}
+
+
+def test_parser_stops_at_closing_brace_and_ignores_braces_in_strings():
+    parser = IncrementalJSONParser()
+
+    assert not parser.feed('{"reason": "uses {braces} and \\"quotes\\"", "n": [1, {"a": 2}]')
+    assert parser.feed('} Hope this helps! {"again": true}')
+    assert parser.value() == {"reason": 'uses {braces} and "quotes"', "n": [1, {"a": 2}]}
+    assert parser.feed("more chatter")
+    assert parser.text.endswith("}]}")
+
+
+def test_parser_skips_thinking_block():
+    parser = IncrementalJSONParser()
+    parser.feed("<think>maybe {not this}")
+    parser.feed('</think>{"skills": []}')
+
+    assert parser.value() == {"skills": []}
+
+
+def test_stream_json_stops_generation_once_complete(monkeypatch):
+    generated = []
+    closed = []
+
+    def fake_stream(model, content, think=False, response_format=None, usage=None):
+        try:
+            for chunk in ['{"skills": ["Python",', ' "SQL"]}', "\n\nRepeating: ", '{"skills": ["Python"]}']:
+                generated.append(chunk)
+                yield chunk
+        finally:
+            closed.append(True)
+
+    partials = []
+    monkeypatch.setattr(ollama, "stream_ollama_model", fake_stream)
+
+    text = ollama._stream_json("skills-extractor:latest", "resume", False, "json", partials.append)
+
+    assert text == '{"skills": ["Python", "SQL"]}'
+    assert len(generated) == 2 and closed == [True]
+    assert partials == [{"skills": ["Python"]}]
@@ -0,0 +1,98 @@
+import socket
+import time
+import pytest
+import requests
+from types import SimpleNamespace
+from prometheus_client import REGISTRY
+from src.storage.cache import TieredCache
+from src.utils.metrics import (
+    JOB_SECONDS,
+    STAGE_SECONDS,
+    observe,
+    record_model_usage,
+    record_queue_wait,
+    start_metrics_server,
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_cache_lookups_counted_by_result(tmp_path):
+    cache = TieredCache("metrics_test", path=str(tmp_path / "cache.sqlite3"))
+    cache.set("a", "1")
+
+    cache.get("a")
+    cache.memory.clear()
+    cache.get("a")
+    cache.get("b")
+
+    for result in ("memory_hit", "disk_hit", "miss"):
+        assert sample("ai_worker_cache_lookups_total", cache="metrics_test", result=result) == 1
+
+
+def test_observe_labels_outcome():
+    before = sample("ai_worker_job_seconds_count", job="metrics-test", outcome="error")
+
+    with pytest.raises(ValueError):
+        with observe(JOB_SECONDS, job="metrics-test"):
+            raise ValueError("boom")
+
+    assert sample("ai_worker_job_seconds_count", job="metrics-test", outcome="error") == before + 1
+
+
+def test_record_model_usage_from_final_response():
+    record_model_usage("usage-model", {"prompt_eval_count": 120, "eval_count": 40, "eval_duration": 2_000_000_000})
+
+    assert sample("ai_worker_model_tokens_total", model="usage-model", direction="prompt") == 120
+    assert sample("ai_worker_model_tokens_total", model="usage-model", direction="generated") == 40
+    assert sample("ai_worker_model_tokens_per_second_sum", model="usage-model") == 20
+
+
+def test_record_model_usage_falls_back_to_streamed_chunks():
+    # A stream closed early has no final response
+    record_model_usage("stream-model", None, generated_chunks=30, generation_seconds=1.5)
+
+    assert sample("ai_worker_model_tokens_total", model="stream-model", direction="generated") == 30
+    assert sample("ai_worker_model_tokens_per_second_sum", model="stream-model") == 20
+
+
+def test_record_model_usage_estimates_prompt_of_early_stopped_stream():
+    record_model_usage("early-model", None, generated_chunks=5, generation_seconds=0.5, prompt_chars=4001)
+
+    assert sample("ai_worker_model_tokens_total", model="early-model", direction="prompt_estimated") == 1001
+    assert sample("ai_worker_model_tokens_total", model="early-model", direction="prompt") == 0
+
+    # Exact counts never add to the estimate
+    record_model_usage("early-model", {"prompt_eval_count": 10, "eval_count": 1, "eval_duration": 10**9}, prompt_chars=4000)
+    assert sample("ai_worker_model_tokens_total", model="early-model", direction="prompt_estimated") == 1001
+
+
+def test_record_queue_wait_from_job_timestamp():
+    job = SimpleNamespace(name="wait-test", timestamp=(time.time() - 5) * 1000, delay=2000)
+
+    record_queue_wait(job)
+
+    assert 2.5 < sample("ai_worker_queue_wait_seconds_sum", job="wait-test") < 3.5
+
+
+def test_metrics_endpoint_serves_histograms():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    STAGE_SECONDS.labels(stage="metrics_test").observe(0.2)
+
+    assert start_metrics_server(port) is True
+    body = requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5).text
+
+    assert 'ai_worker_stage_seconds_bucket{le="0.25",stage="metrics_test"} 1.0' in body
+
+
+def test_metrics_server_is_optional_and_survives_a_busy_port():
+    assert start_metrics_server(0) is False
+
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        assert start_metrics_server(busy.getsockname()[1]) is False
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import pytest
+from src.storage import minio_client
+from src.storage.minio_client import spool_minio_object
+from src.services.resume_extraction import extract_pdf_text
+
+TEST_PDF_PATH = os.path.join(os.path.dirname(__file__), "..", "resume_extraction", "pdf", "Applicant_1_Resume.pdf")
+
+
+class FakeStat:
+    def __init__(self, data, etag):
+        self.size = len(data)
+        self.etag = etag
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def stream(self, amt):
+        for i in range(0, len(self.data), amt):
+            yield self.data[i:i + amt]
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    def __init__(self, data, etag=None):
+        self.data = data
+        self.etag = etag if etag is not None else hashlib.md5(data).hexdigest()
+
+    def stat_object(self, bucket_name, object_name):
+        return FakeStat(self.data, f'"{self.etag}"')
+
+    def get_object(self, bucket_name, object_name):
+        return FakeResponse(self.data)
+
+
+def test_spool_minio_object_streams_to_file(tmp_path, monkeypatch):
+    """Test that the object is spooled to a file that pdfium can read, and cleaned up after."""
+    with open(TEST_PDF_PATH, "rb") as f:
+        pdf_data = f.read()
+
+    monkeypatch.setattr(minio_client, "get_minio_client", lambda: FakeMinio(pdf_data))
+    monkeypatch.setattr(minio_client.settings, "minio_spool_dir", str(tmp_path))
+    monkeypatch.setattr(minio_client, "SPOOL_CHUNK_SIZE", 4096)
+
+    with spool_minio_object("resumes/test.pdf") as (path, checksum):
+        assert checksum == hashlib.sha256(pdf_data).hexdigest()
+        assert extract_pdf_text(path) == extract_pdf_text(pdf_data)
+
+    assert not os.path.exists(path)
+
+
+def test_spool_minio_object_rejects_bad_objects(tmp_path, monkeypatch):
+    """Test that oversized objects and checksum mismatches are refused."""
+    monkeypatch.setattr(minio_client.settings, "minio_spool_dir", str(tmp_path))
+
+    monkeypatch.setattr(minio_client, "get_minio_client", lambda: FakeMinio(b"x" * 100))
+    with pytest.raises(ValueError, match="byte limit"):
+        with spool_minio_object("resumes/test.pdf", max_bytes=10):
+            pass
+
+    monkeypatch.setattr(minio_client, "get_minio_client", lambda: FakeMinio(b"x" * 100, etag="0" * 32))
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        with spool_minio_object("resumes/test.pdf"):
+            pass
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_extract_resume_text_skips_download_when_cached(tmp_path, monkeypatch):
+    """Test that a resume seen before is served from the text cache without downloading it."""
+    from src.services import resume_text_cache
+    with open(TEST_PDF_PATH, "rb") as f:
+        pdf_data = f.read()
+
+    downloads = []
+
+    class CountingMinio(FakeMinio):
+        def get_object(self, bucket_name, object_name):
+            downloads.append(object_name)
+            return super().get_object(bucket_name, object_name)
+
+    monkeypatch.setenv("AI_WORKER_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(resume_text_cache, "_resume_text_cache", None)
+    monkeypatch.setattr(minio_client, "get_minio_client", lambda: CountingMinio(pdf_data))
+    monkeypatch.setattr(minio_client.settings, "minio_spool_dir", str(tmp_path))
+
+    text, info = resume_text_cache.extract_resume_text("resumes/a.pdf")
+    assert info["cache_hit"] is False
+    assert text == extract_pdf_text(pdf_data)
+
+    cached_text, info = resume_text_cache.extract_resume_text("resumes/a.pdf")
+    assert info["cache_hit"] is True
+    assert cached_text == text
+    assert downloads == ["resumes/a.pdf"]
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from src.services import model_residency
+from src.services.model_residency import ModelResidencyManager, get_queue_backlog
+
+ROLE_MODELS = {
+    "extraction": ["extractor-a", "extractor-b"],
+    "scoring": ["scorer-a", "scorer-b"],
+}
+
+
+class FakeClient:
+    """Loads each model in 0.2s and reports loaded models like /api/ps."""
+
+    def __init__(self):
+        self.loaded = []
+        self.keep_alive = {}
+        self._lock = threading.Lock()
+
+    def generate(self, model, prompt, keep_alive):
+        time.sleep(0.2)
+        with self._lock:
+            self.loaded.append(model)
+            self.keep_alive[model] = keep_alive
+
+    def ps(self):
+        return SimpleNamespace(models=[SimpleNamespace(model=model) for model in self.loaded])
+
+
+def test_warm_loads_models_in_parallel_with_keep_alive(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(model_residency, "get_ollama_clients", lambda model: [client])
+    monkeypatch.setenv("OLLAMA_KEEP_ALIVE", "-1")
+    manager = ModelResidencyManager(ROLE_MODELS, max_workers=4)
+
+    start = time.time()
+    warmed = manager.warm()
+
+    assert time.time() - start < 0.6
+    assert set(warmed) == {"extractor-a", "extractor-b", "scorer-a", "scorer-b"}
+    assert all(elapsed_ms is not None for elapsed_ms in warmed.values())
+    assert set(client.keep_alive.values()) == {-1}
+
+
+def test_ensure_resident_reloads_evicted_models_busiest_role_first(monkeypatch):
+    client = FakeClient()
+    client.loaded = ["extractor-a"]
+    monkeypatch.setattr(model_residency, "get_ollama_clients", lambda model: [client])
+    manager = ModelResidencyManager(ROLE_MODELS, max_workers=2)
+
+    assert manager.plan({"scoring": 12, "extraction": 1})[:2] == ["scorer-a", "scorer-b"]
+
+    warmed = manager.ensure_resident({"scoring": 12, "extraction": 1})
+
+    assert list(warmed) == ["scorer-a", "scorer-b", "extractor-b"]
+    # Waves of max_workers, so the scoring models are loaded before the extractor
+    assert client.loaded[-1] == "extractor-b"
+    assert manager.ensure_resident({}) == {}
+
+
+def test_get_queue_backlog_splits_shared_queue_by_job_name():
+    class FakeQueue:
+        async def getJobs(self, types, start, end, asc):
+            return [SimpleNamespace(name=name) for name in ["process-resume", "score-applicant", "score-applicant", "other"]]
+
+    job_roles = {"process-resume": "extraction", "score-applicant": "scoring"}
+    backlog = asyncio.run(get_queue_backlog([FakeQueue()], job_roles))
+
+    assert backlog == {"extraction": 1, "scoring": 2}
+
+
+def test_ensure_resident_checks_each_host(monkeypatch):
+    host_a, host_b = FakeClient(), FakeClient()
+    host_a.loaded = ["scorer-a", "scorer-b"]
+    host_b.loaded = ["scorer-b"]
+    monkeypatch.setattr(model_residency, "get_ollama_clients", lambda model: [host_a, host_b])
+    manager = ModelResidencyManager({"scoring": ["scorer-a", "scorer-b"]})
+
+    warmed = manager.ensure_resident()
+
+    # Evicted on one host only, still reloaded there and nowhere else
+    assert list(warmed) == ["scorer-a"]
+    assert host_a.loaded == ["scorer-a", "scorer-b"]
+    assert host_b.loaded == ["scorer-b", "scorer-a"]
+
+
+def test_role_models_include_json_fixer(monkeypatch):
+    monkeypatch.setenv("JSON_FIXER_MODEL", "json_fixer:latest")
+    assert model_residency.get_role_models(["extraction"])["extraction"][-1] == "json_fixer:latest"
+
+    monkeypatch.setenv("JSON_FIXER_MODEL", "")
+    assert "" not in model_residency.get_role_models(["extraction", "scoring"])["scoring"]
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.utils.ollama_pool import (
+    OllamaEndpoint,
+    OllamaEndpointPool,
+    PooledAsyncClient,
+    PooledClient,
+    parse_host_models,
+)
+
+
+class StubOllama:
+    """Minimal Ollama server answering /api/chat, /api/version, /api/tags and /api/ps."""
+
+    def __init__(self, name, models=("model-a",), delay=0.0):
+        self.name = name
+        self.models = list(models)
+        self.delay = delay
+        self.chats = 0
+        self.down = False
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if stub.down:
+                    return self._reply(503, {"error": "unavailable"})
+                if self.path == "/api/version":
+                    return self._reply(200, {"version": "0.0.0"})
+                entries = [{"name": model, "model": model} for model in stub.models]
+                self._reply(200, {"models": entries})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if stub.down:
+                    return self._reply(503, {"error": "unavailable"})
+                if body["model"] not in stub.models:
+                    return self._reply(404, {"error": f"model '{body['model']}' not found"})
+                stub.chats += 1
+                time.sleep(stub.delay)
+                self._reply(200, {
+                    "model": body["model"],
+                    "message": {"role": "assistant", "content": stub.name},
+                    "done": True,
+                })
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    created = []
+
+    def make(*args, **kwargs):
+        stub = StubOllama(*args, **kwargs)
+        created.append(stub)
+        return stub
+
+    yield make
+    for stub in created:
+        stub.close()
+
+
+def chat(client, model="model-a"):
+    return client.chat(model=model, messages=[{"role": "user", "content": "hi"}]).message.content
+
+
+def test_routes_models_to_hosts_with_affinity(stubs):
+    extract = stubs("extract", models=["edu-timezone-extractor:latest", "skills_score:latest"])
+    score = stubs("score", models=["edu-timezone-extractor:latest", "skills_score:latest"])
+    host_models = parse_host_models(f"{extract.host}=*extractor*;{score.host}=skills_score*")
+    client = PooledClient(OllamaEndpointPool([
+        OllamaEndpoint(extract.host, host_models[extract.host]),
+        OllamaEndpoint(score.host, host_models[score.host]),
+    ]))
+
+    assert {chat(client, "edu-timezone-extractor:latest") for _ in range(4)} == {"extract"}
+    assert {chat(client, "skills_score:latest") for _ in range(4)} == {"score"}
+
+
+def test_spreads_concurrent_requests_by_outstanding_requests(stubs):
+    first = stubs("first", delay=0.3)
+    second = stubs("second", delay=0.3)
+    pool = OllamaEndpointPool([OllamaEndpoint(first.host), OllamaEndpoint(second.host)])
+    client = PooledClient(pool)
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        answers = list(executor.map(lambda _: chat(client), range(4)))
+    elapsed = time.time() - start
+
+    assert sorted(answers) == ["first", "first", "second", "second"]
+    assert elapsed < 1.0
+    assert [endpoint.outstanding for endpoint in pool.endpoints] == [0, 0]
+
+
+def test_fails_over_and_ejects_unavailable_host(stubs):
+    broken = stubs("broken")
+    working = stubs("working")
+    broken.down = True
+    pool = OllamaEndpointPool([OllamaEndpoint(broken.host), OllamaEndpoint(working.host)], eject_seconds=60)
+    client = PooledClient(pool)
+
+    assert {chat(client) for _ in range(4)} == {"working"}
+    assert not pool.endpoints[0].healthy
+    assert working.chats == 4
+
+
+def test_fails_over_when_host_is_unreachable(stubs):
+    working = stubs("working")
+    pool = OllamaEndpointPool([OllamaEndpoint("http://127.0.0.1:9"), OllamaEndpoint(working.host)])
+
+    assert chat(PooledClient(pool)) == "working"
+
+
+def test_health_check_readmits_recovered_host(stubs):
+    flaky = stubs("flaky")
+    other = stubs("other")
+    pool = OllamaEndpointPool([OllamaEndpoint(flaky.host), OllamaEndpoint(other.host)], eject_seconds=60)
+
+    flaky.down = True
+    assert pool.check_health() == {flaky.host: False, other.host: True}
+    assert not pool.endpoints[0].healthy
+
+    flaky.down = False
+    assert pool.check_health() == {flaky.host: True, other.host: True}
+    assert pool.endpoints[0].healthy
+
+
+def test_missing_model_fails_over_without_ejecting(stubs):
+    without = stubs("without", models=["model-b"])
+    with_model = stubs("with", models=["model-a"])
+    pool = OllamaEndpointPool([OllamaEndpoint(without.host), OllamaEndpoint(with_model.host)])
+
+    assert {chat(PooledClient(pool)) for _ in range(2)} == {"with"}
+    assert all(endpoint.healthy for endpoint in pool.endpoints)
+
+
+def test_ps_merges_models_across_hosts(stubs):
+    first = stubs("first", models=["model-a"])
+    second = stubs("second", models=["model-b", "model-a"])
+    client = PooledClient(OllamaEndpointPool([OllamaEndpoint(first.host), OllamaEndpoint(second.host)]))
+
+    assert sorted(entry.model for entry in client.ps().models) == ["model-a", "model-b"]
+
+
+def test_async_client_fails_over_and_balances(stubs):
+    broken = stubs("broken")
+    first = stubs("first", delay=0.3)
+    second = stubs("second", delay=0.3)
+    broken.down = True
+    client = PooledAsyncClient(OllamaEndpointPool(
+        [OllamaEndpoint(broken.host), OllamaEndpoint(first.host), OllamaEndpoint(second.host)],
+        eject_seconds=60,
+    ))
+
+    async def run():
+        responses = await asyncio.gather(*(
+            client.chat(model="model-a", messages=[{"role": "user", "content": "hi"}]) for _ in range(4)
+        ))
+        return sorted(response.message.content for response in responses)
+
+    start = time.time()
+    assert asyncio.run(run()) == ["first", "first", "second", "second"]
+    assert time.time() - start < 1.0
+    assert not client.pool.endpoints[0].healthy
@@ -1,7 +1,7 @@
 import pytest
 
 import os
-from src.services.resume_extraction import extract_pdf_text
+from src.services.resume_extraction import extract_pdf_text, iter_pdf_pages
 import time
 from src.storage.minio_client import get_minio_object
 
@@ -18,6 +18,20 @@ def test_extract_pdf_text_from_file():
     print("Extracted Text from File:")
     print(extracted_text)
 
+def test_iter_pdf_pages_streams_pages_with_limits():
+    test_pdf_path = os.path.join(os.path.dirname(__file__), "pdf", "Test2.pdf")
+    with open(test_pdf_path, "rb") as f:
+        pdf_data = f.read()
+
+    pages = list(iter_pdf_pages(pdf_data))
+    assert len(pages) == 5
+    assert "\n".join(pages).strip() == extract_pdf_text(test_pdf_path)
+
+    assert len(list(iter_pdf_pages(test_pdf_path, max_pages=2))) == 2
+
+    with pytest.raises(ValueError):
+        list(iter_pdf_pages(pdf_data, max_bytes=1024))
+
 # Test for pdf coming from minio
 
 def test_extract_pdf_text_from_minio():
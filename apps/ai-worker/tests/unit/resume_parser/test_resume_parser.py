@@ -45,4 +45,61 @@ Made with Resumave"""
     assert result['timezone'] == 'GMT+8'
     assert 'Communication' in result['skills']
     assert len(result['experiencePeriods']) == 2
-    assert result['experiencePeriods'][0]['jobTitle'] == 'IT Specialist (Intern)'
\ No newline at end of file
+    assert result['experiencePeriods'][0]['jobTitle'] == 'IT Specialist (Intern)'
+
+def test_parse_resume_text_partial_failure(monkeypatch):
+    """Test that a failing extractor only drops its own fields when partial results are allowed."""
+    outputs = {
+        "edu-timezone-extractor:latest": {"highestEducationDegree": "Bachelor", "educationField": "Information Technology", "timezone": "GMT+8"},
+        "experience-extractor:latest": {"experiencePeriods": [{"startYear": "2022", "startMonth": "None", "endYear": "2023", "endMonth": "None", "jobTitle": "Secretary"}]},
+    }
+
+    def fake_query(model, content, schema, **kwargs):
+        if model not in outputs:
+            raise RuntimeError(f"Failed to query model '{model}'")
+        return schema.model_validate(outputs[model])
+
+    monkeypatch.setattr("src.services.resume_parser.query_ollama_structured", fake_query)
+
+    timings = {}
+    result = parse_resume_text("resume", allow_partial=True, timings=timings)
+
+    assert result['timezone'] == 'GMT+8'
+    assert 'skills' not in result
+    assert len(result['experiencePeriods']) == 1
+    assert set(timings) == set(outputs)
+
+    with pytest.raises(ValueError):
+        parse_resume_text("resume")
+
+
+def test_parse_resume_text_cached_reuses_until_model_changes(tmp_path, monkeypatch):
+    """Test that the same text is parsed once, and again after an extractor model is re-created."""
+    from src.services import resume_parser
+    calls = []
+    digests = {"skills-extractor:latest": "sha256:aaa"}
+
+    def fake_query(model, content, schema, **kwargs):
+        calls.append(model)
+        outputs = {
+            "edu-timezone-extractor:latest": {"highestEducationDegree": "Unknown", "educationField": "Unknown"},
+            "experience-extractor:latest": {"experiencePeriods": []},
+        }
+        return schema.model_validate(outputs.get(model, {"skills": ["Python"]}))
+
+    monkeypatch.setenv("AI_WORKER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(resume_parser, "_parsed_resume_cache", None)
+    monkeypatch.setattr(resume_parser, "query_ollama_structured", fake_query)
+    monkeypatch.setattr(resume_parser, "get_model_digest", lambda model: digests.get(model, model))
+
+    first, hit = resume_parser.parse_resume_text_cached("Jane Doe\nPython  developer")
+    assert hit is False
+    second, hit = resume_parser.parse_resume_text_cached("Jane Doe Python developer ")
+    assert hit is True
+    assert second == first
+    assert len(calls) == 3
+
+    digests["skills-extractor:latest"] = "sha256:bbb"
+    _, hit = resume_parser.parse_resume_text_cached("Jane Doe Python developer")
+    assert hit is False
+    assert len(calls) == 6
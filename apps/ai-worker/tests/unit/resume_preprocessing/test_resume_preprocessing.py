@@ -0,0 +1,83 @@
+import os
+from src.services.resume_extraction import extract_pdf_text
+from src.services.resume_preprocessing import (
+    PAGE_SEPARATOR,
+    clean_resume_text,
+    get_token_budgets,
+    split_resume_sections,
+    preprocess_resume_text,
+)
+
+
+def test_clean_resume_text_drops_page_furniture():
+    pages = [
+        "Juan Dela Cruz - Resume\r\nEXPERIENCE\r\nDeveloper  at   Acme\r\n\r\n\r\nPage 1 of 2",
+        "Juan Dela Cruz - Resume\r\nweb\ufffebased apps\r\nweb-based apps\r\nPage 2 of 2",
+    ]
+    cleaned = clean_resume_text(PAGE_SEPARATOR.join(pages))
+
+    assert cleaned == "EXPERIENCE\nDeveloper at Acme\n\nweb-based apps"
+
+
+def test_clean_resume_text_keeps_dates_and_inline_numbers_at_page_edges():
+    pages = [
+        "2019 - 2021\nDeveloper at Acme\nTeam size\n12\n2021 - 2023",
+        "2015 - 2019\nBS Computer Science\n2",
+    ]
+    cleaned = clean_resume_text(PAGE_SEPARATOR.join(pages))
+
+    assert cleaned.split("\n") == [
+        "2019 - 2021", "Developer at Acme", "Team size", "12", "2021 - 2023",
+        "2015 - 2019", "BS Computer Science",
+    ]
+
+
+def test_token_budgets_follow_model_context(monkeypatch):
+    monkeypatch.delenv("EXTRACTOR_TOKEN_BUDGET", raising=False)
+    monkeypatch.setenv("EXTRACTOR_TOKEN_BUDGETS", "skills-extractor:latest=1000")
+
+    budgets = get_token_budgets(["experience-extractor:latest", "skills-extractor:latest", "unknown:latest"])
+
+    # experience_extractor has num_ctx 8192, less its system prompt and the reply reserve
+    assert 5000 < budgets["experience-extractor:latest"] < 8192 - 2048
+    assert budgets["skills-extractor:latest"] == 1000
+    assert budgets["unknown:latest"] == 0
+
+
+def test_preprocess_routes_sections_within_budget():
+    text = "\n".join([
+        "Juan Dela Cruz",
+        "Manila, Philippines",
+        "EDUCATION",
+        "BS Computer Science, 2018",
+        "SKILLS",
+        "Python, React",
+        "WORK EXPERIENCE",
+        "Developer at Acme, 2019 - Present",
+        "CHARACTER REFERENCES",
+        "Maria Santos, 0917 000 0000",
+    ])
+    assert set(split_resume_sections(text)) == {"header", "education", "skills", "experience", "references"}
+
+    cleaned, model_inputs = preprocess_resume_text(text, route_sections=True, budgets={})
+    assert cleaned == text
+
+    edu_input = model_inputs["edu-timezone-extractor:latest"]
+    assert "Manila, Philippines" in edu_input and "BS Computer Science" in edu_input
+    assert "Python" not in edu_input
+
+    assert model_inputs["experience-extractor:latest"] == "WORK EXPERIENCE\nDeveloper at Acme, 2019 - Present"
+    assert all("Maria Santos" not in model_input for model_input in model_inputs.values())
+
+    _, budgeted = preprocess_resume_text(text, route_sections=False, budgets={"skills-extractor:latest": 10})
+    assert len(budgeted["skills-extractor:latest"]) <= 40
+    assert budgeted["experience-extractor:latest"] == text
+
+
+def test_preprocess_pdf_shrinks_text():
+    test_pdf_path = os.path.join(os.path.dirname(__file__), "..", "resume_extraction", "pdf", "Test2.pdf")
+    raw_text = extract_pdf_text(test_pdf_path, page_separator=PAGE_SEPARATOR)
+
+    cleaned, _ = preprocess_resume_text(raw_text, route_sections=False)
+    assert 0 < len(cleaned) < len(raw_text)
+    assert PAGE_SEPARATOR not in cleaned and "\r" not in cleaned
@@ -1,14 +1,15 @@
+import asyncio
 import pytest
 from src.services.resume_scoring import score_education_match, score_skills_match, score_timezone_match, score_experience_match
 
 def test_score_education_match_exact_match():
     """Test exact match of degree and field returns perfect score."""
-    score = score_education_match(
+    score = asyncio.run(score_education_match(
         applicant_highest_degree="Bachelor",
         applicant_education_field="Computer Science",
         job_required_degree="Bachelor",
         job_education_field="Computer Science"
-    )
+    ))
     assert score == 100.0
 
 
@@ -20,7 +21,7 @@ def test_score_skills_match():
     ]
     applicant_skills = ["Python", "Machine Learning"]
 
-    result = score_skills_match(job_skills, applicant_skills)
+    result = asyncio.run(score_skills_match(job_skills, applicant_skills))
     score = result['score']
 
     assert score >= 83.3
@@ -53,7 +54,7 @@ def test_score_experience_match():
     job_relevant_experience_years = 3
     job_title = "Software Engineer"
 
-    result = score_experience_match(experience_periods, job_relevant_experience_years, job_title)
+    result = asyncio.run(score_experience_match(experience_periods, job_relevant_experience_years, job_title))
 
     score = result['score']
     years_of_experience = result['years_of_experience']
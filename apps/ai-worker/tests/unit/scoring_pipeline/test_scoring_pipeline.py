@@ -0,0 +1,312 @@
+import asyncio
+import pytest
+from src.services import scoring_pipeline
+from src.services.scoring_pipeline import score_applicant
+
+applicant = {
+    'parsedSkills': 'Python, SQL',
+    'parsedHighestEducationDegree': 'Bachelor',
+    'parsedEducationField': 'Computer Science',
+    'parsedTimezone': 'GMT+8',
+    'experiences': [{"startYear": "2020", "endYear": "2023", "startMonth": "None", "endMonth": "None", "jobTitle": "Data Analyst"}],
+}
+job = {
+    'title': 'Data Scientist',
+    'skills': [{"name": "Python", "weight": 10}],
+    'yearsOfExperience': 3,
+    'educationDegree': 'Bachelor',
+    'educationField': 'Data Science',
+    'timezone': 'GMT+8',
+    'skillsWeight': '0.5',
+    'experienceWeight': '0.2',
+    'educationWeight': '0.2',
+    'timezoneWeight': '0.1',
+}
+
+
+def _patch_scorers(monkeypatch, disqualified=False, delay=0.2):
+    calls = []
+
+    async def fake_skills(job_skills, applicant_skills):
+        calls.append("skills")
+        return {"score": 100.0, "scored_skills": [], "disqualified": disqualified}
+
+    async def fake_education(**kwargs):
+        await asyncio.sleep(delay)
+        calls.append("education")
+        return 80.0
+
+    def fake_timezone(applicant_timezone, job_timezone):
+        calls.append("timezone")
+        return {"score": 100.0, "difference_in_hours": 0}
+
+    async def fake_experience(experience_periods, job_relevant_experience_years, job_title):
+        await asyncio.sleep(delay)
+        calls.append("experience")
+        return {"score": 100.0, "years_of_experience": 3.0, "experience_periods_with_relevance": experience_periods}
+
+    monkeypatch.setattr(scoring_pipeline, "score_skills_match", fake_skills)
+    monkeypatch.setattr(scoring_pipeline, "score_education_match", fake_education)
+    monkeypatch.setattr(scoring_pipeline, "score_timezone_match", fake_timezone)
+    monkeypatch.setattr(scoring_pipeline, "score_experience_match", fake_experience)
+    return calls
+
+
+async def _all_relevant(lists, job_title, max_periods_per_call):
+    return [[{**period, "relevant": True} for period in periods] for periods in lists]
+
+
+async def _digest(model):
+    return "sha256:a"
+
+
+def test_score_applicant_runs_scorers_concurrently(monkeypatch):
+    """Test that education and experience scoring overlap and the weighted score is kept."""
+    _patch_scorers(monkeypatch, delay=0.3)
+
+    result = asyncio.run(score_applicant(applicant, job, speculative=False))
+
+    assert result['overall_score'] == pytest.approx(100 * 0.5 + 80 * 0.2 + 100 * 0.1 + 100 * 0.2)
+    assert result['scoring_time_ms'] < 550
+    assert set(result['timings_ms']) == {"skills", "education", "timezone", "experience"}
+
+
+def test_score_applicant_disqualified_skips_other_scorers(monkeypatch):
+    """Test that a disqualified applicant never reaches the remaining scorers."""
+    calls = _patch_scorers(monkeypatch, disqualified=True)
+
+    result = asyncio.run(score_applicant(applicant, job, speculative=False))
+
+    assert result['disqualified'] is True
+    assert result['overall_score'] is None
+    assert calls == ["skills"]
+
+
+def test_score_applicant_jobs_share_the_event_loop(monkeypatch):
+    """Test that concurrent scoring jobs await their scorers instead of queueing for threads."""
+    import threading
+    import time
+    _patch_scorers(monkeypatch, delay=0.3)
+    threads = threading.active_count()
+
+    async def run():
+        return await asyncio.gather(*(score_applicant(applicant, job, speculative=False) for _ in range(20)))
+
+    start = time.time()
+    results = asyncio.run(run())
+
+    assert time.time() - start < 0.6
+    assert all(result['overall_score'] is not None for result in results)
+    assert threading.active_count() == threads
+
+
+def test_score_applicant_speculative_cancels_scorers_when_disqualified(monkeypatch):
+    """Test that speculatively started scorers are cancelled once the applicant is disqualified."""
+    calls = _patch_scorers(monkeypatch, disqualified=True, delay=0.3)
+
+    result = asyncio.run(score_applicant(applicant, job, speculative=True))
+
+    assert result['disqualified'] is True
+    assert "education" not in calls and "experience" not in calls
+
+
+def test_evaluate_experience_relevance_batch_packs_applicants(tmp_path, monkeypatch):
+    """Test that several applicants' periods share one relevance call and are split back in order."""
+    from src.services import resume_scoring
+    from src.services.experience_relevance import ExperienceRelevanceIndex
+    calls = []
+    index = ExperienceRelevanceIndex(path=str(tmp_path / "relevance.sqlite3"))
+    monkeypatch.setattr(resume_scoring, "get_experience_relevance_index", lambda: index)
+
+    async def fake_evaluate(experience_periods, job_title):
+        calls.append(len(experience_periods))
+        return [{**period, "relevant": "Data" in period["jobTitle"]} for period in experience_periods]
+
+    monkeypatch.setattr(resume_scoring, "evaluate_experience_relevance", fake_evaluate)
+
+    period_lists = [
+        [{"jobTitle": "Data Analyst"}, {"jobTitle": "Cashier"}],
+        [],
+        [{"jobTitle": "Data Engineer"}],
+    ]
+    results = asyncio.run(resume_scoring.evaluate_experience_relevance_batch(period_lists, "Data Scientist"))
+
+    assert calls == [3]
+    assert [period["relevant"] for period in results[0]] == [True, False]
+    assert results[1] == []
+    assert results[2][0]["relevant"] is True
+
+
+def test_evaluate_experience_relevance_reuses_title_pairs(tmp_path, monkeypatch):
+    """Test that repeat role titles need no model call and unseen ones are sent once each."""
+    from src.services import resume_scoring
+    from src.services.experience_relevance import ExperienceRelevanceIndex, normalize_job_title
+    prompts = []
+    index = ExperienceRelevanceIndex(path=str(tmp_path / "relevance.sqlite3"))
+    monkeypatch.setattr(resume_scoring, "get_experience_relevance_index", lambda: index)
+
+    async def fake_evaluate(experience_periods, job_title):
+        prompts.append([period["jobTitle"] for period in experience_periods])
+        return [{**period, "relevant": "Engineer" in period["jobTitle"]} for period in experience_periods]
+
+    monkeypatch.setattr(resume_scoring, "evaluate_experience_relevance", fake_evaluate)
+
+    assert normalize_job_title("Software Engineer at Acme Corp") == normalize_job_title("software engineer at Globex")
+    assert normalize_job_title("Intern - Software Engineering") != normalize_job_title("Intern - Marketing")
+    assert normalize_job_title("Director, Engineering") == "director engineering"
+
+    first = [
+        {"startYear": "2020", "endYear": "2022", "jobTitle": "Software Engineer at Acme Corp"},
+        {"startYear": "2018", "endYear": "2020", "jobTitle": "Cashier at Jollibee"},
+        {"startYear": "2017", "endYear": "2018", "jobTitle": "Software Engineer at Globex"},
+    ]
+    results = asyncio.run(resume_scoring.evaluate_experience_relevance_batch([first], "Backend Developer"))
+    assert prompts == [["Software Engineer at Acme Corp", "Cashier at Jollibee"]]
+    assert [period["relevant"] for period in results[0]] == [True, False, True]
+    assert results[0][0]["startYear"] == "2020"
+
+    prompts.clear()
+    repeat = [{"startYear": "2021", "endYear": "Present", "jobTitle": "SOFTWARE ENGINEER at Initech"}]
+    assert asyncio.run(resume_scoring.evaluate_experience_relevance_batch([repeat], "Backend Developer"))[0][0]["relevant"] is True
+    assert prompts == []
+
+
+def test_evaluate_experience_relevance_matches_results_by_title(tmp_path, monkeypatch):
+    """Test that reordered results land on the right titles and unmatched ones are not stored."""
+    from src.services import resume_scoring
+    from src.services.experience_relevance import ExperienceRelevanceIndex
+    index = ExperienceRelevanceIndex(path=str(tmp_path / "relevance.sqlite3"))
+    monkeypatch.setattr(resume_scoring, "get_experience_relevance_index", lambda: index)
+    monkeypatch.setattr("src.services.experience_relevance.get_model_digest_async", _digest)
+
+    async def fake_evaluate(experience_periods, job_title):
+        if len(experience_periods) > 1:
+            # Reordered, one title dropped
+            return [{"jobTitle": "Cashier", "relevant": False}, {"jobTitle": "Data Analyst", "relevant": True}]
+        # The dropped title comes back renamed on its own call too, still one in, one out
+        return [{"jobTitle": "Data Eng.", "relevant": True}] if "Engineer" in experience_periods[0]["jobTitle"] else []
+
+    monkeypatch.setattr(resume_scoring, "evaluate_experience_relevance", fake_evaluate)
+
+    periods = [{"jobTitle": "Data Analyst"}, {"jobTitle": "Data Engineer"}, {"jobTitle": "Cashier"}]
+    results = asyncio.run(resume_scoring.evaluate_experience_relevance_batch([periods], "Data Scientist"))
+
+    assert [period["relevant"] for period in results[0]] == [True, True, False]
+    assert asyncio.run(index.get_many("Data Scientist", ["data analyst", "data engineer", "cashier"])) == {
+        "data analyst": True, "data engineer": True, "cashier": False,
+    }
+
+    # A title the model never answers for is reported not relevant and left unstored
+    async def no_answer(periods, job_title):
+        return []
+
+    monkeypatch.setattr(resume_scoring, "evaluate_experience_relevance", no_answer)
+    results = asyncio.run(resume_scoring.evaluate_experience_relevance_batch([[{"jobTitle": "Nurse"}]], "Data Scientist"))
+    assert results[0][0]["relevant"] is False
+    assert asyncio.run(index.get_many("Data Scientist", ["nurse"])) == {}
+
+
+def test_score_applicants_batch_dedupes_skill_calls(monkeypatch):
+    """Test that applicants with identical skills share one skills call and get their own results."""
+    calls = _patch_scorers(monkeypatch, delay=0)
+    monkeypatch.setattr(scoring_pipeline, "evaluate_experience_relevance_batch", _all_relevant)
+
+    results = asyncio.run(scoring_pipeline.score_applicants_batch([applicant, dict(applicant)], job))
+
+    assert calls.count("skills") == 1
+    assert len(results) == 2
+    assert results[0]['years_of_experience'] == 3.0
+    assert results[1]['overall_score'] == results[0]['overall_score']
+
+
+def test_relevant_experience_years_batch_matches_scalar():
+    """Test that the vectorized overlap merge agrees with the per-applicant calculation."""
+    from datetime import datetime
+    from src.services.resume_scoring import (
+        calculate_relevant_experience_years,
+        calculate_relevant_experience_years_batch,
+    )
+
+    def period(start_year, start_month, end_year, end_month, relevant=True):
+        return {"startYear": start_year, "startMonth": start_month, "endYear": end_year, "endMonth": end_month, "relevant": relevant}
+
+    now = datetime(2025, 6, 15)
+    period_lists = [
+        [period("2019", "May", "2021", "October"), period("2020", "None", "2020", "None"), period("2022", "June", "Present", "None")],
+        [period("2015", "January", "2016", "January", relevant=False)],
+        [],
+        [period("2018", "March", "2019", "March"), period("2019", "March", "2020", "January"), period("2010", "None", "2011", "None")],
+    ]
+
+    batch = calculate_relevant_experience_years_batch(period_lists, now=now)
+
+    expected = [calculate_relevant_experience_years(periods, now=now) for periods in period_lists]
+    assert batch.tolist() == pytest.approx(expected)
+    assert batch[3] == pytest.approx((22 + 12) / 12)
+
+
+def test_score_applicants_batch_malformed_period_fails_only_its_applicant(monkeypatch):
+    """Test that the vectorized years fall back per applicant when one period cannot be parsed."""
+    _patch_scorers(monkeypatch, delay=0)
+    monkeypatch.setattr(scoring_pipeline, "evaluate_experience_relevance_batch", _all_relevant)
+    broken = {**applicant, 'experiences': [{"startYear": "twenty", "endYear": "2023", "startMonth": "None", "endMonth": "None", "jobTitle": "Data Analyst"}]}
+
+    results = asyncio.run(scoring_pipeline.score_applicants_batch([applicant, broken], job))
+
+    assert results[0]['years_of_experience'] == 3.0
+    assert "error" in results[1]
+
+
+def test_score_applicants_batch_missing_field_fails_only_its_applicant(monkeypatch):
+    """Test that an applicant without education fields gets an error and the rest are scored."""
+    _patch_scorers(monkeypatch, delay=0)
+    async def fake_education(**kwargs):
+        return 80.0
+
+    monkeypatch.setattr(scoring_pipeline, "score_education_match", fake_education)
+    monkeypatch.setattr(scoring_pipeline, "evaluate_experience_relevance_batch", _all_relevant)
+    incomplete = {key: value for key, value in applicant.items() if key != 'parsedHighestEducationDegree'}
+
+    results = asyncio.run(scoring_pipeline.score_applicants_batch([incomplete, applicant], job))
+
+    assert "error" in results[0]
+    assert results[1]['education_score'] == 80.0
+
+
+def test_evaluate_experience_relevance_failed_chunk_fails_only_its_applicants(tmp_path, monkeypatch):
+    """Test that a failed packed call is retried per title and only a title failing again errors."""
+    from src.services import resume_scoring
+    from src.services.experience_relevance import ExperienceRelevanceIndex
+    index = ExperienceRelevanceIndex(path=str(tmp_path / "relevance.sqlite3"))
+    monkeypatch.setattr(resume_scoring, "get_experience_relevance_index", lambda: index)
+    monkeypatch.setattr("src.services.experience_relevance.get_model_digest_async", _digest)
+
+    async def fake_evaluate(experience_periods, job_title):
+        if len(experience_periods) > 1 or experience_periods[0]["jobTitle"] == "Nurse":
+            raise RuntimeError("model unavailable")
+        return [{**period, "relevant": "Data" in period["jobTitle"]} for period in experience_periods]
+
+    monkeypatch.setattr(resume_scoring, "evaluate_experience_relevance", fake_evaluate)
+
+    period_lists = [
+        [{"jobTitle": "Data Analyst"}],
+        [{"jobTitle": "Cashier"}, {"jobTitle": "Nurse"}],
+    ]
+    results = asyncio.run(resume_scoring.evaluate_experience_relevance_batch(period_lists, "Data Scientist"))
+
+    assert results[0][0]["relevant"] is True
+    assert isinstance(results[1], ValueError)
+    assert "Nurse" in str(results[1])
+    assert asyncio.run(index.get_many("Data Scientist", ["data analyst", "cashier", "nurse"])) == {
+        "data analyst": True, "cashier": False,
+    }
+
+    # In the batch pipeline only the applicant with the failed title gets an error
+    _patch_scorers(monkeypatch, delay=0)
+    monkeypatch.setattr(scoring_pipeline, "evaluate_experience_relevance_batch", resume_scoring.evaluate_experience_relevance_batch)
+    nurse = {**applicant, 'experiences': [{"startYear": "2020", "endYear": "2023", "startMonth": "None", "endMonth": "None", "jobTitle": "Nurse"}]}
+
+    scored = asyncio.run(scoring_pipeline.score_applicants_batch([applicant, nurse], job))
+
+    assert scored[0]['years_of_experience'] == 3.0
+    assert "Nurse" in scored[1]["error"]
@@ -0,0 +1,156 @@
+import asyncio
+import pytest
+from src.services import resume_scoring
+from src.services.skill_matching import normalize_skill, match_skills_by_rules
+
+
+def test_normalize_skill_aliases_and_filler():
+    assert normalize_skill("Mysql Database") == normalize_skill("MySQL")
+    assert normalize_skill("ReactJS") == normalize_skill("React") == frozenset({"react"})
+    assert normalize_skill("MS Excel") == normalize_skill("Microsoft Excel")
+    assert normalize_skill("C++") != normalize_skill("C#")
+    assert normalize_skill("Java") != normalize_skill("JavaScript")
+    assert normalize_skill("React Native") != normalize_skill("React")
+    assert normalize_skill(".NET") == normalize_skill("dotnet") == frozenset({".net"})
+    assert normalize_skill("Experience in Python") == normalize_skill("Python skills") == normalize_skill("Python")
+
+
+def test_normalize_skill_keeps_meaning_bearing_words():
+    for skill, shorter in [
+        ("Database Management", "Management"),
+        ("Visual Basic", "Visual"),
+        ("Web Development", "Web"),
+        ("Research and Development", "Research"),
+    ]:
+        assert normalize_skill(skill) != normalize_skill(shorter)
+
+    resolved, unresolved = match_skills_by_rules(["Database Management", "Visual Basic"], ["Management", "Visual"])
+    assert resolved == {} and unresolved == ["Database Management", "Visual Basic"]
+
+
+def test_match_skills_by_rules_leaves_residue_for_model():
+    resolved, unresolved = match_skills_by_rules(
+        ["Python", "MySQL", "CSS", "Data Analysis"],
+        ["python", "Mysql Database", "HTML/CSS", "Machine Learning"],
+    )
+
+    assert set(resolved) == {"Python", "MySQL", "CSS"}
+    assert resolved["MySQL"]["from_cv"] == "Mysql Database"
+    assert resolved["CSS"]["match_type"] == "explicit"
+    assert unresolved == ["Data Analysis"]
+
+
+def test_score_skills_match_sends_only_unresolved_skills(monkeypatch):
+    prompts = []
+
+    async def fake_query(model, content, schema, **kwargs):
+        prompts.append(content)
+        return schema.model_validate({"job_skills": [{
+            "skill": "Data Analysis", "match_type": "implied", "from_cv": "Machine Learning",
+            "score": 0.5, "reason": "ML involves data analysis",
+        }]})
+
+    monkeypatch.setattr(resume_scoring, "query_ollama_structured_async", fake_query)
+    job_skills = [{"name": "Python", "weight": 10}, {"name": "Data Analysis", "weight": 5}]
+
+    result = asyncio.run(resume_scoring.score_skills_match(job_skills, ["Python", "Machine Learning"], use_rules=True))
+
+    assert len(prompts) == 1 and "Python" not in prompts[0].split("applicant_skills")[0]
+    assert result["score"] == (10 * 1.0 + 5 * 0.5) / 15 * 100
+    assert result["disqualified"] is False
+    assert [entry["jobSkill"] for entry in result["scored_skills"]] == ["Python", "Data Analysis"]
+
+    # Every job skill explicit, no model call at all
+    prompts.clear()
+    result = asyncio.run(resume_scoring.score_skills_match(job_skills[:1], ["python"], use_rules=True))
+    assert prompts == [] and result["score"] == 100.0
+
+
+async def _fake_embed(texts, model=None):
+    """Map each skill onto a fixed direction, related skills share most of one."""
+    import numpy as np
+    directions = {"python": [1, 0, 0], "django": [0.8, 0.6, 0], "sql": [0, 0, 1], "postgresql": [0, 0.6, 0.8]}
+    vectors = np.array([directions.get(text, [0, 1, 0]) for text in texts], dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_skill_embedding_index_scores_pool(tmp_path, monkeypatch):
+    from src.services import skill_embeddings
+    from src.services.skill_embeddings import SkillEmbeddingIndex
+
+    embedded = []
+    monkeypatch.setattr(skill_embeddings, "embed_texts", lambda texts, model: embedded.extend(texts) or _fake_embed(texts))
+    index = SkillEmbeddingIndex(path=str(tmp_path / "vocabulary"), model="fake", explicit_threshold=0.9, implied_threshold=0.7)
+
+    results = asyncio.run(index.score_skills(["Python", "SQL"], [["Django", "PostgreSQL"], ["Python"], []]))
+
+    assert [entry["match_type"] for entry in results[0]] == ["implied", "implied"]
+    assert results[0][1]["from_cv"] == "PostgreSQL"
+    assert [entry["score"] for entry in results[1]] == [1.0, 0.0]
+    assert [entry["match_type"] for entry in results[2]] == ["missing", "missing"]
+
+    # The vocabulary is persisted, a new index does not embed again
+    embedded.clear()
+    reopened = SkillEmbeddingIndex(path=str(tmp_path / "vocabulary"), model="fake")
+    assert len(reopened) == 4
+    asyncio.run(reopened.similarity_matrix(["python"], ["django"]))
+    assert embedded == []
+
+
+def test_score_skills_match_batch_embedding_backend(tmp_path, monkeypatch):
+    from src.services import skill_embeddings
+    from src.services.skill_embeddings import SkillEmbeddingIndex
+
+    monkeypatch.setattr(skill_embeddings, "embed_texts", lambda texts, model: _fake_embed(texts))
+    index = SkillEmbeddingIndex(path=str(tmp_path / "vocabulary"), model="fake", implied_threshold=0.7)
+    monkeypatch.setattr(resume_scoring, "get_skill_embedding_index", lambda: index)
+
+    job_skills = [{"name": "Python", "weight": 10}, {"name": "SQL", "weight": 5}]
+    results = asyncio.run(resume_scoring.score_skills_match_batch(job_skills, [["python", "PostgreSQL"], ["SQL"]]))
+
+    assert results[0]["score"] == (10 * 1.0 + 5 * 0.5) / 15 * 100
+    assert results[0]["scored_skills"][0]["reason"] == "Exact match after normalization"
+    assert results[1]["disqualified"] is True
+    assert results[0] == asyncio.run(resume_scoring.score_skills_match(job_skills, ["python", "PostgreSQL"], backend="embedding"))
+
+
+def test_score_skills_match_embedding_backend_skips_skills_score(tmp_path, monkeypatch):
+    from src.services import skill_embeddings
+    from src.services.skill_embeddings import SkillEmbeddingIndex
+
+    index = SkillEmbeddingIndex(path=str(tmp_path / "vocabulary"), model="fake", explicit_threshold=0.9, implied_threshold=0.7)
+    monkeypatch.setattr(skill_embeddings, "embed_texts", lambda texts, model: _fake_embed(texts))
+    monkeypatch.setattr(resume_scoring, "get_skill_embedding_index", lambda: index)
+    monkeypatch.setattr(resume_scoring, "query_ollama_structured_async", lambda *args, **kwargs: pytest.fail("skills_score called"))
+
+    job_skills = [{"name": "Python", "weight": 10}, {"name": "SQL", "weight": 10}]
+    single = asyncio.run(resume_scoring.score_skills_match(job_skills, ["Django", "PostgreSQL"], use_rules=False, backend="embedding"))
+    batch = asyncio.run(resume_scoring.score_skills_match_batch(job_skills, [["Django", "PostgreSQL"], ["python"]], use_rules=True))
+
+    # Both implied: (10 * 0.5 + 10 * 0.5) / 20
+    assert single["score"] == batch[0]["score"] == 50.0
+    assert batch[1]["score"] == 50.0
+
+
+def test_skill_embedding_index_appends_and_merges_shards(tmp_path, monkeypatch):
+    from src.services import skill_embeddings
+    from src.services.skill_embeddings import SkillEmbeddingIndex
+
+    monkeypatch.setattr(skill_embeddings, "embed_texts", lambda texts, model: _fake_embed(texts))
+    monkeypatch.setattr(SkillEmbeddingIndex, "COMPACT_SHARDS", 3)
+    path = str(tmp_path / "vocabulary")
+
+    # Two workers sharing the directory, each adding skills the other has not seen
+    first = SkillEmbeddingIndex(path=path, model="fake")
+    second = SkillEmbeddingIndex(path=path, model="fake")
+    asyncio.run(first.vectors(["Python"]))
+    asyncio.run(second.vectors(["SQL"]))
+    assert len(list((tmp_path / "vocabulary").glob("*.npz"))) == 2
+
+    # The third shard triggers a merge into one
+    asyncio.run(first.vectors(["Django"]))
+    assert len(list((tmp_path / "vocabulary").glob("*.npz"))) == 1
+
+    reopened = SkillEmbeddingIndex(path=path, model="fake")
+    assert len(reopened) == 3
+    assert asyncio.run(reopened.vectors(["sql"])).tolist() == asyncio.run(second.vectors(["SQL"])).tolist()
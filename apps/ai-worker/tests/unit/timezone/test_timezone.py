@@ -0,0 +1,73 @@
+import pytest
+from src.utils.timezone import parse_timezone, resolve_timezone_from_text, format_timezone, tz_score, tz_scores
+from src.services.resume_scoring import score_timezone_match, score_timezone_match_batch
+from src.services.resume_parser import resolve_resume_timezone
+
+
+@pytest.mark.parametrize("tz_string, offset", [
+    ("GMT+8", 8.0),
+    ("GMT-3:30", -3.5),
+    ("UTC+05:45", 5.75),
+    ("+0530", 5.5),
+    ("UTC", 0.0),
+    ("PST", -8.0),
+    ("Asia/Manila", 8.0),
+    ("America/New_York", -5.0),
+    ("Philippines", 8.0),
+    ("quezon city", 8.0),
+    ("GMT+X", None),
+    ("Unknown", None),
+    ("", None),
+    ("   ", None),
+    (None, None),
+])
+def test_parse_timezone_formats(tz_string, offset):
+    assert parse_timezone(tz_string) == offset
+
+
+def test_resolve_timezone_from_text():
+    assert resolve_timezone_from_text("Juan Dela Cruz\nBrgy. 12, Makati, Metro Manila") == 8.0
+    assert resolve_timezone_from_text("Remote, available in UTC+05:45 hours") == 5.75
+    # Disagreeing hints are left to the model
+    assert resolve_timezone_from_text("Born in Tokyo, living in London") is None
+    assert resolve_timezone_from_text("Juan Dela Cruz\njuan@example.com") is None
+    # Place names only count on address lines
+    assert resolve_timezone_from_text("Sydney Reyes\nsydney.reyes@example.com") is None
+
+
+def test_resolve_resume_timezone_keeps_valid_model_answer():
+    resume = "Maria Santiago\nmaria.santiago@example.com\nQuezon City, Philippines\nEDUCATION\nBSCS"
+    assert resolve_resume_timezone(resume, "GMT+8") == "GMT+8"
+    assert resolve_resume_timezone("Sydney Reyes\nMakati, Metro Manila", "PHT") == "GMT+8"
+    assert resolve_resume_timezone("Juan Dela Cruz\nEDUCATION\nBSCS", "Asia/Kathmandu") == "GMT+5:45"
+
+
+def test_resolve_resume_timezone_falls_back_to_header_rules():
+    resume = "Juan Dela Cruz\nCebu City, Philippines\nEDUCATION\nBS Computer Science, Tokyo University"
+    assert resolve_resume_timezone(resume, "Unknown") == "GMT+8"
+    assert resolve_resume_timezone(resume, None) == "GMT+8"
+    # The name line is never read as a place
+    assert resolve_resume_timezone("Lima Santos\n0917 000 0000", None) is None
+    assert resolve_resume_timezone("Juan Dela Cruz", "Unknown") is None
+
+
+def test_format_timezone():
+    assert format_timezone(8.0) == "GMT+8"
+    assert format_timezone(-3.5) == "GMT-3:30"
+    assert format_timezone(5.75) == "GMT+5:45"
+
+
+def test_score_timezone_match_batch_matches_single():
+    applicant_timezones = ["GMT+8", "PST", "Asia/Kolkata", "Unknown"]
+    results = score_timezone_match_batch(applicant_timezones, "Asia/Manila")
+
+    for timezone, result in zip(applicant_timezones[:3], results):
+        assert result == pytest.approx(score_timezone_match(timezone, "GMT+8"))
+    assert results[3] is None
+
+    scores, diffs = tz_scores([8, -8, 5.5], 8)
+    assert scores.tolist() == pytest.approx([tz_score(offset, 8)[0] for offset in (8, -8, 5.5)])
+    assert diffs.tolist() == pytest.approx([0, 8, 2.5])
+
+    with pytest.raises(ValueError):
+        score_timezone_match_batch(["GMT+8"], "somewhere")
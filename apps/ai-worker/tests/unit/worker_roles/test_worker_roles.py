@@ -0,0 +1,37 @@
+import pytest
+from main import get_queue_options
+
+
+def _role_configs(scoring_queue):
+    return {
+        "extraction": {"queue": "cvrankify-jobs", "concurrency": 2, "rate_limit_max": 0, "rate_limit_duration_ms": 1000},
+        "scoring": {"queue": scoring_queue, "concurrency": 4, "rate_limit_max": 10, "rate_limit_duration_ms": 1000},
+    }
+
+
+def test_separate_queues_get_their_own_options():
+    """Test that each role's queue gets its own concurrency and rate limit."""
+    queue_options = get_queue_options(["extraction", "scoring"], _role_configs("cvrankify-scoring"))
+
+    assert queue_options["cvrankify-jobs"] == (["extraction"], {"concurrency": 2})
+    assert queue_options["cvrankify-scoring"] == (
+        ["scoring"],
+        {"concurrency": 4, "limiter": {"max": 10, "duration": 1000}},
+    )
+
+
+def test_shared_queue_combines_roles():
+    """Test that roles sharing a queue are served by one worker with their combined concurrency."""
+    queue_options = get_queue_options(["extraction", "scoring"], _role_configs("cvrankify-jobs"))
+
+    roles, options = queue_options["cvrankify-jobs"]
+    assert roles == ["extraction", "scoring"]
+    assert options["concurrency"] == 6
+
+
+def test_single_role_requires_dedicated_queue():
+    """Test that running one role on a queue shared with another role is rejected."""
+    assert list(get_queue_options(["scoring"], _role_configs("cvrankify-scoring"))) == ["cvrankify-scoring"]
+
+    with pytest.raises(ValueError):
+        get_queue_options(["scoring"], _role_configs("cvrankify-jobs"))
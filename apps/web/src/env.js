@@ -23,6 +23,7 @@ export const env = createEnv({
     REDIS_HOST: z.string().min(1),
     REDIS_PORT: z.coerce.number().min(1),
     REDIS_QUEUE_NAME: z.string().min(1),
+    REDIS_SCORING_QUEUE_NAME: z.string().min(1).optional(),
   },
 
   /**
@@ -50,6 +51,7 @@ export const env = createEnv({
     REDIS_HOST: process.env.REDIS_HOST,
     REDIS_PORT: process.env.REDIS_PORT,
     REDIS_QUEUE_NAME: process.env.REDIS_QUEUE_NAME,
+    REDIS_SCORING_QUEUE_NAME: process.env.REDIS_SCORING_QUEUE_NAME,
   },
   /**
    * Run `build` or `dev` with `SKIP_ENV_VALIDATION` to skip env validation. This is especially
@@ -9,3 +9,12 @@ const connection = {
 const queueName = env.REDIS_QUEUE_NAME ?? "default-queue";
 
 export const resumeQueue = new Queue(queueName, { connection });
+
+// Scoring jobs can be routed to their own queue so the worker can scale
+// extraction and scoring independently, defaults to the shared queue.
+const scoringQueueName = env.REDIS_SCORING_QUEUE_NAME ?? queueName;
+
+export const scoringQueue =
+  scoringQueueName === queueName
+    ? resumeQueue
+    : new Queue(scoringQueueName, { connection });
@@ -1,5 +1,5 @@
 import { z } from "zod";
-import { resumeQueue } from "~/lib/queue";
+import { resumeQueue, scoringQueue } from "~/lib/queue";
 import { getFileUrl } from "~/lib/minio";
 import {
   createTRPCRouter,
@@ -395,7 +395,7 @@ export const applicantRouter = createTRPCRouter({
         data: { statusAI: "processing" },
       });
 
-      await resumeQueue.add(
+      await scoringQueue.add(
         "score-applicant",
         {
           applicantId: applicant.id,
@@ -1,6 +1,6 @@
 import { z } from "zod";
 import type { SerializedJob } from "~/lib/types";
-import { resumeQueue } from "~/lib/queue";
+import { resumeQueue, scoringQueue } from "~/lib/queue";
 import {
   createTRPCRouter,
   externalAIProcedure,
@@ -576,28 +576,28 @@ export const jobRouter = createTRPCRouter({
         throw new Error("No applicants ready for rescoring");
       }
 
-      // Queue all applicants for rescoring
-      const queuePromises = applicantsToProcess.map(async (applicant) => {
-        // Set statusAI to 'processing'
-        await ctx.db.applicant.update({
-          where: { id: applicant.id },
-          data: { statusAI: "processing" },
-        });
+      // Set statusAI to 'processing' for all applicants being rescored
+      await ctx.db.applicant.updateMany({
+        where: {
+          id: { in: applicantsToProcess.map((applicant) => applicant.id) },
+        },
+        data: { statusAI: "processing" },
+      });
 
-        return resumeQueue.add(
-          "score-applicant",
-          {
+      // Queue a single batch job so the worker scores the pool in one pass
+      await scoringQueue.add(
+        "score-applicants-batch",
+        {
+          jobData: JSON.stringify(job),
+          applicants: applicantsToProcess.map((applicant) => ({
             applicantId: applicant.id,
             applicantData: JSON.stringify(applicant),
-            jobData: JSON.stringify(job),
-          },
-          {
-            priority: 1,
-          },
-        );
-      });
-
-      await Promise.all(queuePromises);
+          })),
+        },
+        {
+          priority: 1,
+        },
+      );
 
       return {
         success: true,